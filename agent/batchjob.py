@@ -0,0 +1,338 @@
+from __future__ import annotations
+
+import json
+import os
+import time
+import uuid
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple, Union
+
+from .llm import LLMConfig, get_client, parse_verdict_json, sdk_client, verdict_prompt
+
+
+# Provider batch APIs: upload request JSONL, poll the job, download result JSONL.
+# Every backend returns result lines as {"custom_id", "content"} or {"custom_id", "error"}.
+
+
+def request_line(
+    custom_id: str, system: str, user: str, cfg: LLMConfig
+) -> Dict[str, Any]:
+    return {
+        "custom_id": custom_id,
+        "method": "POST",
+        "url": "/v1/chat/completions",
+        "body": {
+            "model": cfg.model,
+            "temperature": cfg.temperature,
+            "max_tokens": cfg.max_tokens,
+            "messages": [
+                {"role": "system", "content": system},
+                {"role": "user", "content": user},
+            ],
+            "response_format": {"type": "json_object"},
+        },
+    }
+
+
+class OpenAIBatchBackend:
+    """OpenAI-compatible /v1/batches (50% cheaper, results within the completion window)."""
+
+    def __init__(self, cfg: LLMConfig) -> None:
+        # Same credentials and base URL as the synchronous client (with or
+        # without `endpoints:` routing, which batch jobs do not use)
+        self._client = sdk_client(cfg)
+
+    def submit(self, input_path: Path) -> str:
+        with open(input_path, "rb") as f:
+            uploaded = self._client.files.create(file=f, purpose="batch")
+        job = self._client.batches.create(
+            input_file_id=uploaded.id,
+            endpoint="/v1/chat/completions",
+            completion_window="24h",
+        )
+        return str(job.id)
+
+    def status(self, job_id: str) -> str:
+        status = str(self._client.batches.retrieve(job_id).status)
+        if status in ("failed", "expired", "cancelled"):
+            return "failed"
+        return "completed" if status == "completed" else "in_progress"
+
+    def results(self, job_id: str) -> Iterator[Dict[str, Any]]:
+        job = self._client.batches.retrieve(job_id)
+        for file_id in (job.output_file_id, job.error_file_id):
+            if not file_id:
+                continue
+            for line in self._client.files.content(file_id).text.splitlines():
+                if not line.strip():
+                    continue
+                rec = json.loads(line)
+                body = (rec.get("response") or {}).get("body") or {}
+                try:
+                    content = body["choices"][0]["message"]["content"]
+                    yield {"custom_id": rec["custom_id"], "content": content}
+                except (KeyError, IndexError, TypeError):
+                    error = rec.get("error") or body.get("error") or "no content"
+                    yield {"custom_id": rec["custom_id"], "error": str(error)}
+
+
+class LocalBatchBackend:
+    """File-based stand-in: jobs are directories, processed on a later poll.
+
+    `respond(system, user)` produces each result; by default it is the
+    synchronous client, which also makes this a fallback for providers
+    without a batch API.
+    """
+
+    def __init__(
+        self,
+        cfg: Optional[LLMConfig] = None,
+        root: Union[str, Path, None] = None,
+        respond: Optional[Callable[[str, str], str]] = None,
+        polls_until_done: int = 1,
+    ) -> None:
+        from .fastload import CACHE_DIR
+
+        root = root or (cfg.batch.get("dir") if cfg is not None else None)
+        self.root = Path(root) if root else CACHE_DIR / "batch-local"
+        self.polls_until_done = polls_until_done
+        if respond is None:
+            if cfg is None:
+                raise ValueError(
+                    "LocalBatchBackend needs a config or a respond callable"
+                )
+            client = get_client(cfg)
+            respond = client.complete_json
+        self._respond = respond
+
+    def submit(self, input_path: Path) -> str:
+        job_id = f"local-{uuid.uuid4().hex[:12]}"
+        job_dir = self.root / job_id
+        job_dir.mkdir(parents=True, exist_ok=True)
+        (job_dir / "input.jsonl").write_bytes(Path(input_path).read_bytes())
+        (job_dir / "polls").write_text("0", encoding="utf-8")
+        return job_id
+
+    def status(self, job_id: str) -> str:
+        job_dir = self.root / job_id
+        if not job_dir.exists():
+            return "failed"
+        if (job_dir / "output.jsonl").exists():
+            return "completed"
+        polls = int((job_dir / "polls").read_text(encoding="utf-8")) + 1
+        (job_dir / "polls").write_text(str(polls), encoding="utf-8")
+        if polls < self.polls_until_done:
+            return "in_progress"
+        self._process(job_dir)
+        return "completed"
+
+    def _process(self, job_dir: Path) -> None:
+        tmp = job_dir / "output.jsonl.tmp"
+        with (
+            open(job_dir / "input.jsonl", "r", encoding="utf-8") as src,
+            open(tmp, "w", encoding="utf-8") as out,
+        ):
+            for line in src:
+                req = json.loads(line)
+                messages = req["body"]["messages"]
+                try:
+                    content = self._respond(
+                        messages[0]["content"], messages[1]["content"]
+                    )
+                    rec = {"custom_id": req["custom_id"], "content": content}
+                except Exception as e:
+                    rec = {"custom_id": req["custom_id"], "error": str(e)}
+                out.write(json.dumps(rec, ensure_ascii=False) + "\n")
+        os.replace(tmp, job_dir / "output.jsonl")
+
+    def results(self, job_id: str) -> Iterator[Dict[str, Any]]:
+        with open(self.root / job_id / "output.jsonl", "r", encoding="utf-8") as f:
+            for line in f:
+                if line.strip():
+                    yield json.loads(line)
+
+
+BATCH_BACKENDS: Dict[str, Callable[..., Any]] = {
+    "openai": OpenAIBatchBackend,
+    "local": LocalBatchBackend,
+}
+
+
+def register_batch_backend(name: str, factory: Callable[..., Any]) -> None:
+    BATCH_BACKENDS[name] = factory
+
+
+def backend_for(cfg: LLMConfig) -> Any:
+    name = str(cfg.batch.get("backend") or cfg.provider)
+    if name not in BATCH_BACKENDS:
+        raise NotImplementedError(f"No batch backend for provider: {name}")
+    return BATCH_BACKENDS[name](cfg)
+
+
+class BatchRun:
+    """One resumable batch job, tracked in `work_dir/state.json`.
+
+    Each step is recorded before moving on (requests written, job submitted,
+    results mapped), so re-running after an interruption picks up where it
+    stopped instead of re-submitting or re-paying for finished work. Requests
+    that came back with an error stay pending; `retry_pending` resubmits them.
+    """
+
+    def __init__(self, work_dir: Union[str, Path], backend: Any) -> None:
+        self.work_dir = Path(work_dir)
+        self.backend = backend
+        self.state_path = self.work_dir / "state.json"
+        self.state: Dict[str, Any] = {}
+        self._by_key: Optional[Dict[str, str]] = None
+        if self.state_path.exists():
+            self.state = json.loads(self.state_path.read_text(encoding="utf-8"))
+
+    def _save(self) -> None:
+        self.work_dir.mkdir(parents=True, exist_ok=True)
+        tmp = self.state_path.with_suffix(".tmp")
+        tmp.write_text(
+            json.dumps(self.state, ensure_ascii=False, indent=2), encoding="utf-8"
+        )
+        os.replace(tmp, self.state_path)
+
+    def prepare(
+        self,
+        items: Iterable[Tuple[Any, ...]],
+        rules_d: List[Dict[str, Any]],
+        cfg: LLMConfig,
+    ) -> int:
+        """Write request JSONL for (key, idea dict) pairs; a no-op when resuming.
+
+        An item may also carry its own rule subset and the ids of rules that
+        already fired locally: (key, idea dict, rules_d, fired ids).
+        """
+        if self.state.get("requests"):
+            return len(self.state["keys"])
+        allowed = [str(r.get("id")) for r in rules_d if r.get("id")]
+        keys: Dict[str, str] = {}
+        allowed_by: Dict[str, List[str]] = {}
+        fired_by: Dict[str, List[str]] = {}
+        self.work_dir.mkdir(parents=True, exist_ok=True)
+        requests = self.work_dir / "requests.jsonl"
+        with open(requests, "w", encoding="utf-8") as f:
+            for n, (key, idea_d, *extra) in enumerate(items):
+                custom_id = f"r{n}"
+                keys[custom_id] = key
+                item_rules = extra[0] if extra else rules_d
+                item_allowed = [str(r.get("id")) for r in item_rules if r.get("id")]
+                if item_allowed != allowed:
+                    allowed_by[custom_id] = item_allowed
+                if len(extra) > 1 and extra[1]:
+                    fired_by[custom_id] = list(extra[1])
+                system, user = verdict_prompt(idea_d, item_rules, cfg, item_allowed)
+                line = request_line(custom_id, system, user, cfg)
+                f.write(json.dumps(line, ensure_ascii=False) + "\n")
+        self.state = {
+            "requests": str(requests),
+            "keys": keys,
+            "allowed": allowed,
+            "allowed_by": allowed_by,
+            "fired": fired_by,
+        }
+        self._by_key = None
+        self._save()
+        return len(keys)
+
+    def _custom_id(self, key: str) -> str:
+        if self._by_key is None:
+            self._by_key = {k: c for c, k in self.state["keys"].items()}
+        return self._by_key[key]
+
+    def allowed_for(self, key: str) -> List[str]:
+        """Redline ids the request for `key` was allowed to cite."""
+        by = self.state.get("allowed_by") or {}
+        return list(by.get(self._custom_id(key), self.state["allowed"]))
+
+    def fired_for(self, key: str) -> List[str]:
+        """Rule ids that fired locally for `key`, to merge into its verdict."""
+        return list((self.state.get("fired") or {}).get(self._custom_id(key), []))
+
+    def submit(self) -> str:
+        if not self.state.get("job_id"):
+            path = self.state.get("input") or self.state["requests"]
+            self.state["job_id"] = self.backend.submit(Path(path))
+            self.state["submitted_at"] = time.time()
+            self._save()
+        return str(self.state["job_id"])
+
+    def wait(
+        self,
+        poll_s: float = 30.0,
+        max_poll_s: float = 600.0,
+        timeout_s: Optional[float] = None,
+        sleep: Callable[[float], None] = time.sleep,
+    ) -> str:
+        """Poll with exponential backoff until the job completes or fails."""
+        start = time.monotonic()
+        delay = poll_s
+        while True:
+            status = self.backend.status(self.submit())
+            if status in ("completed", "failed"):
+                self.state["status"] = status
+                self._save()
+                return status
+            if timeout_s is not None and time.monotonic() - start + delay > timeout_s:
+                return status
+            sleep(delay)
+            delay = min(max_poll_s, delay * 1.5)
+
+    def results(self) -> Iterator[Tuple[str, Optional[Dict[str, Any]], Optional[str]]]:
+        """(key, raw verdict data or None, error) for results not yet marked done."""
+        done = set(self.state.get("done") or [])
+        keys = self.state["keys"]
+        for rec in self.backend.results(self.state["job_id"]):
+            custom_id = rec.get("custom_id")
+            if custom_id not in keys or custom_id in done:
+                continue
+            if "content" in rec:
+                yield keys[custom_id], parse_verdict_json(rec["content"] or ""), None
+            else:
+                yield keys[custom_id], None, str(rec.get("error"))
+
+    def mark_done(self, keys: Iterable[str]) -> None:
+        done = set(self.state.get("done") or [])
+        done.update(self._custom_id(k) for k in keys)
+        self.state["done"] = sorted(done)
+        self._save()
+
+    def mark_collected(self) -> None:
+        """Every result of the current job has been handled; the rest may be retried."""
+        self.state["collected"] = True
+        self._save()
+
+    def pending(self) -> List[str]:
+        done = set(self.state.get("done") or [])
+        return [self.state["keys"][c] for c in self.state["keys"] if c not in done]
+
+    def retry_pending(self, max_attempts: int = 3) -> int:
+        """Start a new job for requests without a result once the last one is collected.
+
+        Returns how many requests were resubmitted: 0 when nothing is pending,
+        results are still being collected, or `max_attempts` jobs were already used.
+        """
+        attempt = int(self.state.get("attempt", 1))
+        if not self.state.get("collected") or attempt >= max_attempts:
+            return 0
+        done = set(self.state.get("done") or [])
+        wanted = {c for c in self.state["keys"] if c not in done}
+        if not wanted:
+            return 0
+        path = self.work_dir / f"requests.retry{attempt}.jsonl"
+        with (
+            open(self.state["requests"], "r", encoding="utf-8") as src,
+            open(path, "w", encoding="utf-8") as out,
+        ):
+            for line in src:
+                if json.loads(line)["custom_id"] in wanted:
+                    out.write(line)
+        for k in ("job_id", "submitted_at", "status", "collected"):
+            self.state.pop(k, None)
+        self.state["input"] = str(path)
+        self.state["attempt"] = attempt + 1
+        self._save()
+        return len(wanted)
@@ -0,0 +1,241 @@
+from __future__ import annotations
+
+import heapq
+import json
+import tempfile
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from .llm import LLMConfig, build_rubric, estimate_tokens
+from .ratelimit import RateLimiter, parse_duration
+
+
+# System prompt + output schema of llm_verdict_json, roughly
+PROMPT_OVERHEAD_TOKENS = 350
+PRIORITIES = ("fifo", "cheap-first", "expensive-first")
+
+
+def parse_deadline(
+    value: Optional[str], now: Optional[float] = None
+) -> Optional[float]:
+    """Epoch seconds from "90m"/"2h" (relative), "06:30" (next occurrence) or ISO time."""
+    if not value:
+        return None
+    now = time.time() if now is None else now
+    if value[-1:] in "smh" and value[:1].isdigit():
+        seconds = parse_duration(value)
+        if seconds is not None:
+            return now + seconds
+    if len(value) == 5 and value[2] == ":":
+        base = datetime.fromtimestamp(now)
+        hh, mm = int(value[:2]), int(value[3:])
+        at = base.replace(hour=hh, minute=mm, second=0, microsecond=0)
+        if at.timestamp() <= now:
+            at += timedelta(days=1)
+        return at.timestamp()
+    return datetime.fromisoformat(value).timestamp()
+
+
+def compact_idea(idea: Any, max_chars: int = 300, max_items: int = 3) -> Any:
+    """Shorter copy of `idea` for degraded runs: trimmed fields, first few list items."""
+    data = idea.model_dump() if hasattr(idea, "model_dump") else dict(idea.__dict__)
+    for k, v in data.items():
+        if isinstance(v, str) and len(v) > max_chars:
+            data[k] = v[:max_chars] + "…"
+        elif isinstance(v, list):
+            data[k] = [str(x)[:max_chars] for x in v[:max_items]]
+    return type(idea)(**data)
+
+
+def evaluation_calls(cfg: Optional[LLMConfig], n_rules: int) -> Tuple[int, int]:
+    """(requests, completions) one evaluation can cost at most under `cfg`.
+
+    Counts ensemble members, self-consistency samples, per-rule decomposition
+    groups and both cascade tiers; repair retries show up in recorded usage.
+    """
+    if cfg is None:
+        return 1, 1
+
+    def single(c: LLMConfig) -> Tuple[int, int]:
+        # Same precedence as engine._judge
+        if c.ensemble:
+            members = len(c.ensemble.get("models") or []) or 1
+            return members, members
+        if c.self_consistency.get("n"):
+            return 1, max(1, int(c.self_consistency["n"]))
+        if c.decompose.get("enabled"):
+            size = max(1, int(c.decompose.get("group_size", 1)))
+            groups = max(1, -(-n_rules // size))
+            return groups, groups
+        return 1, 1
+
+    if not cfg.cascade:
+        return single(cfg)
+    from .engine import cascade_tiers
+
+    tiers = [single(c) for _, c in cascade_tiers(cfg)]
+    return sum(t[0] for t in tiers), sum(t[1] for t in tiers)
+
+
+def _idea_text(idea: Any) -> str:
+    data = idea.model_dump() if hasattr(idea, "model_dump") else idea.__dict__
+    return json.dumps(data, ensure_ascii=False, indent=2)
+
+
+class BudgetScheduler:
+    """Pace and cap a batch run by tokens, dollars and wall-clock deadline.
+
+    Admission and pacing use prompt estimates scaled by the configured fan-out
+    (`cfg` for full evaluations, `degraded_cfg` for degraded ones). Spend is
+    recorded from the provider usage the clients report, falling back to the
+    scaled estimate when a client reports none.
+    """
+
+    def __init__(
+        self,
+        rules: List[Any],
+        max_tokens: Optional[int] = None,
+        max_usd: Optional[float] = None,
+        deadline: Optional[float] = None,
+        tpm: Optional[float] = None,
+        usd_per_1k_in: float = 0.0,
+        usd_per_1k_out: float = 0.0,
+        max_output_tokens: int = 800,
+        degrade_at: float = 0.2,
+        cfg: Optional[LLMConfig] = None,
+        degraded_cfg: Optional[LLMConfig] = None,
+    ) -> None:
+        rules_d = [r.model_dump() if hasattr(r, "model_dump") else r for r in rules]
+        self.rules_tokens = estimate_tokens(build_rubric(rules_d))
+        self.calls: Dict[str, Tuple[int, int]] = {
+            "full": evaluation_calls(cfg, len(rules)),
+            "degraded": evaluation_calls(degraded_cfg, len(rules)),
+        }
+        self.max_tokens = max_tokens
+        self.max_usd = max_usd
+        self.deadline = deadline
+        self.usd_per_1k_in = usd_per_1k_in
+        self.usd_per_1k_out = usd_per_1k_out
+        self.max_output_tokens = max_output_tokens
+        self.degrade_at = degrade_at
+        self.limiter: Optional[RateLimiter] = None
+        if tpm:
+            # Per-run bucket: --tpm paces this run only, never a later one
+            self._limiter_dir = tempfile.TemporaryDirectory(prefix="idea-crucible-tpm-")
+            state = Path(self._limiter_dir.name) / "ratelimit.json"
+            self.limiter = RateLimiter(1e9, tpm, state, safety=1.0)
+        self.started = time.time()
+        self.tokens_in = self.tokens_out = 0
+        self.usd = 0.0
+        self.done = 0
+        self.counts: Dict[str, int] = {"full": 0, "degraded": 0, "deferred": 0}
+
+    def estimate(self, idea: Any, action: str = "full") -> int:
+        """Prompt tokens for one evaluation (output is bounded by max_output_tokens)."""
+        prompt = (
+            PROMPT_OVERHEAD_TOKENS
+            + self.rules_tokens
+            + estimate_tokens(_idea_text(idea))
+        )
+        return prompt * self.calls[action][0]
+
+    def worst_output(self, action: str = "full") -> int:
+        return self.max_output_tokens * self.calls[action][1]
+
+    def cost(self, tokens_in: int, tokens_out: int) -> float:
+        return (
+            tokens_in * self.usd_per_1k_in + tokens_out * self.usd_per_1k_out
+        ) / 1000.0
+
+    def _remaining_fraction(self) -> float:
+        fractions = [1.0]
+        if self.max_tokens:
+            spent = self.tokens_in + self.tokens_out
+            fractions.append(1.0 - spent / self.max_tokens)
+        if self.max_usd:
+            fractions.append(1.0 - self.usd / self.max_usd)
+        return min(fractions)
+
+    def _fits(self, est_in: int, action: str = "full") -> bool:
+        worst_out = self.worst_output(action)
+        if self.max_tokens and (
+            self.tokens_in + self.tokens_out + est_in + worst_out > self.max_tokens
+        ):
+            return False
+        if self.max_usd and self.usd + self.cost(est_in, worst_out) > self.max_usd:
+            return False
+        return True
+
+    def decide(self, idea: Any, remaining: Optional[int] = None) -> str:
+        """Returns "full", "degraded" (cheap tier, compacted prompt) or "deferred"."""
+        now = time.time()
+        if self.deadline is not None and now >= self.deadline:
+            return "deferred"
+        if not self._fits(self.estimate(idea)):
+            # The compacted prompt may still fit where the full one does not
+            return (
+                "degraded"
+                if self._fits(self.estimate(compact_idea(idea), "degraded"), "degraded")
+                else "deferred"
+            )
+        if self._remaining_fraction() <= self.degrade_at:
+            return "degraded"
+        if self.deadline is not None and remaining and self.done:
+            # Behind pace: the remaining work would overrun the deadline at full quality
+            per_item = (now - self.started) / self.done
+            if per_item * remaining > self.deadline - now:
+                return "degraded"
+        return "full"
+
+    def wait_for_rate(self, est_tokens: int, action: str = "full") -> None:
+        if self.limiter is not None:
+            self.limiter.acquire(est_tokens + self.worst_output(action))
+
+    def record(self, action: str, tokens_in: int = 0, tokens_out: int = 0) -> None:
+        self.counts[action] = self.counts.get(action, 0) + 1
+        if action == "deferred":
+            return
+        self.done += 1
+        self.charge(tokens_in, tokens_out)
+
+    def charge(self, tokens_in: int, tokens_out: int) -> None:
+        self.tokens_in += tokens_in
+        self.tokens_out += tokens_out
+        self.usd += self.cost(tokens_in, tokens_out)
+
+    def summary(self) -> Dict[str, Any]:
+        return {
+            **self.counts,
+            "tokens_in": self.tokens_in,
+            "tokens_out": self.tokens_out,
+            "usd": round(self.usd, 4),
+            "elapsed_s": round(time.time() - self.started, 1),
+        }
+
+
+def prioritized(
+    items: Iterable[Tuple[str, Any]],
+    scheduler: BudgetScheduler,
+    priority: str = "fifo",
+    window: int = 1000,
+) -> Iterator[Tuple[str, Any]]:
+    """Reorder (key, idea) pairs by estimated cost within windows of `window` items.
+
+    Streams stay bounded in memory; a window as large as the input sorts it fully.
+    """
+    if priority == "fifo":
+        yield from items
+        return
+    sign = 1 if priority == "cheap-first" else -1
+    heap: List[Tuple[int, int, str, Any]] = []
+    for n, (key, idea) in enumerate(items):
+        heapq.heappush(heap, (sign * scheduler.estimate(idea), n, key, idea))
+        if len(heap) >= window:
+            while heap:
+                _, _, k, i = heapq.heappop(heap)
+                yield k, i
+    while heap:
+        _, _, k, i = heapq.heappop(heap)
+        yield k, i
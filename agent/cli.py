@@ -1,25 +1,55 @@
 from __future__ import annotations
 
+import os
 import sys
 from pathlib import Path
 import argparse
 from types import SimpleNamespace
 
-import yaml
-
+# agent.main keeps heavy imports inside each command, so this stays cheap
 from . import main as am
+from .daemon import forward
 
 
 def _slugify(text: str) -> str:
     return "-".join([t for t in text.lower().strip().split()[:6]]) or "idea"
 
 
+def _daemon_args(idea: Path) -> dict:
+    # Settings the local path would take from this process, not the daemon's
+    return {
+        "idea": str(idea.resolve()),
+        "model_cfg": str(am.resolve_model_cfg().resolve()),
+        "lang": os.environ.get("IC_LANG"),
+    }
+
+
 def intake_entry() -> None:
     if len(sys.argv) < 2:
         print("Usage: intake <short-description>")
         sys.exit(2)
 
     desc = " ".join(sys.argv[1:]).strip()
+    out = forward(
+        "intake",
+        {
+            "desc": desc,
+            "input": None,
+            "out": None,
+            "user": None,
+            "scenario": None,
+            "triggers": None,
+            "alts": None,
+            "assumptions": [],
+            "risks": [],
+        },
+    )
+    if out is not None:
+        print(out)
+        return
+
+    import yaml
+
     am.ensure_dirs()
     slug = _slugify(desc)
     out_path = am.IDEAS_DIR / f"{slug}.yaml"
@@ -45,6 +75,11 @@ def evaluate_entry() -> None:
         print("Usage: evaluate <idea.yaml>")
         sys.exit(2)
     idea = Path(sys.argv[1])
+    # Forward to a running `idea-crucible serve` daemon when available
+    out = forward("evaluate", _daemon_args(idea))
+    if out is not None:
+        print(out)
+        return
     # model config is auto-resolved in agent.main (model.local.yaml > model.yaml)
     args = argparse.Namespace(idea=str(idea), model_cfg=None)
     am.cmd_evaluate(args)
@@ -55,5 +90,9 @@ def report_entry() -> None:
         print("Usage: report <idea.yaml>")
         sys.exit(2)
     idea = Path(sys.argv[1])
+    out = forward("report", _daemon_args(idea))
+    if out is not None:
+        print(out)
+        return
     args = argparse.Namespace(idea=str(idea))
     am.cmd_report(args)
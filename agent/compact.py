@@ -0,0 +1,172 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import re
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple, Union
+
+from .fastload import load_yaml
+from .llm import LLMConfig, estimate_tokens, llm_compact_idea_json
+
+TEXT_FIELDS = ("intent", "user", "scenario", "triggers", "alts")
+LIST_FIELDS = ("assumptions", "risks")
+SIDECAR_SUFFIX = ".compact.json"
+
+_NON_WORD = re.compile(r"[\W_]+", re.UNICODE)
+# Sentence ends, Chinese and Western, for trimming at a boundary
+_SENTENCE_END = re.compile(r"[。！？；.!?;]")
+
+
+def sidecar_path(idea_path: Union[str, Path]) -> Path:
+    p = Path(idea_path)
+    return p.with_name(p.stem + SIDECAR_SUFFIX)
+
+
+def idea_tokens(data: Dict[str, Any]) -> int:
+    fields = {k: data.get(k) for k in TEXT_FIELDS + LIST_FIELDS}
+    return estimate_tokens(json.dumps(fields, ensure_ascii=False, indent=2))
+
+
+def _norm(text: str) -> str:
+    return _NON_WORD.sub("", text).casefold()
+
+
+def dedup_items(items: List[Any], stated: List[str]) -> List[str]:
+    """Drop empty, repeated and subsumed items (also those already said in `stated`)."""
+    kept: List[Tuple[str, str]] = []
+    for item in items:
+        text = str(item).strip()
+        key = _norm(text)
+        if not key or any(key in s for s in stated):
+            continue
+        if any(key in k for k, _ in kept):
+            continue
+        # A longer item that contains an earlier one replaces it in place
+        supersedes = [i for i, (k, _) in enumerate(kept) if k in key]
+        if supersedes:
+            kept[supersedes[0]] = (key, text)
+            for i in reversed(supersedes[1:]):
+                del kept[i]
+        else:
+            kept.append((key, text))
+    return [t for _, t in kept]
+
+
+def dedup_idea(data: Dict[str, Any]) -> Dict[str, Any]:
+    out = dict(data)
+    for k in TEXT_FIELDS:
+        out[k] = " ".join(str(out.get(k) or "").split())
+    stated = [_norm(out[k]) for k in TEXT_FIELDS]
+    for k in LIST_FIELDS:
+        out[k] = dedup_items(list(out.get(k) or []), stated)
+        stated += [_norm(x) for x in out[k]]
+    return out
+
+
+def clip(text: str, max_chars: int) -> str:
+    if len(text) <= max_chars:
+        return text
+    head = text[:max_chars]
+    ends = [m.end() for m in _SENTENCE_END.finditer(head)]
+    # Cut at the last sentence end unless that throws away most of the budget
+    if ends and ends[-1] >= max_chars // 2:
+        return head[: ends[-1]].rstrip()
+    return head.rstrip() + "…"
+
+
+def bound_idea(data: Dict[str, Any], max_chars: int, max_items: int) -> Dict[str, Any]:
+    """Hard bound: every field clipped, every list cut to `max_items`."""
+    out = dict(data)
+    for k in TEXT_FIELDS:
+        out[k] = clip(str(out.get(k) or ""), max_chars)
+    for k in LIST_FIELDS:
+        out[k] = [clip(str(x), max_chars // 2) for x in (out.get(k) or [])[:max_items]]
+    return out
+
+
+def summarizer_config(cfg: LLMConfig) -> Optional[LLMConfig]:
+    summarize = cfg.compact.get("summarize", True)
+    if summarize is False:
+        return None
+    # Like translation: condensing text is a job for the cheap tier
+    overrides = summarize if isinstance(summarize, dict) else {}
+    return cfg.derive(dict(overrides or cfg.cascade.get("fast") or {}))
+
+
+def compact_data(data: Dict[str, Any], cfg: LLMConfig) -> Tuple[Dict[str, Any], str]:
+    """(bounded idea, method): "local" dedup/clipping, or "llm" summarization first."""
+    opts = cfg.compact
+    target = int(opts.get("target_tokens", 200))
+    max_chars = int(opts.get("max_chars", 200))
+    max_items = int(opts.get("max_items", 5))
+    out = dedup_idea(data)
+    method = "local"
+    if idea_tokens(out) > target:
+        summary_cfg = summarizer_config(cfg)
+        summary = None
+        if summary_cfg is not None:
+            try:
+                summary = llm_compact_idea_json(
+                    {k: out.get(k) for k in TEXT_FIELDS + LIST_FIELDS},
+                    target,
+                    summary_cfg,
+                )
+            except Exception:
+                summary = None  # fall back to local clipping
+        if summary and all(str(summary.get(k) or "").strip() for k in TEXT_FIELDS):
+            for k in TEXT_FIELDS:
+                out[k] = str(summary[k])
+            for k in LIST_FIELDS:
+                items = summary.get(k) or []
+                out[k] = items if isinstance(items, list) else [items]
+            out = dedup_idea(out)
+            method = "llm"
+    return bound_idea(out, max_chars, max_items), method
+
+
+def _cache_key(raw: bytes, opts: Dict[str, Any]) -> str:
+    h = hashlib.sha1(raw)
+    h.update(json.dumps(opts, sort_keys=True, default=str).encode("utf-8"))
+    return h.hexdigest()
+
+
+def load_idea_data(
+    idea_path: Union[str, Path], cfg: Optional[LLMConfig] = None
+) -> Dict[str, Any]:
+    """Idea mapping to evaluate: the file itself, or its cached compact form.
+
+    With `compact:` configured, ideas over `threshold_tokens` are compacted
+    once and stored next to the idea as `<stem>.compact.json`, keyed by the
+    hash of the idea file and the compaction settings.
+    """
+    data = load_yaml(idea_path) or {}
+    if cfg is None or not cfg.compact:
+        return data
+    if idea_tokens(data) <= int(cfg.compact.get("threshold_tokens", 300)):
+        return data
+    path = Path(idea_path)
+    key = _cache_key(path.read_bytes(), cfg.compact)
+    side = sidecar_path(path)
+    try:
+        cached = json.loads(side.read_text(encoding="utf-8"))
+        if cached.get("hash") == key:
+            return {**data, **cached["idea"]}
+    except (OSError, ValueError, KeyError, AttributeError):
+        pass
+    compacted, method = compact_data(data, cfg)
+    fields = {k: compacted[k] for k in TEXT_FIELDS + LIST_FIELDS}
+    record = {
+        "hash": key,
+        "method": method,
+        "tokens": {"before": idea_tokens(data), "after": idea_tokens(compacted)},
+        "idea": fields,
+    }
+    tmp = side.with_name(f"{side.name}.{os.getpid()}.tmp")
+    try:
+        tmp.write_text(json.dumps(record, ensure_ascii=False, indent=2), "utf-8")
+        os.replace(tmp, side)
+    except OSError:
+        pass  # read-only ideas dir: still evaluate the compacted form
+    return {**data, **fields}
@@ -0,0 +1,97 @@
+from __future__ import annotations
+
+import dataclasses
+import os
+import threading
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Union
+
+from . import main as am
+from .fastload import load_yaml
+
+if TYPE_CHECKING:
+    from .llm import LLMConfig
+    from .schemas import Rule
+    from .translate import TranslationCache
+
+
+@dataclass
+class EvaluationContext:
+    """Everything one evaluation depends on, passed explicitly down the call chain.
+
+    Language, rules, model config and output directories used to come from
+    IC_LANG and module globals; holding them here lets one process (threads,
+    the daemon) serve requests with different settings side by side. IC_LANG is
+    still honoured, but only read once as the default when a context is built.
+    """
+
+    model_cfg: Path
+    language: Optional[str] = None
+    rules_dir: Path = am.RULES_DIR
+    rules: Optional[List["Rule"]] = None
+    ideas_dir: Path = am.IDEAS_DIR
+    reports_dir: Path = am.REPORTS_DIR
+    templates_dir: Path = am.TEMPLATES_DIR
+    # Loaded config and rules; shared by copies made with `with_changes`
+    cache: Dict[str, Any] = field(default_factory=dict)
+    _lock: threading.Lock = field(
+        default_factory=threading.Lock, init=False, repr=False, compare=False
+    )
+
+    @classmethod
+    def create(
+        cls,
+        model_cfg: Optional[Union[str, Path]] = None,
+        language: Optional[str] = None,
+        **kwargs: Any,
+    ) -> "EvaluationContext":
+        return cls(
+            model_cfg=am.resolve_model_cfg(str(model_cfg) if model_cfg else None),
+            language=language or os.environ.get("IC_LANG") or None,
+            **kwargs,
+        )
+
+    def with_changes(self, **changes: Any) -> "EvaluationContext":
+        if "model_cfg" in changes or "rules_dir" in changes:
+            changes.setdefault("cache", {})
+        copy = dataclasses.replace(self, **changes)
+        if copy.cache is self.cache:
+            copy._lock = self._lock  # one lock per cache, not per copy
+        return copy
+
+    def get_rules(self) -> List["Rule"]:
+        if self.rules is not None:
+            return self.rules
+        with self._lock:
+            if "rules" not in self.cache:
+                from .engine import load_rules
+
+                self.cache["rules"] = load_rules(str(self.rules_dir))
+            return self.cache["rules"]
+
+    def llm_config(self) -> "LLMConfig":
+        """The model config file with this context's language applied."""
+        from .llm import LLMConfig
+
+        with self._lock:
+            if "llm_config" not in self.cache:
+                self.cache["llm_config"] = LLMConfig(
+                    load_yaml(str(self.model_cfg)) or {}
+                )
+        cfg: "LLMConfig" = self.cache["llm_config"]
+        if self.language and self.language != cfg.language:
+            # A full copy, not `derive`: ensembles and cascades must be kept
+            return LLMConfig({**cfg.raw, "language": self.language})
+        return cfg
+
+    def translations(self) -> "TranslationCache":
+        with self._lock:
+            if "translations" not in self.cache:
+                from .translate import TranslationCache
+
+                self.cache["translations"] = TranslationCache()
+            return self.cache["translations"]
+
+    def template_path(self) -> Path:
+        return am.select_template(self.language or "", self.templates_dir)
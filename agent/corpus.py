@@ -0,0 +1,138 @@
+from __future__ import annotations
+
+import csv
+import json
+import mmap
+import re
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Tuple, Union
+
+
+LIST_FIELDS = ("assumptions", "risks")
+_SLUG_RE = re.compile(r"[^\w\-.]+", re.UNICODE)
+
+# (row_id, idea data or None, error message or None)
+Row = Tuple[str, Optional[Dict[str, Any]], Optional[str]]
+
+
+def row_slug(row_id: str) -> str:
+    return _SLUG_RE.sub("-", row_id).strip("-") or "row"
+
+
+def _row_id(stem: str, n: int, data: Dict[str, Any]) -> str:
+    explicit = data.get("id") or data.get("slug")
+    return str(explicit) if explicit else f"{stem}-{n}"
+
+
+def _split_list(value: Any) -> List[str]:
+    if isinstance(value, list):
+        return [str(x) for x in value if str(x).strip()]
+    text = str(value or "").strip()
+    if not text:
+        return []
+    if text.startswith("["):
+        try:
+            parsed = json.loads(text)
+            if isinstance(parsed, list):
+                return [str(x) for x in parsed if str(x).strip()]
+        except ValueError:
+            pass
+    return [s.strip() for s in re.split(r"[;|\n]", text) if s.strip()]
+
+
+def iter_jsonl(path: Path) -> Iterator[Row]:
+    if path.stat().st_size == 0:
+        return
+    with open(path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        n = 0
+        for line in iter(mm.readline, b""):
+            n += 1
+            if not line.strip():
+                continue
+            try:
+                data = json.loads(line)
+            except ValueError as e:
+                yield f"{path.stem}-{n}", None, f"invalid JSON: {e}"
+                continue
+            if not isinstance(data, dict):
+                yield f"{path.stem}-{n}", None, "row is not a JSON object"
+                continue
+            yield _row_id(path.stem, n, data), data, None
+
+
+def iter_csv(path: Path) -> Iterator[Row]:
+    with open(path, "r", encoding="utf-8", newline="") as f:
+        for n, rec in enumerate(csv.DictReader(f), start=1):
+            data: Dict[str, Any] = {k: v for k, v in rec.items() if k}
+            for key in LIST_FIELDS:
+                if key in data:
+                    data[key] = _split_list(data[key])
+            yield _row_id(path.stem, n, data), data, None
+
+
+def iter_yaml_docs(path: Path) -> Iterator[Row]:
+    import yaml
+
+    with open(path, "r", encoding="utf-8") as f:
+        docs = yaml.safe_load_all(f)
+        n = 0
+        while True:
+            n += 1
+            try:
+                data = next(docs)
+            except StopIteration:
+                return
+            except yaml.YAMLError as e:
+                # The YAML stream cannot resume after a syntax error
+                yield f"{path.stem}-{n}", None, f"invalid YAML: {e}"
+                return
+            if data is None:
+                continue
+            if not isinstance(data, dict):
+                yield f"{path.stem}-{n}", None, "document is not a mapping"
+                continue
+            yield _row_id(path.stem, n, data), data, None
+
+
+def iter_rows(path: Union[str, Path]) -> Iterator[Row]:
+    p = Path(path)
+    suffix = p.suffix.lower()
+    if suffix in (".jsonl", ".ndjson"):
+        return iter_jsonl(p)
+    if suffix == ".csv":
+        return iter_csv(p)
+    if suffix in (".yaml", ".yml"):
+        return iter_yaml_docs(p)
+    raise ValueError(f"Unsupported corpus format: {p.suffix} (use .jsonl, .csv, .yaml)")
+
+
+def iter_ideas(
+    path: Union[str, Path], chunk_size: int = 1000
+) -> Iterator[Tuple[str, Any, Optional[str]]]:
+    """Yield (row_id, Idea or None, error) for every row, validating in chunks.
+
+    Memory stays bounded by `chunk_size` regardless of corpus size; invalid rows
+    are reported with their error instead of stopping the stream.
+    """
+    from .schemas import validate_ideas
+
+    def flush(chunk: List[Row]) -> Iterator[Tuple[str, Any, Optional[str]]]:
+        # One bulk validation per chunk; rows that failed to parse skip it
+        parsed = [data for _, data, _ in chunk if data is not None]
+        items, errors = validate_ideas(parsed)
+        messages = dict(errors)
+        pos = 0
+        for row_id, data, error in chunk:
+            if data is None:
+                yield row_id, None, error
+                continue
+            yield row_id, items[pos], messages.get(pos)
+            pos += 1
+
+    chunk: List[Row] = []
+    for row in iter_rows(path):
+        chunk.append(row)
+        if len(chunk) >= chunk_size:
+            yield from flush(chunk)
+            chunk = []
+    yield from flush(chunk)
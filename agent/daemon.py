@@ -0,0 +1,182 @@
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import signal
+import socket
+import socketserver
+import threading
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+from .fastload import CACHE_DIR
+
+
+# Client side stays import-light: it runs inside every short CLI command.
+
+
+def socket_path(explicit: Optional[str] = None) -> Path:
+    return Path(
+        explicit or os.environ.get("IC_SOCKET") or CACHE_DIR / "idea-crucible.sock"
+    )
+
+
+def forward(command: str, args: Dict[str, Any]) -> Optional[str]:
+    """Run `command` on a running daemon; None means "no daemon, run locally"."""
+    if os.environ.get("IC_NO_DAEMON") or not hasattr(socket, "AF_UNIX"):
+        return None
+    path = socket_path()
+    if not path.exists():
+        return None
+    try:
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+            sock.settimeout(1.0)
+            sock.connect(str(path))
+            # Evaluations can take as long as the LLM call; no read timeout
+            sock.settimeout(None)
+            payload = {"command": command, "args": args}
+            sock.sendall(
+                json.dumps(payload, ensure_ascii=False).encode("utf-8") + b"\n"
+            )
+            chunks: List[bytes] = []
+            while True:
+                chunk = sock.recv(65536)
+                if not chunk:
+                    break
+                chunks.append(chunk)
+                if chunk.endswith(b"\n"):
+                    break
+    except OSError:
+        # Stale socket file or daemon shutting down
+        return None
+    resp = json.loads(b"".join(chunks).decode("utf-8") or "{}")
+    if not resp.get("ok"):
+        raise RuntimeError(f"daemon: {resp.get('error', 'no response')}")
+    return str(resp.get("output", ""))
+
+
+class RulesSnapshot:
+    """Loaded rules, reloaded whenever a rule file is added, removed or modified."""
+
+    def __init__(self, rules_dir: Path) -> None:
+        self.rules_dir = rules_dir
+        self._sig: Tuple[Tuple[str, int, int], ...] = ()
+        self._rules: list = []
+        self._lock = threading.Lock()
+
+    def _signature(self) -> Tuple[Tuple[str, int, int], ...]:
+        out = []
+        for p in sorted(self.rules_dir.glob("*.yaml")):
+            st = p.stat()
+            out.append((p.name, st.st_mtime_ns, st.st_size))
+        return tuple(out)
+
+    def get(self) -> list:
+        from .engine import load_rules
+
+        with self._lock:
+            sig = self._signature()
+            if sig != self._sig:
+                self._rules = load_rules(str(self.rules_dir))
+                self._sig = sig
+            return self._rules
+
+
+class _Handler(socketserver.StreamRequestHandler):
+    server: "EvaluationServer"
+
+    def handle(self) -> None:
+        try:
+            req = json.loads(self.rfile.readline().decode("utf-8"))
+            resp = {"ok": True, "output": self.server.dispatch(req)}
+        except Exception as e:
+            resp = {"ok": False, "error": f"{type(e).__name__}: {e}"}
+        self.wfile.write(json.dumps(resp, ensure_ascii=False).encode("utf-8") + b"\n")
+
+
+class EvaluationServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    daemon_threads = True
+
+    def __init__(self, path: Path) -> None:
+        from . import main as am
+
+        self.rules = RulesSnapshot(am.RULES_DIR)
+        super().__init__(str(path), _Handler)
+
+    def dispatch(self, req: Dict[str, Any]) -> str:
+        from . import main as am
+        from .context import EvaluationContext
+
+        command = req.get("command")
+        args = argparse.Namespace(**(req.get("args") or {}))
+        if command == "ping":
+            return "pong"
+        if command == "intake":
+            return str(am.run_intake(args))
+        if command not in ("evaluate", "report"):
+            raise ValueError(f"Unknown command: {command}")
+        # Per-request context: mixed languages and configs run concurrently
+        ctx = EvaluationContext.create(
+            getattr(args, "model_cfg", None),
+            getattr(args, "lang", None),
+            rules=self.rules.get() if command == "evaluate" else None,
+        )
+        if "lang" in vars(args):
+            # The client's IC_LANG, even when unset: never the daemon's own
+            ctx.language = args.lang or None
+        if command == "evaluate":
+            return str(am.run_evaluate(args, ctx))
+        if getattr(args, "langs", None):
+            return "\n".join(str(p) for p in am.run_report_languages(args, ctx))
+        return str(am.run_report(args, ctx))
+
+
+def _warm_up(server: EvaluationServer) -> None:
+    from . import main as am
+    from .llm import get_client, load_model_config
+
+    server.rules.get()
+    cfg_path = (
+        am.MODEL_LOCAL_CFG_PATH
+        if am.MODEL_LOCAL_CFG_PATH.exists()
+        else am.MODEL_CFG_PATH
+    )
+    try:
+        # Builds and caches the HTTP client so the first request reuses its pool
+        get_client(load_model_config(str(cfg_path)))
+    except Exception as e:
+        print(f"[warn] LLM client not ready: {e}")
+
+
+def serve(path: Optional[str] = None) -> None:
+    sock_path = socket_path(path)
+    sock_path.parent.mkdir(parents=True, exist_ok=True)
+    if sock_path.exists():
+        if forward_ping(sock_path):
+            raise SystemExit(f"Daemon already running on {sock_path}")
+        sock_path.unlink()
+    server = EvaluationServer(sock_path)
+    os.chmod(sock_path, 0o600)
+    _warm_up(server)
+    print(f"Serving on {sock_path} (Ctrl-C to stop)", flush=True)
+    # Treat SIGTERM like Ctrl-C so the socket file is always removed
+    signal.signal(signal.SIGTERM, signal.default_int_handler)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        sock_path.unlink(missing_ok=True)
+
+
+def forward_ping(path: Path) -> bool:
+    try:
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+            sock.settimeout(1.0)
+            sock.connect(str(path))
+            sock.sendall(b'{"command": "ping"}\n')
+            return b"pong" in sock.recv(1024)
+    except OSError:
+        return False
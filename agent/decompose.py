@@ -0,0 +1,175 @@
+from __future__ import annotations
+
+import json
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from typing import Any, Callable, Dict, List, Optional
+
+from .llm import FALLBACK_REASON, LLMConfig, _language_line, _parse_object, get_client
+
+
+SEVERITY_RANK = {"critical": 0, "high": 1, "medium": 2, "low": 3}
+
+
+def group_rules(
+    rules: List[Dict[str, Any]], group_size: int = 1
+) -> List[List[Dict[str, Any]]]:
+    """Rules ordered critical-first, chunked into groups of `group_size`."""
+    ordered = sorted(rules, key=lambda r: SEVERITY_RANK.get(str(r.get("severity")), 4))
+    size = max(1, group_size)
+    return [ordered[i : i + size] for i in range(0, len(ordered), size)]
+
+
+def llm_rule_checks_json(
+    idea: Dict[str, Any], rules: List[Dict[str, Any]], cfg: LLMConfig
+) -> List[Dict[str, Any]]:
+    """Judge only `rules`; one {rule_id, fires, conf, reason} entry per known rule."""
+    client = get_client(cfg)
+    system = (
+        "You are a rigorous startup idea evaluator. Check the idea against ONLY the given redline rules. "
+        'Return ONLY a strict JSON object: {"results": [{"rule_id": "...", "fires": true|false, "conf": 0.0, "reason": "..."}]}.'
+    )
+    rubric = "\n".join(
+        f"{r.get('id')}: {r.get('condition')} (rationale: {r.get('rationale')})"
+        for r in rules
+    )
+    user = (
+        _language_line(cfg)
+        + f"Idea:\n{json.dumps(idea, ensure_ascii=False, indent=2)}\n\n"
+        f"Rules:\n{rubric}\n\n"
+        "For each rule, `fires` is true only if the idea clearly triggers it; "
+        "conf is your confidence in that judgement in [0,1]; reason is one short sentence."
+    )
+    data = _parse_object(client.complete_json(system, user)) or {}
+    known = {str(r.get("id")) for r in rules}
+    out = []
+    for item in data.get("results") or []:
+        if isinstance(item, dict) and str(item.get("rule_id")) in known:
+            try:
+                conf = max(0.0, min(1.0, float(item.get("conf", 0.5))))
+            except (TypeError, ValueError):
+                conf = 0.5
+            out.append(
+                {
+                    "rule_id": str(item["rule_id"]),
+                    "fires": item.get("fires") is True,
+                    "conf": conf,
+                    "reason": str(item.get("reason") or ""),
+                }
+            )
+    if not out:
+        raise ValueError("no usable rule results")
+    return out
+
+
+def _is_early_deny(
+    check: Dict[str, Any], rule: Dict[str, Any], deny_conf: float
+) -> bool:
+    return (
+        check["fires"]
+        and rule.get("severity") == "critical"
+        and rule.get("decision") == "deny"
+        and check["conf"] >= deny_conf
+    )
+
+
+def merge_checks(
+    checks: List[Dict[str, Any]],
+    by_id: Dict[str, Dict[str, Any]],
+    failed: int = 0,
+) -> Dict[str, Any]:
+    fired = [c for c in checks if c["fires"]]
+    # "continue" rules are informational and never block on their own
+    blocking = [c for c in fired if by_id[c["rule_id"]].get("decision") != "continue"]
+    denies = [c for c in blocking if by_id[c["rule_id"]].get("decision") == "deny"]
+    if denies:
+        decision, basis = "deny", denies
+    elif blocking or failed:
+        decision, basis = "caution", blocking or checks
+    else:
+        decision, basis = "go", checks
+    conf = sum(c["conf"] for c in basis) / len(basis) if basis else 0.5
+    reasons = [f"{c['rule_id']}: {c['reason']}" for c in fired if c["reason"]]
+    if failed:
+        reasons.append(FALLBACK_REASON)
+    next_steps: List[str] = []
+    for c in fired:
+        for step in by_id[c["rule_id"]].get("next_steps") or []:
+            if step not in next_steps:
+                next_steps.append(step)
+    return {
+        "decision": decision,
+        "conf_level": float(f"{conf:.2f}"),
+        "reasons": reasons,
+        "redlines": [c["rule_id"] for c in fired],
+        "next_steps": next_steps,
+        "reasons_map": [
+            {"rule_id": c["rule_id"], "reason": c["reason"]} for c in fired
+        ],
+    }
+
+
+def run_checks(
+    groups: List[List[Dict[str, Any]]],
+    check: Callable[[List[Dict[str, Any]]], List[Dict[str, Any]]],
+    max_workers: int,
+    deny_conf: float,
+) -> Dict[str, Any]:
+    by_id = {str(r.get("id")): r for g in groups for r in g}
+    checks: List[Dict[str, Any]] = []
+    failed = 0
+    pool = ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(groups))))
+    try:
+        # Submitted critical-first, so with fewer workers than groups they start first
+        pending: List[Future] = [pool.submit(check, g) for g in groups]
+        while pending:
+            done, rest = wait(pending, return_when=FIRST_COMPLETED)
+            pending = list(rest)
+            for fut in done:
+                try:
+                    results = fut.result()
+                except Exception:
+                    failed += 1
+                    continue
+                checks.extend(results)
+                hits = [
+                    c
+                    for c in results
+                    if _is_early_deny(c, by_id[c["rule_id"]], deny_conf)
+                ]
+                if hits:
+                    # Early exit: remaining groups cannot overturn a confident critical deny
+                    merged = merge_checks(checks, by_id)
+                    merged["decomposed"] = {"early_exit": hits[0]["rule_id"]}
+                    return merged
+    finally:
+        pool.shutdown(wait=False, cancel_futures=True)
+    if not checks:
+        return {
+            "decision": "caution",
+            "conf_level": 0.5,
+            "reasons": [FALLBACK_REASON],
+            "redlines": [],
+            "next_steps": [],
+        }
+    return merge_checks(checks, by_id, failed)
+
+
+def llm_decomposed_verdict_json(
+    idea: Dict[str, Any],
+    rules: List[Dict[str, Any]],
+    cfg: LLMConfig,
+    allowed_redline_ids: Optional[List[str]] = None,
+    correction_note: Optional[str] = None,
+) -> Dict[str, Any]:
+    """Same shape as llm_verdict_json, built from small concurrent per-rule calls."""
+    opts = cfg.decompose
+    allowed = set(allowed_redline_ids or [])
+    if allowed:
+        rules = [r for r in rules if str(r.get("id")) in allowed]
+    groups = group_rules(rules, int(opts.get("group_size", 1)))
+    return run_checks(
+        groups,
+        lambda g: llm_rule_checks_json(idea, g, cfg),
+        int(opts.get("max_workers", 8)),
+        float(opts.get("deny_conf", 0.8)),
+    )
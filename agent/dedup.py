@@ -0,0 +1,216 @@
+from __future__ import annotations
+
+import base64
+import hashlib
+import json
+import os
+import random
+import re
+import struct
+import threading
+import unicodedata
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Set, Tuple, Union
+
+from .fastload import CACHE_DIR
+
+
+NUM_PERM = 128
+BANDS = 32  # 4 rows per band: candidates from ~0.4 Jaccard, verified afterwards
+DEFAULT_THRESHOLD = 0.8
+DEFAULT_INDEX = CACHE_DIR / "near_dup" / "index.jsonl"
+
+_PRIME = (1 << 61) - 1
+_MASK = 0xFFFFFFFF
+_rng = random.Random(20240601)
+_PERMS = [
+    (_rng.randrange(1, _PRIME), _rng.randrange(0, _PRIME)) for _ in range(NUM_PERM)
+]
+
+# One token per CJK character (no word boundaries there), whole words otherwise
+_CJK = r"\u3400-\u9fff\uf900-\ufaff"
+_TOKEN_RE = re.compile(rf"[{_CJK}]|[^\W_{_CJK}]+", re.UNICODE)
+_TEXT_FIELDS = ("intent", "user", "scenario")
+
+
+def _field(idea: Any, name: str) -> Any:
+    return idea.get(name) if isinstance(idea, dict) else getattr(idea, name, None)
+
+
+def idea_fields(idea: Any) -> List[str]:
+    parts = [str(_field(idea, k) or "") for k in _TEXT_FIELDS]
+    parts.extend(str(a) for a in _field(idea, "assumptions") or [])
+    return [p for p in parts if p.strip()]
+
+
+def shingles(texts: Iterable[str]) -> Set[str]:
+    """Token bigrams per field: CJK character bigrams, word bigrams elsewhere."""
+    out: Set[str] = set()
+    for text in texts:
+        tokens = _TOKEN_RE.findall(unicodedata.normalize("NFKC", text).lower())
+        if len(tokens) == 1:
+            out.add(tokens[0])
+        out.update(f"{a} {b}" for a, b in zip(tokens, tokens[1:]))
+    return out
+
+
+def minhash(items: Iterable[str]) -> Tuple[int, ...]:
+    hashes = [
+        int.from_bytes(
+            hashlib.blake2b(s.encode("utf-8"), digest_size=8).digest(), "big"
+        )
+        for s in items
+    ]
+    if not hashes:
+        return (_MASK,) * NUM_PERM
+    return tuple(min(((a * h + b) % _PRIME) & _MASK for h in hashes) for a, b in _PERMS)
+
+
+def signature(idea: Any) -> Tuple[int, ...]:
+    return minhash(shingles(idea_fields(idea)))
+
+
+def similarity(a: Sequence[int], b: Sequence[int]) -> float:
+    """Estimated Jaccard similarity of the underlying shingle sets."""
+    return sum(1 for x, y in zip(a, b) if x == y) / len(a)
+
+
+def _bands(sig: Sequence[int]) -> List[Tuple[int, ...]]:
+    rows = len(sig) // BANDS
+    return [tuple(sig[i * rows : (i + 1) * rows]) for i in range(BANDS)]
+
+
+def _pack(sig: Sequence[int]) -> str:
+    return base64.b64encode(struct.pack(f"<{len(sig)}I", *sig)).decode("ascii")
+
+
+def _unpack(text: str) -> Tuple[int, ...]:
+    raw = base64.b64decode(text)
+    return struct.unpack(f"<{len(raw) // 4}I", raw)
+
+
+def rules_digest(rules: Sequence[Any]) -> str:
+    # Verdicts are only reusable under the rule set they were produced with
+    dumped = [r.model_dump() if hasattr(r, "model_dump") else r.__dict__ for r in rules]
+    blob = json.dumps(dumped, sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha1(blob.encode("utf-8")).hexdigest()[:16]
+
+
+def facts_digest(idea: Any) -> str:
+    # Rule `expr` checks read facts, so equal text is not enough to share a verdict
+    blob = json.dumps(_field(idea, "facts") or {}, sort_keys=True, default=str)
+    return hashlib.sha1(blob.encode("utf-8")).hexdigest()[:16]
+
+
+class NearDupIndex:
+    """Persistent MinHash/LSH index of evaluated ideas.
+
+    Stored as an append-only JSONL log (later lines for a key win), so adding
+    an idea is a single appended line rather than a rewrite of the index.
+    """
+
+    def __init__(
+        self,
+        path: Union[str, Path] = DEFAULT_INDEX,
+        threshold: float = DEFAULT_THRESHOLD,
+    ) -> None:
+        self.path = Path(path)
+        self.threshold = threshold
+        self.entries: Dict[str, Dict[str, Any]] = {}
+        self._buckets: Dict[Tuple[int, Tuple[int, ...]], Set[str]] = {}
+        self._lock = threading.Lock()
+        if self.path.exists():
+            with open(self.path, "r", encoding="utf-8") as f:
+                for line in f:
+                    try:
+                        rec = json.loads(line)
+                        self._insert(rec["key"], _unpack(rec["sig"]), rec)
+                    except (ValueError, KeyError, struct.error):
+                        # Tolerate a torn last line from an interrupted run
+                        continue
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def _insert(self, key: str, sig: Tuple[int, ...], rec: Dict[str, Any]) -> None:
+        old = self.entries.get(key)
+        if old is not None:
+            for i, band in enumerate(_bands(old["sig"])):
+                self._buckets.get((i, band), set()).discard(key)
+        self.entries[key] = {**rec, "sig": sig}
+        for i, band in enumerate(_bands(sig)):
+            self._buckets.setdefault((i, band), set()).add(key)
+
+    def query(self, sig: Sequence[int]) -> List[Tuple[str, float]]:
+        """(key, similarity) of indexed ideas at or above the threshold, best first."""
+        candidates: Set[str] = set()
+        for i, band in enumerate(_bands(sig)):
+            candidates |= self._buckets.get((i, band), set())
+        scored = [(k, similarity(sig, self.entries[k]["sig"])) for k in candidates]
+        return sorted(
+            [(k, s) for k, s in scored if s >= self.threshold],
+            key=lambda x: (-x[1], x[0]),
+        )
+
+    def add(
+        self,
+        key: str,
+        sig: Tuple[int, ...],
+        verdict: Optional[str] = None,
+        rules: Optional[str] = None,
+        facts: Optional[str] = None,
+    ) -> str:
+        """Index `key` and return its cluster id (the first member of the cluster)."""
+        with self._lock:
+            matches = [(k, s) for k, s in self.query(sig) if k != key]
+            cluster = self.entries[matches[0][0]]["cluster"] if matches else key
+            rec = {
+                "key": key,
+                "cluster": cluster,
+                "verdict": verdict,
+                "rules": rules,
+                "facts": facts,
+            }
+            self._insert(key, sig, rec)
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            with open(self.path, "a", encoding="utf-8") as f:
+                f.write(
+                    json.dumps({**rec, "sig": _pack(sig)}, ensure_ascii=False) + "\n"
+                )
+            return cluster
+
+    def reusable(
+        self, sig: Sequence[int], rules: str, facts: Optional[str] = None
+    ) -> Optional[Tuple[str, float, Path]]:
+        """Best match whose verdict came from the same rules and facts and is still on disk."""
+        for key, sim in self.query(sig):
+            entry = self.entries[key]
+            verdict = entry.get("verdict")
+            if (
+                verdict
+                and entry.get("rules") == rules
+                and entry.get("facts") == facts
+                and Path(verdict).exists()
+            ):
+                return key, sim, Path(verdict)
+        return None
+
+    def clusters(self, min_size: int = 2) -> Dict[str, List[str]]:
+        out: Dict[str, List[str]] = {}
+        for key, entry in self.entries.items():
+            out.setdefault(entry["cluster"], []).append(key)
+        return {c: sorted(m) for c, m in sorted(out.items()) if len(m) >= min_size}
+
+    def compact(self) -> None:
+        """Rewrite the log with one line per key."""
+        with self._lock:
+            tmp = self.path.with_suffix(f".{os.getpid()}.tmp")
+            with open(tmp, "w", encoding="utf-8") as f:
+                for entry in self.entries.values():
+                    f.write(
+                        json.dumps(
+                            {**entry, "sig": _pack(entry["sig"])}, ensure_ascii=False
+                        )
+                        + "\n"
+                    )
+            os.replace(tmp, self.path)
@@ -2,28 +2,35 @@ from __future__ import annotations
 
 import glob
 import os
-from typing import List, Any, cast
+from typing import Callable, Dict, List, Any, Optional, Tuple, Union, cast
 
-import yaml
-
-from .schemas import Rule, Idea, Verdict
-from .llm import load_model_config, llm_verdict_json
+from .fastload import load_yaml
+from .schemas import Rule, Idea, Verdict, validate_rules
+from .llm import FALLBACK_REASON, LLMConfig, load_model_config, llm_verdict_json
+from .decompose import llm_decomposed_verdict_json
+from .ensemble import llm_ensemble_verdict_json
+from .evidence import evidence_payload, retrieve_evidence
+from .sampling import llm_sampled_verdict_json
+from .ruleexpr import ExprError, check_rules, compile_expr
 
 
 def load_rules(rules_dir: str) -> List[Rule]:
-    rules: List[Rule] = []
-    for path in sorted(glob.glob(os.path.join(rules_dir, "*.yaml"))):
-        with open(path, "r", encoding="utf-8") as f:
-            data = yaml.safe_load(f) or {}
-            rules.append(Rule(**data))
-    return rules
+    paths = sorted(glob.glob(os.path.join(rules_dir, "*.yaml")))
+    rules, errors = validate_rules([load_yaml(p) or {} for p in paths])
+    if errors:
+        i, msg = errors[0]
+        raise ValueError(f"Invalid rule file {paths[i]}: {msg}")
+    for path, rule in zip(paths, rules):
+        if rule is not None and rule.expr:
+            try:
+                compile_expr(rule.expr)
+            except ExprError as e:
+                raise ValueError(f"Invalid rule file {path}: expr: {e}") from None
+    return [r for r in rules if r is not None]
 
 
-def arbitrate_llm(
-    idea: Idea, rules: List[Rule], model_cfg_path: str, mode: str = "llm-only"
-) -> Verdict:
-    # Prepare plain dicts for LLM
-    idea_d = {
+def idea_payload(idea: Idea) -> Dict[str, Any]:
+    return {
         "intent": idea.intent,
         "user": idea.user,
         "scenario": idea.scenario,
@@ -31,8 +38,12 @@ def arbitrate_llm(
         "alts": idea.alts,
         "assumptions": list(idea.assumptions or []),
         "risks": list(idea.risks or []),
+        **({"facts": dict(idea.facts)} if getattr(idea, "facts", None) else {}),
     }
-    rules_d = [
+
+
+def rules_payload(rules: List[Rule]) -> List[Dict[str, Any]]:
+    return [
         {
             "id": r.id,
             "scope": r.scope,
@@ -47,10 +58,176 @@ def arbitrate_llm(
         for r in rules
     ]
 
+
+def arbitrate_llm(
+    idea: Idea,
+    rules: List[Rule],
+    model_cfg_path: Union[str, LLMConfig],
+    mode: str = "llm-only",
+    overrides: Optional[Dict[str, Any]] = None,
+    local: Optional[Dict[str, Optional[bool]]] = None,
+) -> Verdict:
+    # Rules with an `expr` are checked locally first (`local` when precomputed
+    # for a whole corpus chunk); a fired deny rule needs no LLM call at all
+    checks = local if local is not None else check_rules([idea], rules)[0]
+    decided, rules, fired = apply_local_checks(checks, rules)
+    if decided is not None:
+        return decided
+
+    # Prepare plain dicts for LLM
+    idea_d = idea_payload(idea)
+    rules_d = rules_payload(rules)
+
     cfg = load_model_config(model_cfg_path)
+    if overrides is not None:
+        # e.g. a cheaper single model when a batch budget runs low
+        cfg = cfg.derive(overrides)
+    evidence = retrieve_evidence(idea, cfg.evidence) if cfg.evidence else []
+    if evidence:
+        idea_d["evidence"] = evidence_payload(evidence)
     allowed_ids: List[str] = [str(r.get("id")) for r in rules_d if r.get("id")]
-    data = llm_verdict_json(idea_d, rules_d, cfg, allowed_redline_ids=allowed_ids)
+    if cfg.cascade:
+        verdict = _cascade(idea_d, rules_d, cfg, allowed_ids)
+    else:
+        verdict = _judge(idea_d, rules_d, cfg, allowed_ids)[0]
+    merge_fired(verdict, [r.id for r in fired])
+    verdict.evidence = evidence
+    if cfg.language and cfg.language != "auto":
+        # Lets report fan-out skip translating into the language it was written in
+        verdict.language = cfg.language
+    return verdict
+
+
+def apply_local_checks(
+    checks: Dict[str, Optional[bool]], rules: List[Rule]
+) -> Tuple[Optional[Verdict], List[Rule], List[Rule]]:
+    """(deterministic verdict or None, rules still to ask about, fired non-deny rules)."""
+    decided = deterministic_verdict(checks, rules)
+    # Rules the facts rule out are not worth the LLM's attention (or tokens)
+    kept = [r for r in rules if checks.get(r.id) is not False]
+    return decided, kept, _fired(checks, rules)
+
+
+def merge_fired(verdict: Verdict, fired_ids: List[str]) -> None:
+    # Non-deny rules that fired locally are facts, whatever the model said
+    for rule_id in fired_ids:
+        if rule_id not in verdict.redlines:
+            verdict.redlines.append(rule_id)
+        if verdict.decision == "go":
+            verdict.decision = "caution"
+
+
+def _fired(checks: Dict[str, Optional[bool]], rules: List[Rule]) -> List[Rule]:
+    # "continue" rules are informational: firing them changes nothing
+    return [r for r in rules if checks.get(r.id) is True and r.decision != "continue"]
+
+
+def deterministic_verdict(
+    checks: Dict[str, Optional[bool]], rules: List[Rule]
+) -> Optional[Verdict]:
+    """Verdict from rule `expr` checks alone, or None when the LLM is still needed.
+
+    Decided locally when a deny rule fired, or when every rule has an `expr`
+    and all of them resolved.
+    """
+    fired = _fired(checks, rules)
+    deny = [r for r in fired if r.decision == "deny"]
+    if deny:
+        fired = deny
+        decision = "deny"
+    elif rules and all(checks.get(r.id) is not None for r in rules):
+        decision = "caution" if fired else "go"
+    else:
+        return None
+    return Verdict(
+        decision=cast(Any, decision),
+        reasons=[f"{r.id}: {r.rationale} ({r.expr})" for r in fired],
+        conf_level=1.0,
+        redlines=[r.id for r in fired],
+        next_steps=[s for r in fired for s in r.next_steps or []],
+        deterministic=True,
+    )
+
+
+def cascade_tiers(cfg: LLMConfig) -> List[Tuple[str, LLMConfig]]:
+    """("fast", cheap overrides) then ("strong", the configured model itself)."""
+    strong = LLMConfig({k: v for k, v in cfg.raw.items() if k != "cascade"})
+    return [
+        ("fast", cfg.derive(dict(cfg.cascade.get("fast") or {}))),
+        ("strong", strong),
+    ]
+
+
+def escalation_reasons(
+    verdict: Verdict, flags: List[str], cascade: Dict[str, Any]
+) -> List[str]:
+    escalate_on = cascade.get("escalate_on") or ["low_conf", "caution", "repair"]
+    found = [f for f in flags if f in escalate_on or f == "fallback"]
+    if "low_conf" in escalate_on and verdict.conf_level < float(
+        cascade.get("min_conf", 0.75)
+    ):
+        found.append("low_conf")
+    if "caution" in escalate_on and verdict.decision == "caution":
+        found.append("caution")
+    return found
+
+
+def _cascade(
+    idea_d: Dict[str, Any],
+    rules_d: List[Dict[str, Any]],
+    cfg: LLMConfig,
+    allowed_ids: List[str],
+) -> Verdict:
+    # Cheap model first; only unclear or repaired verdicts reach the strong model
+    *lower, (top_name, top_cfg) = cascade_tiers(cfg)
+    for name, tier_cfg in lower:
+        verdict, flags = _judge(idea_d, rules_d, tier_cfg, allowed_ids)
+        verdict.tier = name
+        if not escalation_reasons(verdict, flags, cfg.cascade):
+            return verdict
+    verdict = _judge(idea_d, rules_d, top_cfg, allowed_ids)[0]
+    verdict.tier = top_name
+    return verdict
+
 
+def _judge(
+    idea_d: Dict[str, Any],
+    rules_d: List[Dict[str, Any]],
+    cfg: LLMConfig,
+    allowed_ids: List[str],
+) -> Tuple[Verdict, List[str]]:
+    """Verdict plus flags: "repair" (redline IDs needed a retry), "fallback"."""
+    # Fan out to several models when an ensemble is configured, or sample one
+    # model n times in a single request; otherwise optionally split the rubric
+    # into small concurrent per-rule calls
+    verdict_fn = llm_verdict_json
+    if cfg.ensemble:
+        verdict_fn = llm_ensemble_verdict_json
+    elif cfg.self_consistency.get("n"):
+        verdict_fn = llm_sampled_verdict_json
+    elif cfg.decompose.get("enabled"):
+        verdict_fn = llm_decomposed_verdict_json
+    data = verdict_fn(idea_d, rules_d, cfg, allowed_redline_ids=allowed_ids)
+
+    def repair(note: str) -> Dict[str, Any]:
+        return verdict_fn(
+            idea_d, rules_d, cfg, allowed_redline_ids=allowed_ids, correction_note=note
+        )
+
+    return coerce_verdict(data, allowed_ids, repair)
+
+
+def coerce_verdict(
+    data: Dict[str, Any],
+    allowed_ids: List[str],
+    repair: Optional[Callable[[str], Dict[str, Any]]] = None,
+) -> Tuple[Verdict, List[str]]:
+    """Normalize raw LLM output into a Verdict plus flags ("repair", "fallback").
+
+    Invalid redline IDs trigger one `repair` call with a correction note; without
+    `repair` (e.g. batch-job results) they are just dropped.
+    """
+    flags: List[str] = []
     # Parse and coerce
     decision = str(data.get("decision", "caution")).lower()
     if decision not in {"deny", "caution", "go"}:
@@ -92,14 +269,14 @@ def arbitrate_llm(
     allowed_set = set(allowed_ids)
     invalid = [rl for rl in redlines if rl not in allowed_set]
     if invalid:
+        flags.append("repair")
+    if invalid and repair is not None:
         note = (
             "Some redline IDs were invalid: "
             + ", ".join(sorted(set(invalid)))
             + ". Only use IDs from the allowed list and update reasons_map accordingly."
         )
-        data = llm_verdict_json(
-            idea_d, rules_d, cfg, allowed_redline_ids=allowed_ids, correction_note=note
-        )
+        data = repair(note)
         # Re-parse with the same normalization
         decision = str(data.get("decision", decision)).lower()
         if decision not in {"deny", "caution", "go"}:
@@ -126,10 +303,14 @@ def arbitrate_llm(
     redlines = [rl for rl in redlines if rl in allowed_set]
     next_steps = [str(x) for x in (data.get("next_steps") or [])]
 
-    return Verdict(
+    if FALLBACK_REASON in reasons:
+        flags.append("fallback")
+
+    verdict = Verdict(
         decision=decision,
         reasons=reasons,
         conf_level=conf,
         redlines=redlines,
         next_steps=next_steps,
     )
+    return verdict, flags
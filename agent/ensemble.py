@@ -0,0 +1,200 @@
+from __future__ import annotations
+
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from .llm import FALLBACK_REASON, LLMConfig, llm_verdict_json
+
+
+# Higher is stricter; used for tie-breaks and the "strictest" strategy
+DECISION_RANK = {"go": 0, "caution": 1, "deny": 2}
+
+
+def member_configs(cfg: LLMConfig) -> List[Tuple[LLMConfig, float]]:
+    members: List[Tuple[LLMConfig, float]] = []
+    for item in cfg.ensemble.get("models") or []:
+        # Accept either a bare model name or a mapping of config overrides
+        overrides = {"model": item} if isinstance(item, str) else dict(item)
+        weight = float(overrides.pop("weight", 1.0))
+        members.append((cfg.derive(overrides), weight))
+    return members
+
+
+def _is_valid(data: Dict[str, Any]) -> bool:
+    return FALLBACK_REASON not in (data.get("reasons") or [])
+
+
+def _decision(data: Dict[str, Any]) -> str:
+    d = str(data.get("decision", "caution")).lower()
+    return d if d in DECISION_RANK else "caution"
+
+
+def _conf(data: Dict[str, Any]) -> float:
+    try:
+        return max(0.0, min(1.0, float(data.get("conf_level", 0.5))))
+    except Exception:
+        return 0.5
+
+
+def _dedup(items: List[Any]) -> List[Any]:
+    out: List[Any] = []
+    seen = set()
+    for x in items:
+        key = repr(x)
+        if key not in seen:
+            seen.add(key)
+            out.append(x)
+    return out
+
+
+def quorum_reached(
+    results: List[Tuple[Dict[str, Any], float]],
+    strategy: str,
+    quorum: int,
+    pending_weight: float = 0.0,
+) -> bool:
+    if strategy == "strictest":
+        return len(results) >= quorum
+    counts: Dict[str, int] = {}
+    weights: Dict[str, float] = {}
+    for data, w in results:
+        d = _decision(data)
+        counts[d] = counts.get(d, 0) + 1
+        weights[d] = weights.get(d, 0.0) + w
+    if not weights:
+        return False
+    # Same ordering as aggregate_verdicts: weight first, then strictness
+    lead = max(weights, key=lambda d: (weights[d], DECISION_RANK[d]))
+    if counts[lead] < quorum:
+        return False
+    # Stop only if the members still pending cannot overturn the weighted vote
+    return all(
+        (weights.get(d, 0.0) + pending_weight, DECISION_RANK[d])
+        < (weights[lead], DECISION_RANK[lead])
+        for d in DECISION_RANK
+        if d != lead
+    )
+
+
+def aggregate_verdicts(
+    results: List[Tuple[Dict[str, Any], float]], strategy: str = "vote"
+) -> Dict[str, Any]:
+    total = sum(w for _, w in results) or 1.0
+    by_decision: Dict[str, float] = {}
+    for data, w in results:
+        d = _decision(data)
+        by_decision[d] = by_decision.get(d, 0.0) + w
+
+    if strategy == "strictest":
+        decision = max(by_decision, key=lambda d: DECISION_RANK[d])
+    else:
+        # Weighted vote; ties go to the stricter decision
+        decision = max(by_decision, key=lambda d: (by_decision[d], DECISION_RANK[d]))
+    agreeing = [(data, w) for data, w in results if _decision(data) == decision]
+
+    redline_weight: Dict[str, float] = {}
+    for data, w in results:
+        for rl in set(str(x) for x in data.get("redlines") or []):
+            redline_weight[rl] = redline_weight.get(rl, 0.0) + w
+    if strategy == "strictest":
+        redlines = sorted(redline_weight)
+    else:
+        redlines = sorted(rl for rl, w in redline_weight.items() if w / total >= 0.5)
+
+    # Confidence = agreeing members' mean confidence scaled by weighted agreement
+    agree_w = sum(w for _, w in agreeing) or 1.0
+    mean_conf = sum(_conf(data) * w for data, w in agreeing) / agree_w
+    agreement = by_decision[decision] / total
+
+    return {
+        "decision": decision,
+        "conf_level": float(f"{mean_conf * agreement:.2f}"),
+        "reasons": _dedup(
+            [str(x) for data, _ in agreeing for x in data.get("reasons") or []]
+        ),
+        "redlines": redlines,
+        "next_steps": _dedup(
+            [str(x) for data, _ in agreeing for x in data.get("next_steps") or []]
+        ),
+        "reasons_map": _dedup(
+            [
+                item
+                for data, _ in results
+                for item in data.get("reasons_map") or []
+                if isinstance(item, dict) and str(item.get("rule_id")) in redlines
+            ]
+        ),
+        "ensemble": {
+            "strategy": strategy,
+            "responses": len(results),
+            "agreement": float(f"{agreement:.2f}"),
+        },
+    }
+
+
+def fan_out(
+    members: List[Tuple[LLMConfig, float]],
+    call: Callable[[LLMConfig], Dict[str, Any]],
+    strategy: str = "vote",
+    quorum: Optional[int] = None,
+) -> List[Tuple[Dict[str, Any], float]]:
+    if quorum is None:
+        quorum = len(members) // 2 + 1 if strategy == "vote" else len(members)
+    results: List[Tuple[Dict[str, Any], float]] = []
+    errors: List[BaseException] = []
+    pool = ThreadPoolExecutor(max_workers=max(1, len(members)))
+    try:
+        pending: Dict[Future, float] = {pool.submit(call, c): w for c, w in members}
+        while pending:
+            done, _ = wait(list(pending), return_when=FIRST_COMPLETED)
+            for fut in done:
+                weight = pending.pop(fut)
+                try:
+                    data = fut.result()
+                except Exception as e:
+                    errors.append(e)
+                    continue
+                if _is_valid(data):
+                    results.append((data, weight))
+            if quorum_reached(results, strategy, quorum, sum(pending.values())):
+                break
+    finally:
+        # Drop queued calls; in-flight HTTP requests finish in the background and are ignored
+        pool.shutdown(wait=False, cancel_futures=True)
+    if not results and errors:
+        raise errors[-1]
+    return results
+
+
+def llm_ensemble_verdict_json(
+    idea: Dict[str, Any],
+    rules: List[Dict[str, Any]],
+    cfg: LLMConfig,
+    allowed_redline_ids: Optional[List[str]] = None,
+    correction_note: Optional[str] = None,
+) -> Dict[str, Any]:
+    members = member_configs(cfg)
+    if not members:
+        return llm_verdict_json(
+            idea, rules, cfg, allowed_redline_ids, correction_note=correction_note
+        )
+    strategy = str(cfg.ensemble.get("strategy", "vote")).lower()
+    quorum = cfg.ensemble.get("quorum")
+
+    def call(member: LLMConfig) -> Dict[str, Any]:
+        return llm_verdict_json(
+            idea, rules, member, allowed_redline_ids, correction_note=correction_note
+        )
+
+    results = fan_out(
+        members, call, strategy, int(quorum) if quorum is not None else None
+    )
+    if not results:
+        return {
+            "decision": "caution",
+            "conf_level": 0.5,
+            "reasons": [FALLBACK_REASON],
+            "redlines": [],
+            "next_steps": [],
+        }
+    return aggregate_verdicts(results, strategy)
@@ -0,0 +1,476 @@
+from __future__ import annotations
+
+import hashlib
+import heapq
+import json
+import math
+import mmap
+import os
+import re
+import shutil
+import threading
+import time
+import uuid
+from array import array
+from bisect import bisect_left
+from collections import Counter
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple, Union
+
+try:
+    import fcntl
+except Exception:  # non-POSIX: concurrent ingests are not serialized
+    fcntl = None  # type: ignore
+
+from .fastload import CACHE_DIR
+
+DEFAULT_INDEX = CACHE_DIR / "evidence"
+SEGMENT_DOCS = 200_000
+# Postings scored between deadline checks
+POSTINGS_CHUNK = 2048
+EVIDENCE_TYPES = ("primary", "secondary", "tertiary")
+TEXT_SUFFIXES = {".md", ".txt", ".jsonl"}
+
+# BM25 parameters
+K1 = 1.2
+B = 0.75
+
+# Latin words/numbers, or runs of CJK ideographs (split into bigrams below)
+_TOKEN = re.compile(r"[0-9a-z]+|[\u3400-\u9fff\uf900-\ufaff]+")
+
+
+def tokenize(text: str) -> List[str]:
+    """Lowercased words; CJK runs become overlapping character bigrams."""
+    out: List[str] = []
+    for m in _TOKEN.finditer(text.lower()):
+        run = m.group()
+        if run[0] >= "\u3400":
+            if len(run) == 1:
+                out.append(run)
+            else:
+                out.extend(run[i : i + 2] for i in range(len(run) - 1))
+        elif len(run) > 1 or run.isdigit():
+            out.append(run)
+    return out
+
+
+def term_hash(term: str) -> int:
+    # 64-bit keys keep the lexicon a fixed-width sorted array (no string table)
+    digest = hashlib.blake2b(term.encode("utf-8"), digest_size=8).digest()
+    return int.from_bytes(digest, "little")
+
+
+def _split_text(text: str, max_chars: int) -> Iterator[str]:
+    buf = ""
+    for para in re.split(r"\n\s*\n", text):
+        para = " ".join(para.split())
+        if not para:
+            continue
+        if buf and len(buf) + len(para) + 1 > max_chars:
+            yield buf
+            buf = ""
+        buf = f"{buf} {para}".strip()
+        while len(buf) > max_chars:
+            yield buf[:max_chars]
+            buf = buf[max_chars:]
+    if buf:
+        yield buf
+
+
+def _jsonl_passages(
+    path: Path, default_type: str, errors: Optional[List[str]], chunk_size: int = 1000
+) -> Iterator[Dict[str, Any]]:
+    from .schemas import validate_evidence
+
+    def flush(chunk: List[Tuple[int, Dict[str, Any]]]) -> Iterator[Dict[str, Any]]:
+        # Checked as Evidence now, so a bad field cannot fail a verdict later
+        rows = [
+            {
+                "type": rec["type"]
+                if rec.get("type") in EVIDENCE_TYPES
+                else default_type,
+                "provenance": str(rec.get("provenance") or f"{path}:{lineno}"),
+                **{
+                    k: rec[k]
+                    for k in ("weight", "sample_size", "timestamp")
+                    if k in rec
+                },
+            }
+            for lineno, rec in chunk
+        ]
+        items, bad = validate_evidence(rows)
+        messages = dict(bad)
+        for i, ((lineno, rec), item) in enumerate(zip(chunk, items)):
+            if item is None:
+                if errors is not None:
+                    errors.append(f"{path}:{lineno}: {messages.get(i)}")
+                continue
+            fields = item.model_dump()
+            fields.pop("excerpts", None)
+            fields.pop("score", None)
+            yield {"text": str(rec["text"]), **fields}
+
+    chunk: List[Tuple[int, Dict[str, Any]]] = []
+    with open(path, "r", encoding="utf-8") as f:
+        for lineno, line in enumerate(f, start=1):
+            if not line.strip():
+                continue
+            try:
+                rec = json.loads(line)
+            except ValueError as e:
+                if errors is not None:
+                    errors.append(f"{path}:{lineno}: invalid JSON ({e})")
+                continue
+            if not isinstance(rec, dict) or not rec.get("text"):
+                if errors is not None:
+                    errors.append(f"{path}:{lineno}: missing text")
+                continue
+            chunk.append((lineno, rec))
+            if len(chunk) >= chunk_size:
+                yield from flush(chunk)
+                chunk = []
+    yield from flush(chunk)
+
+
+def iter_passages(
+    paths: Iterable[Union[str, Path]],
+    default_type: str = "secondary",
+    max_chars: int = 600,
+    errors: Optional[List[str]] = None,
+) -> Iterator[Dict[str, Any]]:
+    """Passages from .md/.txt files (paragraph chunks) and .jsonl records.
+
+    JSONL lines carry `text` plus optional Evidence fields (type, provenance,
+    weight, sample_size, timestamp). Lines that are not JSON or fail Evidence
+    validation are skipped and, with `errors`, reported as "path:line: reason".
+    Directories are walked recursively.
+    """
+    for root in paths:
+        root = Path(root)
+        files = (
+            sorted(p for p in root.rglob("*") if p.suffix in TEXT_SUFFIXES)
+            if root.is_dir()
+            else [root]
+        )
+        for path in files:
+            if path.suffix == ".jsonl":
+                yield from _jsonl_passages(path, default_type, errors)
+                continue
+            text = path.read_text(encoding="utf-8", errors="replace")
+            for n, chunk in enumerate(_split_text(text, max_chars), start=1):
+                yield {
+                    "text": chunk,
+                    "provenance": f"{path}#p{n}",
+                    "type": default_type,
+                }
+
+
+def write_segment(directory: Path, passages: List[Dict[str, Any]]) -> Dict[str, int]:
+    """Write one immutable segment: sorted hash lexicon, postings, lengths, docs."""
+    postings: Dict[int, List[int]] = {}
+    doclen = array("I")
+    doc_off = array("Q", [0])
+    blobs: List[bytes] = []
+    for doc_id, passage in enumerate(passages):
+        counts = Counter(tokenize(passage["text"]))
+        doclen.append(sum(counts.values()))
+        for term, tf in counts.items():
+            postings.setdefault(term_hash(term), []).extend((doc_id, tf))
+        blob = json.dumps(passage, ensure_ascii=False).encode("utf-8")
+        blobs.append(blob)
+        doc_off.append(doc_off[-1] + len(blob))
+
+    lex_hash, lex_off, lex_df, post = array("Q"), array("Q"), array("I"), array("I")
+    for h in sorted(postings):
+        pairs = postings[h]
+        lex_hash.append(h)
+        lex_off.append(len(post) // 2)
+        lex_df.append(len(pairs) // 2)
+        post.extend(pairs)
+
+    directory.mkdir(parents=True)
+    for name, data in (
+        ("lex_hash.bin", lex_hash),
+        ("lex_off.bin", lex_off),
+        ("lex_df.bin", lex_df),
+        ("postings.bin", post),
+        ("doclen.bin", doclen),
+        ("doc_off.bin", doc_off),
+    ):
+        with open(directory / name, "wb") as f:
+            data.tofile(f)
+    with open(directory / "docs.bin", "wb") as f:
+        for blob in blobs:
+            f.write(blob)
+    meta = {"docs": len(passages), "tokens": sum(doclen), "terms": len(lex_hash)}
+    (directory / "meta.json").write_text(json.dumps(meta), encoding="utf-8")
+    return meta
+
+
+class Segment:
+    """Read-only view of one segment; every file is memory-mapped, nothing is loaded."""
+
+    def __init__(self, directory: Path) -> None:
+        self.directory = directory
+        self.meta = json.loads((directory / "meta.json").read_text(encoding="utf-8"))
+        self._maps: List[mmap.mmap] = []
+        self.lex_hash = self._array("lex_hash.bin", "Q")
+        self.lex_off = self._array("lex_off.bin", "Q")
+        self.lex_df = self._array("lex_df.bin", "I")
+        self.postings = self._array("postings.bin", "I")
+        self.doclen = self._array("doclen.bin", "I")
+        self.doc_off = self._array("doc_off.bin", "Q")
+        self.docs = self._array("docs.bin", "B")
+
+    def _array(self, name: str, code: Any) -> memoryview:
+        path = self.directory / name
+        if path.stat().st_size == 0:
+            return memoryview(b"").cast(code)  # empty files cannot be mapped
+        with open(path, "rb") as f:
+            mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        self._maps.append(mm)
+        return memoryview(mm).cast(code)
+
+    def lookup(self, h: int) -> Optional[Tuple[int, int]]:
+        i = bisect_left(self.lex_hash, h)  # type: ignore[call-overload]
+        if i < len(self.lex_hash) and self.lex_hash[i] == h:
+            return self.lex_off[i], self.lex_df[i]
+        return None
+
+    def term_postings(self, off: int, df: int) -> Tuple[List[int], List[int]]:
+        pairs = self.postings[2 * off : 2 * (off + df)]
+        return pairs[0::2].tolist(), pairs[1::2].tolist()
+
+    def doc(self, doc_id: int) -> Dict[str, Any]:
+        start, end = self.doc_off[doc_id], self.doc_off[doc_id + 1]
+        return json.loads(self.docs[start:end].tobytes())
+
+    def close(self) -> None:
+        for view in (
+            self.lex_hash,
+            self.lex_off,
+            self.lex_df,
+            self.postings,
+            self.doclen,
+            self.doc_off,
+            self.docs,
+        ):
+            view.release()
+        for mm in self._maps:
+            mm.close()
+
+
+class EvidenceIndex:
+    """Append-only BM25 index: a manifest plus immutable memory-mapped segments.
+
+    Ingesting writes new segments (at most `segment_docs` passages each) and
+    swaps the manifest atomically, so readers never see a partial segment.
+    """
+
+    def __init__(self, root: Union[str, Path, None] = None) -> None:
+        self.root = Path(root or DEFAULT_INDEX)
+        self.manifest_path = self.root / "manifest.json"
+        self.segments: List[Segment] = []
+        self.docs = 0
+        self.avgdl = 0.0
+        self._mtime: Optional[int] = None
+        self._loaded = False
+        # Reloading unmaps segments; searches must not run concurrently with it
+        self._lock = threading.RLock()
+        self.reload()
+
+    def _manifest(self) -> Dict[str, Any]:
+        try:
+            return json.loads(self.manifest_path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return {"segments": []}
+
+    def reload(self) -> None:
+        try:
+            mtime: Optional[int] = self.manifest_path.stat().st_mtime_ns
+        except OSError:
+            mtime = None
+        with self._lock:
+            if self._loaded and mtime == self._mtime:
+                return
+            self.close()
+            names = self._manifest()["segments"]
+            self.segments = [Segment(self.root / name) for name in names]
+            self._mtime, self._loaded = mtime, True
+            self.docs = sum(s.meta["docs"] for s in self.segments)
+            tokens = sum(s.meta["tokens"] for s in self.segments)
+            self.avgdl = tokens / self.docs if self.docs else 0.0
+
+    def add(
+        self, passages: Iterable[Dict[str, Any]], segment_docs: int = SEGMENT_DOCS
+    ) -> int:
+        self.root.mkdir(parents=True, exist_ok=True)
+        added = 0
+        batch: List[Dict[str, Any]] = []
+        new: List[str] = []
+
+        def flush() -> None:
+            # Unique per writer: concurrent ingests never pick the same name
+            name = f"seg-{uuid.uuid4().hex}"
+            tmp = self.root / f"{name}.{os.getpid()}.tmp"
+            if tmp.exists():
+                shutil.rmtree(tmp)
+            write_segment(tmp, batch)
+            os.replace(tmp, self.root / name)
+            new.append(name)
+
+        for passage in passages:
+            batch.append(passage)
+            added += 1
+            if len(batch) >= segment_docs:
+                flush()
+                batch = []
+        if batch:
+            flush()
+        with open(self.root / "manifest.lock", "a") as lock_f:
+            if fcntl is not None:
+                fcntl.flock(lock_f, fcntl.LOCK_EX)
+            # Re-read under the lock so another ingest's segments are kept
+            manifest = self._manifest()
+            manifest["segments"].extend(new)
+            tmp_manifest = self.manifest_path.with_suffix(f".{os.getpid()}.tmp")
+            tmp_manifest.write_text(json.dumps(manifest), encoding="utf-8")
+            os.replace(tmp_manifest, self.manifest_path)
+        self.reload()
+        return added
+
+    def search(
+        self,
+        query: str,
+        k: int = 5,
+        budget_ms: Optional[float] = None,
+        max_terms: int = 32,
+    ) -> List[Tuple[float, Dict[str, Any]]]:
+        """Top-k (score, passage) by BM25 over all segments.
+
+        Query terms are scored rarest first; with `budget_ms` scoring stops when
+        time runs out, so the most selective terms always count. Terms found in
+        over 10% of a large corpus carry almost no weight and are skipped.
+        """
+        with self._lock:
+            return self._search(query, k, budget_ms, max_terms)
+
+    def _search(
+        self, query: str, k: int, budget_ms: Optional[float], max_terms: int
+    ) -> List[Tuple[float, Dict[str, Any]]]:
+        deadline = None if budget_ms is None else time.perf_counter() + budget_ms / 1000
+        if not self.docs:
+            return []
+        max_df = max(1000, self.docs // 10)
+        terms: List[Tuple[float, List[Tuple[Segment, int, int]]]] = []
+        for term in set(tokenize(query)):
+            h = term_hash(term)
+            hits = []
+            for seg in self.segments:
+                found = seg.lookup(h)
+                if found is not None:
+                    hits.append((seg, found[0], found[1]))
+            df = sum(d for _, _, d in hits)
+            if not df or df > max_df:
+                continue
+            idf = math.log(1.0 + (self.docs - df + 0.5) / (df + 0.5))
+            terms.append((idf, hits))
+        terms.sort(key=lambda t: -t[0])
+
+        scores: Dict[Tuple[int, int], float] = {}
+        hits_left = [
+            (idf, seg, off, df)
+            for idf, hits in terms[:max_terms]
+            for seg, off, df in hits
+        ]
+        timed_out = False
+        for idf, seg, off, df in hits_left:
+            doclen, sid = seg.doclen, id(seg)
+            for start in range(0, df, POSTINGS_CHUNK):
+                n = min(POSTINGS_CHUNK, df - start)
+                docs, tfs = seg.term_postings(off + start, n)
+                for d, tf in zip(docs, tfs):
+                    norm = K1 * (1 - B + B * doclen[d] / self.avgdl)
+                    key = (sid, d)
+                    score = idf * tf * (K1 + 1) / (tf + norm)
+                    scores[key] = scores.get(key, 0.0) + score
+                # Checked per chunk, so even a term with 10^5 postings stops on time
+                if deadline is not None and time.perf_counter() >= deadline:
+                    timed_out = True
+                    break
+            if timed_out:
+                break
+        by_id = {id(s): s for s in self.segments}
+        top = heapq.nlargest(k, scores.items(), key=lambda kv: kv[1])
+        return [(score, by_id[sid].doc(d)) for (sid, d), score in top]
+
+    def close(self) -> None:
+        with self._lock:
+            for seg in self.segments:
+                seg.close()
+            self.segments = []
+
+
+_INDEXES: Dict[str, EvidenceIndex] = {}
+_INDEXES_LOCK = threading.Lock()
+
+
+def index_for(root: Union[str, Path, None] = None) -> EvidenceIndex:
+    # One mapped index per process; picks up new segments when the manifest changes
+    key = str(root or DEFAULT_INDEX)
+    with _INDEXES_LOCK:
+        if key not in _INDEXES:
+            _INDEXES[key] = EvidenceIndex(key)
+        index = _INDEXES[key]
+        index.reload()
+        return index
+
+
+def idea_query(idea: Any) -> str:
+    fields = ("intent", "user", "scenario", "triggers", "alts")
+    parts = [str(getattr(idea, f, "") or "") for f in fields]
+    parts += [str(x) for x in getattr(idea, "assumptions", None) or []]
+    parts += [str(x) for x in getattr(idea, "risks", None) or []]
+    return "\n".join(parts)
+
+
+def retrieve_evidence(idea: Any, opts: Dict[str, Any]) -> List[Any]:
+    """Top-k Evidence for `idea` per the model config's `evidence:` mapping."""
+    from .schemas import Evidence
+
+    index = index_for(opts.get("index"))
+    hits = index.search(
+        idea_query(idea),
+        k=int(opts.get("k", 5)),
+        budget_ms=float(opts.get("budget_ms", 5)),
+    )
+    max_chars = int(opts.get("max_chars", 300))
+    evidence = []
+    for score, p in hits:
+        try:
+            evidence.append(
+                Evidence(
+                    type=p.get("type") or "secondary",
+                    provenance=str(p.get("provenance") or ""),
+                    weight=p.get("weight", 1.0),
+                    sample_size=p.get("sample_size"),
+                    excerpts=[str(p.get("text") or "")[:max_chars]],
+                    timestamp=p.get("timestamp"),
+                    score=round(score, 3),
+                )
+            )
+        except (TypeError, ValueError):
+            continue  # e.g. a record indexed before ingest validated fields
+    return evidence
+
+
+def evidence_payload(evidence: List[Any]) -> List[Dict[str, Any]]:
+    return [
+        {
+            "id": f"E{i}",
+            "type": e.type,
+            "provenance": e.provenance,
+            "excerpt": " ".join(e.excerpts),
+        }
+        for i, e in enumerate(evidence, start=1)
+    ]
@@ -0,0 +1,112 @@
+from __future__ import annotations
+
+from typing import Any, Callable, Dict, List, Optional, Tuple, Union
+
+from .engine import arbitrate_llm
+from .llm import (
+    FALLBACK_REASON,
+    LLMConfig,
+    llm_expand_json,
+    llm_expand_verdict_json,
+    load_model_config,
+)
+from .schemas import Idea, Rule, Verdict
+
+
+IDEA_FIELDS = ["intent", "user", "scenario", "triggers", "alts"]
+
+
+def coerce_idea(data: Optional[Dict[str, Any]], desc: str) -> Dict[str, Any]:
+    data = data or {}
+
+    def as_str(x: Any, default: str = "") -> str:
+        return str(x) if isinstance(x, str) and x.strip() else default
+
+    def as_list(x: Any) -> list[str]:
+        if isinstance(x, list):
+            return [str(i) for i in x if str(i).strip()]
+        if isinstance(x, str) and x.strip():
+            return [x.strip()]
+        return []
+
+    return {
+        "intent": as_str(data.get("intent"), desc),
+        "user": as_str(data.get("user"), "early adopters"),
+        "scenario": as_str(data.get("scenario"), "initial use case"),
+        "triggers": as_str(data.get("triggers"), "pain/need trigger"),
+        "alts": as_str(data.get("alts"), "status quo / competitors"),
+        "assumptions": as_list(data.get("assumptions")) or [desc],
+        "risks": as_list(data.get("risks")),
+    }
+
+
+def expand_idea(desc: str, model_cfg_path: Union[str, LLMConfig]) -> Dict[str, Any]:
+    cfg = load_model_config(model_cfg_path)
+    return coerce_idea(llm_expand_json(desc, cfg), desc)
+
+
+def _idea_complete(data: Any) -> bool:
+    return isinstance(data, dict) and all(
+        isinstance(data.get(k), str) and data[k].strip() for k in IDEA_FIELDS
+    )
+
+
+def _strict_verdict(data: Any, allowed: List[str]) -> Optional[Verdict]:
+    # Unlike arbitrate_llm there is no repair here: anything off means "fall back"
+    if not isinstance(data, dict):
+        return None
+    decision = str(data.get("decision", "")).lower()
+    redlines = [str(x) for x in data.get("redlines") or []]
+    reasons = [str(x) for x in data.get("reasons") or []]
+    if decision not in {"deny", "caution", "go"} or FALLBACK_REASON in reasons:
+        return None
+    if any(rl not in allowed for rl in redlines):
+        return None
+    try:
+        conf = float(data.get("conf_level"))  # type: ignore[arg-type]
+    except (TypeError, ValueError):
+        return None
+    return Verdict(
+        decision=decision,  # type: ignore[arg-type]
+        reasons=reasons,
+        conf_level=float(f"{max(0.0, min(1.0, conf)):.2f}"),
+        redlines=redlines,
+        next_steps=[str(x) for x in data.get("next_steps") or []],
+    )
+
+
+def expand_and_evaluate(
+    desc: str,
+    rules: List[Rule],
+    model_cfg_path: Union[str, LLMConfig],
+    on_idea: Optional[Callable[[Dict[str, Any]], None]] = None,
+) -> Tuple[Dict[str, Any], Verdict, str]:
+    """Expand a one-liner and judge it in one LLM round trip.
+
+    Returns (idea, verdict, mode) where mode is "combined" when the single
+    response validated, or "two-call" when it had to fall back.
+    """
+    cfg = load_model_config(model_cfg_path)
+    allowed = [r.id for r in rules]
+    rules_d = [
+        {
+            "id": r.id,
+            "severity": r.severity,
+            "decision": r.decision,
+            "condition": r.condition,
+            "rationale": r.rationale,
+        }
+        for r in rules
+    ]
+    data = llm_expand_verdict_json(desc, rules_d, cfg, allowed, on_idea=on_idea) or {}
+
+    raw_idea = data.get("idea")
+    if _idea_complete(raw_idea):
+        idea = coerce_idea(raw_idea, desc)
+    else:
+        idea = coerce_idea(llm_expand_json(desc, cfg), desc)
+        raw_idea = None
+    verdict = _strict_verdict(data.get("verdict"), allowed) if raw_idea else None
+    if verdict is not None:
+        return idea, verdict, "combined"
+    return idea, arbitrate_llm(Idea(**idea), rules, model_cfg_path), "two-call"
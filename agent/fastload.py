@@ -0,0 +1,88 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+from pathlib import Path
+from typing import Any, Optional, Union
+
+
+# Parsed YAML is cached as JSON so hot CLI paths can skip importing PyYAML
+CACHE_DIR = Path(
+    os.environ.get("IC_CACHE_DIR") or Path(__file__).resolve().parents[1] / ".cache"
+)
+
+
+# Entries kept in .cache/yaml; beyond this, pruning drops entries for deleted
+# files first, then the least recently used
+MAX_ENTRIES = 512
+
+
+def _cache_path(path: Path) -> Path:
+    digest = hashlib.sha1(str(path.resolve()).encode("utf-8")).hexdigest()
+    return CACHE_DIR / "yaml" / f"{digest}.json"
+
+
+def load_yaml(path: Union[str, Path]) -> Any:
+    p = Path(path)
+    st = p.stat()
+    cache = _cache_path(p)
+    try:
+        entry = json.loads(cache.read_text(encoding="utf-8"))
+        if entry["mtime_ns"] == st.st_mtime_ns and entry["size"] == st.st_size:
+            os.utime(cache)  # recency for pruning
+            return entry["data"]
+    except Exception:
+        pass
+
+    import yaml
+
+    data = yaml.safe_load(p.read_text(encoding="utf-8"))
+    try:
+        payload = json.dumps(
+            {
+                "path": str(p.resolve()),
+                "mtime_ns": st.st_mtime_ns,
+                "size": st.st_size,
+                "data": data,
+            },
+            ensure_ascii=False,
+        )
+        cache.parent.mkdir(parents=True, exist_ok=True)
+        tmp = cache.with_suffix(f".{os.getpid()}.tmp")
+        tmp.write_text(payload, encoding="utf-8")
+        os.replace(tmp, cache)
+        prune_cache()
+    except (TypeError, ValueError, OSError):
+        # Non-JSON values (e.g. YAML dates) or a read-only tree: just skip caching
+        pass
+    return data
+
+
+def prune_cache(max_entries: Optional[int] = None) -> int:
+    """Bound the YAML cache; returns the number of entries removed."""
+    max_entries = MAX_ENTRIES if max_entries is None else max_entries
+    entries = list((CACHE_DIR / "yaml").glob("*.json"))
+    if len(entries) <= max_entries:
+        return 0
+    removed = 0
+    kept = []
+    for cache in entries:
+        try:
+            source = json.loads(cache.read_text(encoding="utf-8")).get("path")
+            if source and Path(source).exists():
+                kept.append((cache.stat().st_mtime_ns, cache))
+                continue
+            cache.unlink()  # source deleted (temp files), or an older entry format
+            removed += 1
+        except (OSError, ValueError, AttributeError):
+            continue
+    # Down to 3/4 so the next few writes do not prune again
+    kept.sort()
+    for _, cache in kept[: max(0, len(kept) - max_entries * 3 // 4)]:
+        try:
+            cache.unlink()
+            removed += 1
+        except OSError:
+            continue
+    return removed
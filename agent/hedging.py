@@ -0,0 +1,103 @@
+from __future__ import annotations
+
+import threading
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from typing import Callable, Deque, Dict, Optional, Tuple
+
+
+class LatencyTracker:
+    """Sliding window of recent successful call latencies (seconds)."""
+
+    def __init__(self, window: int = 200, min_samples: int = 10) -> None:
+        self._samples: Deque[float] = deque(maxlen=window)
+        self._min_samples = min_samples
+        self._lock = threading.Lock()
+
+    def record(self, latency_s: float) -> None:
+        with self._lock:
+            self._samples.append(latency_s)
+
+    def percentile(self, p: float) -> Optional[float]:
+        with self._lock:
+            if len(self._samples) < self._min_samples:
+                return None
+            data = sorted(self._samples)
+        idx = min(len(data) - 1, max(0, int(round(p * (len(data) - 1)))))
+        return data[idx]
+
+
+class HedgeBudget:
+    """Token bucket that earns `ratio` hedge tokens per request, capped at `burst`."""
+
+    def __init__(self, ratio: float = 0.05, burst: float = 1.0) -> None:
+        self._ratio = ratio
+        self._burst = burst
+        # Start full so the first stalled call of a fresh process may hedge
+        self._tokens = burst
+        self._lock = threading.Lock()
+
+    def on_request(self) -> None:
+        with self._lock:
+            self._tokens = min(self._burst, self._tokens + self._ratio)
+
+    def try_acquire(self) -> bool:
+        with self._lock:
+            if self._tokens >= 1.0:
+                self._tokens -= 1.0
+                return True
+            return False
+
+
+_TRACKERS: Dict[Tuple[str, str], LatencyTracker] = {}
+_BUDGETS: Dict[Tuple[str, str], HedgeBudget] = {}
+_REGISTRY_LOCK = threading.Lock()
+
+
+def tracker_for(key: Tuple[str, str]) -> LatencyTracker:
+    with _REGISTRY_LOCK:
+        return _TRACKERS.setdefault(key, LatencyTracker())
+
+
+def budget_for(key: Tuple[str, str], ratio: float) -> HedgeBudget:
+    with _REGISTRY_LOCK:
+        return _BUDGETS.setdefault(key, HedgeBudget(ratio))
+
+
+def hedged_call(
+    primary: Callable[[], str],
+    backup: Callable[[], str],
+    delay_s: float,
+    budget: HedgeBudget,
+    is_valid: Callable[[str], bool],
+) -> str:
+    budget.on_request()
+    pool = ThreadPoolExecutor(max_workers=2)
+    try:
+        first = pool.submit(primary)
+        done, _ = wait([first], timeout=delay_s)
+        if done or not budget.try_acquire():
+            return first.result()
+
+        pending: Dict[Future, str] = {first: "primary", pool.submit(backup): "backup"}
+        fallback: Optional[str] = None
+        error: Optional[BaseException] = None
+        while pending:
+            done, _ = wait(list(pending), return_when=FIRST_COMPLETED)
+            for fut in done:
+                pending.pop(fut)
+                try:
+                    content = fut.result()
+                except Exception as e:
+                    error = error or e
+                    continue
+                if is_valid(content):
+                    return content
+                fallback = fallback if fallback is not None else content
+        if fallback is not None:
+            return fallback
+        assert error is not None
+        raise error
+    finally:
+        # The losing request cannot be interrupted mid-read; its result is discarded
+        pool.shutdown(wait=False, cancel_futures=True)
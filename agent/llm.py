@@ -2,14 +2,27 @@ from __future__ import annotations
 
 import json
 import os
+import threading
 import time
-from typing import Any, Dict, List, Optional
+from typing import Any, Callable, Dict, List, Optional, Tuple, TypeVar, Union
 
-import yaml
+from .fastload import load_yaml
+from .hedging import budget_for, hedged_call, tracker_for
+from .maxtokens import TokenBudget
+from .ratelimit import limiter_for, parse_duration
+
+
+FALLBACK_REASON = "LLM parsing fallback"
+
+T = TypeVar("T")
+# (content, finish_reason) of one completion choice
+Choice = Tuple[str, Optional[str]]
 
 
 class LLMConfig:
     def __init__(self, cfg: Dict[str, Any]) -> None:
+        # Keep the raw mapping so derived configs (ensemble members etc.) can inherit it
+        self.raw: Dict[str, Any] = dict(cfg)
         self.provider = cfg.get("provider", "openai")
         self.model = cfg.get("model", "gpt-4o-mini")
         # Prefer explicit key and base_url from model.yaml
@@ -24,63 +37,294 @@ class LLMConfig:
         self.retries = int(cfg.get("retries", 2))
         # backoff base seconds for 429 handling
         self.backoff_s = float(cfg.get("backoff_s", 0.8))
-        # Language selection: config default, but allow env override via IC_LANG
-        self.language = os.environ.get("IC_LANG", cfg.get("language", "auto"))
+        # Language selection: config default; see load_model_config / EvaluationContext
+        self.language = cfg.get("language", "auto")
+        # Optional multi-model ensemble: {strategy, quorum, models: [...]}
+        self.ensemble: Dict[str, Any] = cfg.get("ensemble") or {}
+        # Optional hedged requests: {enabled, percentile, budget, secondary: {...}}
+        self.hedge: Dict[str, Any] = cfg.get("hedge") or {}
+        # Optional shared rate limiter: {rpm, tpm, safety, state_path}
+        self.rate_limit: Dict[str, Any] = cfg.get("rate_limit") or {}
+        # Optional prioritized endpoint list routed by health (see agent/router.py)
+        self.endpoints: List[Any] = cfg.get("endpoints") or []
+        self.breaker: Dict[str, Any] = cfg.get("breaker") or {}
+        # Optional two-tier cascade: {fast: {...overrides}, min_conf, escalate_on}
+        self.cascade: Dict[str, Any] = cfg.get("cascade") or {}
+        # Optional per-rule decomposition: {enabled, group_size, max_workers, deny_conf}
+        self.decompose: Dict[str, Any] = cfg.get("decompose") or {}
+        # Optional provider batch jobs: {backend: openai|local, poll_s, max_poll_s}
+        self.batch: Dict[str, Any] = cfg.get("batch") or {}
+        # Optional overrides for report translation calls (default: cascade.fast)
+        self.translate: Dict[str, Any] = cfg.get("translate") or {}
+        # Optional self-consistency sampling: {n, temperature}; n choices in one request
+        self.self_consistency: Dict[str, Any] = cfg.get("self_consistency") or {}
+        # Optional long-idea compaction: {threshold_tokens, target_tokens, max_items, ...}
+        self.compact: Dict[str, Any] = cfg.get("compact") or {}
+        # Optional local evidence retrieval: {index, k, budget_ms, max_chars}
+        self.evidence: Dict[str, Any] = cfg.get("evidence") or {}
+        # Output-token budget learned per model and language (see agent/maxtokens.py)
+        self.output_budget: Dict[str, Any] = cfg.get("output_budget") or {}
+        # SDK-level retries; None keeps the openai package default
+        self.sdk_retries: Optional[int] = cfg.get("sdk_retries")
+
+    def derive(self, overrides: Dict[str, Any]) -> "LLMConfig":
+        """Return a copy of this config with `overrides` applied (nested modes dropped).
+
+        `endpoints` are kept unless the overrides pick another model or base URL,
+        so derived calls (sampling, translation, ...) still go through the router.
+        """
+        dropped = ["ensemble", "cascade"]
+        if "model" in overrides or "base_url" in overrides:
+            dropped.append("endpoints")
+        data = {k: v for k, v in self.raw.items() if k not in dropped}
+        data.update(overrides)
+        return LLMConfig(data)
 
 
-def load_model_config(path: str) -> LLMConfig:
-    with open(path, "r", encoding="utf-8") as f:
-        data = yaml.safe_load(f) or {}
+def load_model_config(path: Union[str, LLMConfig]) -> LLMConfig:
+    # Callers holding an EvaluationContext pass its resolved config straight through
+    if isinstance(path, LLMConfig):
+        return path
+    data = load_yaml(path) or {}
+    if os.environ.get("IC_LANG"):
+        # Process-wide default only; nothing writes IC_LANG at runtime any more
+        data["language"] = os.environ["IC_LANG"]
     return LLMConfig(data)
 
 
-class OpenAIClient:
-    def __init__(self, cfg: LLMConfig) -> None:
-        try:
-            from openai import OpenAI  # type: ignore
-        except Exception as e:
-            raise RuntimeError(
-                "openai package not installed. Add it to requirements and pip install."
-            ) from e
-
-        # Source credentials and base URL from model.yaml
-        api_key = cfg.api_key
-        if not api_key and cfg.api_key_env:
-            api_key = os.environ.get(cfg.api_key_env)
-        if not api_key:
-            raise RuntimeError(
-                "Missing API key. Set `api_key` in config/model.yaml (preferred), or define `api_key_env` and export it in your shell."
+def resolve_api_key(cfg: LLMConfig) -> str:
+    api_key = cfg.api_key
+    if not api_key and cfg.api_key_env:
+        api_key = os.environ.get(cfg.api_key_env)
+    if not api_key:
+        raise RuntimeError(
+            "Missing API key. Set `api_key` in config/model.yaml (preferred), or define `api_key_env` and export it in your shell."
+        )
+    return api_key
+
+
+def sdk_client(cfg: LLMConfig) -> Any:
+    """OpenAI SDK client for `cfg`'s credentials and base URL (also used for batch jobs)."""
+    try:
+        from openai import OpenAI  # type: ignore
+    except Exception as e:
+        raise RuntimeError(
+            "openai package not installed. Add it to requirements and pip install."
+        ) from e
+
+    # Source credentials and base URL from model.yaml
+    api_key = resolve_api_key(cfg)
+
+    # Build client with explicit Authorization header (for OpenRouter compatibility)
+    headers: Dict[str, str] = {}
+    if cfg.headers:
+        headers.update(cfg.headers)
+    headers.setdefault("Authorization", f"Bearer {api_key}")
+
+    kwargs: Dict[str, Any] = {
+        "api_key": api_key,
+        "default_headers": headers,
+        "timeout": cfg.timeout_s,
+    }
+    if cfg.base_url:
+        kwargs["base_url"] = cfg.base_url
+    if cfg.sdk_retries is not None:
+        kwargs["max_retries"] = cfg.sdk_retries
+    return OpenAI(**kwargs)
+
+
+class UsageMeter:
+    """Process-wide token usage as reported by the provider, across all clients."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self.prompt_tokens = 0
+        self.completion_tokens = 0
+
+    def add(self, usage: Any) -> None:
+        if usage is None:
+            return
+
+        def get(name: str) -> int:
+            value = (
+                usage.get(name) if isinstance(usage, dict) else getattr(usage, name, 0)
             )
+            return int(value or 0)
+
+        with self._lock:
+            self.prompt_tokens += get("prompt_tokens")
+            self.completion_tokens += get("completion_tokens")
+
+    def totals(self) -> Tuple[int, int]:
+        with self._lock:
+            return self.prompt_tokens, self.completion_tokens
+
+
+USAGE = UsageMeter()
 
-        # Build client with explicit Authorization header (for OpenRouter compatibility)
-        headers: Dict[str, str] = {}
-        if cfg.headers:
-            headers.update(cfg.headers)
-        headers.setdefault("Authorization", f"Bearer {api_key}")
 
-        kwargs: Dict[str, Any] = {"api_key": api_key, "default_headers": headers}
-        if cfg.base_url:
-            kwargs["base_url"] = cfg.base_url
-        self._client = OpenAI(**kwargs)
+class OpenAIClient:
+    def __init__(self, cfg: LLMConfig) -> None:
+        self._client = sdk_client(cfg)
+        api_key = resolve_api_key(cfg)
         self._cfg = cfg
+        self._key = (cfg.base_url or "", cfg.model)
+        self._backup: Optional[OpenAIClient] = None
+        self._budget = TokenBudget(
+            cfg.model, cfg.language, cfg.max_tokens, cfg.output_budget
+        )
+        self._limiter = (
+            limiter_for(cfg.rate_limit, f"{cfg.base_url}|{api_key[-8:]}")
+            if cfg.rate_limit
+            else None
+        )
+
+    def _create(self, system: str, user: str) -> str:
+        return self._choices(system, user, 1)[0]
+
+    def _choices(self, system: str, user: str, n: int) -> List[str]:
+        return self._fit_budget(lambda budget: self._request(system, user, n, budget))
+
+    def _fit_budget(
+        self, request: Callable[[int], Tuple[List[Choice], Optional[int]]]
+    ) -> List[str]:
+        """Call `request(max_tokens)`, growing the budget while output is cut off.
+
+        A `finish_reason == "length"` reply is truncated JSON that would only
+        become a fallback verdict. Incomplete samples among complete ones are
+        dropped instead.
+        """
+        budget = self._budget.suggest()
+        while True:
+            choices, used = request(budget)
+            complete = [text for text, reason in choices if reason != "length"]
+            if len(complete) == len(choices):
+                self._budget.record(used, len(choices))
+                return complete or ["{}"]
+            grown = self._budget.grow(budget)
+            if grown is None:
+                # At the ceiling: keep what finished, or let parsing fall back
+                return complete or [text for text, _ in choices]
+            if complete and len(choices) > 1:
+                return complete
+            budget = grown
+
+    def _request(
+        self, system: str, user: str, n: int, max_tokens: int
+    ) -> Tuple[List[Choice], Optional[int]]:
+        est = estimate_tokens(system + user) + max_tokens * n
+        if self._limiter is not None:
+            self._limiter.acquire(est)
+        start = time.monotonic()
+        raw = self._client.chat.completions.with_raw_response.create(
+            model=self._cfg.model,
+            temperature=self._cfg.temperature,
+            max_tokens=max_tokens,
+            messages=[
+                {"role": "system", "content": system},
+                {"role": "user", "content": user},
+            ],
+            response_format={"type": "json_object"},
+            # Via extra_body so single-choice requests stay byte-identical
+            extra_body={"n": n} if n > 1 else None,
+        )
+        tracker_for(self._key).record(time.monotonic() - start)
+        resp = raw.parse()
+        usage = getattr(resp, "usage", None)
+        USAGE.add(usage)
+        if self._limiter is not None:
+            self._limiter.observe(raw.headers)
+            self._limiter.settle(est, getattr(usage, "total_tokens", None))
+        choices = sorted(resp.choices, key=lambda c: c.index)
+        return (
+            [(c.message.content or "{}", c.finish_reason) for c in choices],
+            getattr(usage, "completion_tokens", None),
+        )
+
+    def _backup_client(self) -> OpenAIClient:
+        secondary = self._cfg.hedge.get("secondary")
+        if not secondary:
+            return self
+        if self._backup is None:
+            self._backup = OpenAIClient(self._cfg.derive({**secondary, "hedge": {}}))
+        return self._backup
+
+    def _call(self, system: str, user: str) -> str:
+        hedge = self._cfg.hedge
+        if not hedge.get("enabled"):
+            return self._create(system, user)
+        # Hedge after the tracked latency percentile (or a fixed delay until warmed up)
+        delay = tracker_for(self._key).percentile(float(hedge.get("percentile", 0.95)))
+        if delay is None:
+            delay = float(hedge.get("initial_delay_s", self._cfg.timeout_s / 3))
+        delay = max(float(hedge.get("min_delay_s", 1.0)), delay)
+        return hedged_call(
+            lambda: self._create(system, user),
+            lambda: self._backup_client()._create(system, user),
+            delay,
+            budget_for(self._key, float(hedge.get("budget", 0.05))),
+            _is_json_object,
+        )
+
+    def complete_json_stream(
+        self, system: str, user: str, on_text: Callable[[str], None]
+    ) -> str:
+        # Streaming variant (no hedging/retries) for callers that act on partial output
+        if self._limiter is not None:
+            self._limiter.acquire(estimate_tokens(system + user) + self._cfg.max_tokens)
+        stream = self._client.chat.completions.create(
+            model=self._cfg.model,
+            temperature=self._cfg.temperature,
+            max_tokens=max(self._cfg.max_tokens, self._budget.suggest()),
+            messages=[
+                {"role": "system", "content": system},
+                {"role": "user", "content": user},
+            ],
+            response_format={"type": "json_object"},
+            stream=True,
+        )
+        text = ""
+        for chunk in stream:
+            if not chunk.choices:
+                continue
+            delta = chunk.choices[0].delta.content or ""
+            if delta:
+                text += delta
+                on_text(text)
+        return text or "{}"
+
+    def complete_json_once(self, system: str, user: str) -> str:
+        """A single attempt (hedged if configured), for callers doing their own failover."""
+        return self._call(system, user)
+
+    def complete_json_n_once(self, system: str, user: str, n: int) -> List[str]:
+        """A single `complete_json_n` attempt, for callers doing their own failover."""
+        return self._choices(system, user, n)
 
     def complete_json(self, system: str, user: str) -> str:
+        return self._retrying(
+            lambda: self._call(system, user),
+            lambda: self._complete_json_httpx(system, user),
+            "{}",
+        )
+
+    def complete_json_n(self, system: str, user: str, n: int) -> List[str]:
+        """`n` sampled completions from one request (no hedging: it would double n)."""
+        return self._retrying(
+            lambda: self._choices(system, user, n),
+            lambda: self._httpx_choices(system, user, n),
+            [],
+        )
+
+    def _retrying(
+        self, call: Callable[[], T], last_resort: Callable[[], T], default: T
+    ) -> T:
         # Use JSON response format when available
         import random
 
         for attempt in range(self._cfg.retries + 1):
             try:
-                resp = self._client.chat.completions.create(
-                    model=self._cfg.model,
-                    temperature=self._cfg.temperature,
-                    max_tokens=self._cfg.max_tokens,
-                    messages=[
-                        {"role": "system", "content": system},
-                        {"role": "user", "content": user},
-                    ],
-                    response_format={"type": "json_object"},
-                )
-                return resp.choices[0].message.content or "{}"
+                return call()
             except Exception as e:
                 status = getattr(e, "status_code", None)
                 text = str(e)
@@ -103,6 +347,16 @@ class OpenAIClient:
                         "403 Forbidden: key lacks access or headers missing. For OpenRouter, set HTTP-Referer and X-Title in config headers."
                     ) from e
                 if status == 429:
+                    headers = getattr(getattr(e, "response", None), "headers", None)
+                    retry_after = parse_duration((headers or {}).get("retry-after"))
+                    if self._limiter is not None:
+                        # The shared limiter blocks every worker until the window reopens
+                        self._limiter.observe(headers)
+                        if retry_after is not None:
+                            continue
+                    if retry_after is not None:
+                        time.sleep(retry_after)
+                        continue
                     # Exponential backoff + jitter
                     backoff = (self._cfg.backoff_s * (2**attempt)) * (
                         1.0 + random.random() * 0.25
@@ -113,13 +367,23 @@ class OpenAIClient:
                 # Other errors: last attempt uses HTTPX for more diagnostics
                 if attempt == self._cfg.retries:
                     try:
-                        return self._complete_json_httpx(system, user)
+                        return last_resort()
                     except Exception:
                         raise
                 time.sleep(self._cfg.backoff_s * (attempt + 1))
-        return "{}"
+        return default
 
     def _complete_json_httpx(self, system: str, user: str) -> str:
+        return self._httpx_choices(system, user, 1)[0]
+
+    def _httpx_choices(self, system: str, user: str, n: int) -> List[str]:
+        return self._fit_budget(
+            lambda budget: self._httpx_request(system, user, n, budget)
+        )
+
+    def _httpx_request(
+        self, system: str, user: str, n: int, max_tokens: int
+    ) -> Tuple[List[Choice], Optional[int]]:
         import httpx
 
         url = (self._cfg.base_url or "https://api.openai.com/v1").rstrip(
@@ -130,30 +394,63 @@ class OpenAIClient:
             "Content-Type": "application/json",
         }
         headers.update(getattr(self._cfg, "headers", {}) or {})
-        payload = {
+        payload: Dict[str, Any] = {
             "model": self._cfg.model,
             "temperature": self._cfg.temperature,
-            "max_tokens": self._cfg.max_tokens,
+            "max_tokens": max_tokens,
             "messages": [
                 {"role": "system", "content": system},
                 {"role": "user", "content": user},
             ],
             "response_format": {"type": "json_object"},
         }
+        if n > 1:
+            payload["n"] = n
         with httpx.Client(timeout=self._cfg.timeout_s) as client:
             r = client.post(url, headers=headers, json=payload)
             if r.status_code >= 400:
                 # Surface server error for easier debugging
                 raise RuntimeError(f"LLM HTTP {r.status_code}: {r.text}")
             data = r.json()
-            content = data["choices"][0]["message"]["content"]
-            return content or "{}"
+            USAGE.add(data.get("usage"))
+            choices = sorted(data["choices"], key=lambda c: c.get("index", 0))
+            used = (data.get("usage") or {}).get("completion_tokens")
+            return (
+                [
+                    (c["message"]["content"] or "{}", c.get("finish_reason"))
+                    for c in choices
+                ],
+                used,
+            )
+
+
+_CLIENTS: Dict[str, Any] = {}
+_CLIENTS_LOCK = threading.Lock()
+
+# provider name -> client factory; clients expose complete_json(system, user)
+PROVIDERS: Dict[str, Callable[[LLMConfig], Any]] = {"openai": OpenAIClient}
+
+
+def register_provider(name: str, factory: Callable[[LLMConfig], Any]) -> None:
+    PROVIDERS[name] = factory
 
 
 def get_client(cfg: LLMConfig):
-    if cfg.provider == "openai":
-        return OpenAIClient(cfg)
-    raise NotImplementedError(f"Unsupported provider: {cfg.provider}")
+    # Reuse clients (and their HTTP connection pools) for identical configs
+    key = json.dumps(cfg.raw, sort_keys=True, default=str)
+    with _CLIENTS_LOCK:
+        if key in _CLIENTS:
+            return _CLIENTS[key]
+    if cfg.endpoints:
+        from .router import RoutedClient
+
+        client: Any = RoutedClient(cfg)
+    elif cfg.provider in PROVIDERS:
+        client = PROVIDERS[cfg.provider](cfg)
+    else:
+        raise NotImplementedError(f"Unsupported provider: {cfg.provider}")
+    with _CLIENTS_LOCK:
+        return _CLIENTS.setdefault(key, client)
 
 
 def build_rubric(rules: List[Dict[str, Any]]) -> str:
@@ -171,6 +468,59 @@ def build_rubric(rules: List[Dict[str, Any]]) -> str:
     return "\n".join(lines)
 
 
+def estimate_tokens(text: str) -> int:
+    # Rough heuristic: CJK characters ~1 token each, other text ~4 chars per token
+    cjk = sum(1 for ch in text if "\u3400" <= ch <= "\u9fff")
+    return cjk + (len(text) - cjk) // 4 + 1
+
+
+def _is_json_object(text: str) -> bool:
+    try:
+        return isinstance(json.loads(strip_code_fences(text)), dict)
+    except Exception:
+        return False
+
+
+def closed_object(text: str, key: str) -> Optional[Dict[str, Any]]:
+    """Return the JSON object under `key` once it is complete in a partial stream."""
+    pos = text.find(f'"{key}"')
+    start = text.find("{", pos) if pos >= 0 else -1
+    if start < 0:
+        return None
+    depth = 0
+    in_str = escaped = False
+    for i in range(start, len(text)):
+        ch = text[i]
+        if in_str:
+            if escaped:
+                escaped = False
+            elif ch == "\\":
+                escaped = True
+            elif ch == '"':
+                in_str = False
+        elif ch == '"':
+            in_str = True
+        elif ch == "{":
+            depth += 1
+        elif ch == "}":
+            depth -= 1
+            if depth == 0:
+                try:
+                    obj = json.loads(text[start : i + 1])
+                except ValueError:
+                    return None
+                return obj if isinstance(obj, dict) else None
+    return None
+
+
+def _parse_object(raw: str) -> Optional[Dict[str, Any]]:
+    try:
+        data = json.loads(strip_code_fences(raw))
+    except Exception:
+        return None
+    return data if isinstance(data, dict) else None
+
+
 def strip_code_fences(text: str) -> str:
     t = text.strip()
     if t.startswith("```"):
@@ -180,15 +530,14 @@ def strip_code_fences(text: str) -> str:
     return t.strip()
 
 
-def llm_verdict_json(
+def verdict_prompt(
     idea: Dict[str, Any],
     rules: List[Dict[str, Any]],
     cfg: LLMConfig,
     allowed_redline_ids: Optional[List[str]] = None,
     correction_note: Optional[str] = None,
-) -> Dict[str, Any]:
-    client = get_client(cfg)
-
+) -> Tuple[str, str]:
+    """(system, user) messages for judging `idea`; shared by sync and batch-job calls."""
     system = (
         "You are a rigorous startup idea evaluator. Use the provided redline rules as the primary logic. "
         "Return ONLY a strict JSON object (no code fences, no commentary). Keys: decision (deny|caution|go), conf_level (0-1), "
@@ -207,9 +556,15 @@ def llm_verdict_json(
         else ""
     )
     correction_line = (correction_note + "\n") if correction_note else ""
+    evidence_line = (
+        "Idea.evidence holds excerpts from local market notes and regulations; "
+        "cite their ids (e.g. [E1]) in reasons you base on them.\n"
+        if idea.get("evidence")
+        else ""
+    )
     user = (
         f"Language: {language_hint}. {lang_directive}\n"
-        f"{correction_line}Evaluate this Idea against Redlines. Be conservative.\n\n"
+        f"{correction_line}{evidence_line}Evaluate this Idea against Redlines. Be conservative.\n\n"
         f"Idea:\n{json.dumps(idea, ensure_ascii=False, indent=2)}\n\n"
         f"Redlines:\n{rubric}\n\n"
         f"{allow_line}"
@@ -217,20 +572,176 @@ def llm_verdict_json(
         '{\n  "decision": "deny|caution|go",\n  "conf_level": 0.0,\n  "reasons": ["..."],\n  "redlines": ["RL-001"],\n  "next_steps": ["..."],\n  "reasons_map": [{"rule_id": "RL-001", "reason": "..."}]\n}'
         "\nRules: redlines MUST only contain IDs from Allowed list when provided; keep conf_level in [0,1] rounded to 2 decimals."
     )
+    return system, user
 
-    raw = client.complete_json(system, user)
-    raw = strip_code_fences(raw)
-    try:
-        data = json.loads(raw)
-        if not isinstance(data, dict):
-            raise ValueError("Non-object JSON from LLM")
-        return data
-    except Exception as e:
+
+def parse_verdict_json(raw: str) -> Dict[str, Any]:
+    data = _parse_object(raw)
+    if data is None:
         # Fallback minimal object
         return {
             "decision": "caution",
             "conf_level": 0.5,
-            "reasons": ["LLM parsing fallback"],
+            "reasons": [FALLBACK_REASON],
             "redlines": [],
             "next_steps": [],
         }
+    return data
+
+
+def llm_verdict_json(
+    idea: Dict[str, Any],
+    rules: List[Dict[str, Any]],
+    cfg: LLMConfig,
+    allowed_redline_ids: Optional[List[str]] = None,
+    correction_note: Optional[str] = None,
+) -> Dict[str, Any]:
+    client = get_client(cfg)
+    system, user = verdict_prompt(
+        idea, rules, cfg, allowed_redline_ids, correction_note
+    )
+    return parse_verdict_json(client.complete_json(system, user))
+
+
+EXPAND_SCHEMA = (
+    '{\n  "intent": "...",\n  "user": "...",\n  "scenario": "...",\n  "triggers": "...",\n'
+    '  "alts": "...",\n  "assumptions": ["..."],\n  "risks": ["..."]\n}'
+)
+
+
+def _language_line(cfg: LLMConfig) -> str:
+    language_hint = (cfg.language or "auto").strip()
+    lang_directive = (
+        f"Respond strictly in {language_hint}."
+        if language_hint and language_hint.lower() != "auto"
+        else ""
+    )
+    return f"Language: {language_hint}. {lang_directive}\n"
+
+
+def llm_expand_json(desc: str, cfg: LLMConfig) -> Optional[Dict[str, Any]]:
+    client = get_client(cfg)
+    system = (
+        "You are a startup product strategist. Expand a terse idea description into a normalized idea object. "
+        "Return ONLY a strict JSON object with these keys: intent, user, scenario, triggers, alts, assumptions (array), risks (array)."
+    )
+    user = (
+        _language_line(cfg)
+        + "Given a short idea description, expand into a concrete, concise plan suitable for evaluation.\n\n"
+        f"Short Idea: {desc}\n\n"
+        "Output JSON (single object, no extra text):\n" + EXPAND_SCHEMA
+    )
+    return _parse_object(client.complete_json(system, user))
+
+
+def llm_confirm_verdict(
+    idea: Dict[str, Any], verdict: Dict[str, Any], cfg: LLMConfig
+) -> bool:
+    """Ask whether a near-duplicate's verdict carries over; short yes/no output."""
+    client = get_client(cfg)
+    system = (
+        "You check whether an existing evaluation verdict applies unchanged to a similar idea. "
+        'Return ONLY a strict JSON object: {"applies": true|false}.'
+    )
+    summary = {k: verdict.get(k) for k in ("decision", "redlines", "reasons")}
+    user = (
+        f"Verdict of a near-duplicate idea:\n{json.dumps(summary, ensure_ascii=False, indent=2)}\n\n"
+        f"Idea:\n{json.dumps(idea, ensure_ascii=False, indent=2)}\n\n"
+        "Answer false if any difference could change the decision or the redlines."
+    )
+    data = _parse_object(client.complete_json(system, user))
+    return bool(data and data.get("applies") is True)
+
+
+def llm_translate_json(
+    strings: List[str], target: str, cfg: LLMConfig
+) -> Optional[List[str]]:
+    """Translate `strings` into `target` in one call; None unless one result per input."""
+    client = get_client(cfg)
+    system = (
+        "You translate short notes from an idea evaluation report. "
+        'Return ONLY a strict JSON object: {"translations": ["...", ...]} with exactly one '
+        "translation per input string, in the same order. Keep rule IDs (e.g. RL-001), numbers, "
+        "product names and code unchanged; return strings already in the target language as is."
+    )
+    user = (
+        f"Target language: {target}\n\n"
+        f"Strings:\n{json.dumps(strings, ensure_ascii=False, indent=2)}"
+    )
+    data = _parse_object(client.complete_json(system, user))
+    out = (data or {}).get("translations")
+    if not isinstance(out, list) or len(out) != len(strings):
+        return None
+    return [str(t) for t in out]
+
+
+def llm_compact_idea_json(
+    idea: Dict[str, Any], target_tokens: int, cfg: LLMConfig
+) -> Optional[Dict[str, Any]]:
+    """Summarize a long idea into the same fields within roughly `target_tokens`."""
+    client = get_client(cfg)
+    system = (
+        "You condense startup idea descriptions for an evaluator. Keep every distinct claim that "
+        "could change a judgement (numbers, constraints, users, risks); drop repetition and filler. "
+        "Return ONLY a strict JSON object with the keys: intent, user, scenario, triggers, alts, "
+        "assumptions (array), risks (array)."
+    )
+    user = (
+        f"Condense this idea to at most about {target_tokens} tokens in total, "
+        "keeping its original language.\n\n"
+        f"Idea:\n{json.dumps(idea, ensure_ascii=False, indent=2)}"
+    )
+    return _parse_object(client.complete_json(system, user))
+
+
+def llm_expand_verdict_json(
+    desc: str,
+    rules: List[Dict[str, Any]],
+    cfg: LLMConfig,
+    allowed_redline_ids: Optional[List[str]] = None,
+    on_idea: Optional[Callable[[Dict[str, Any]], None]] = None,
+) -> Optional[Dict[str, Any]]:
+    """One call returning {"idea": {...}, "verdict": {...}}; None if unparseable.
+
+    With `on_idea` and a streaming-capable client, the expanded idea is handed
+    over as soon as it is complete, while the verdict is still being generated.
+    """
+    client = get_client(cfg)
+    system = (
+        "You are a startup product strategist and a rigorous idea evaluator. First expand a terse idea "
+        "into a normalized idea object, then evaluate that idea against the provided redline rules. "
+        "Return ONLY a strict JSON object with two keys, in this order: idea and verdict."
+    )
+    allowed = allowed_redline_ids or []
+    allow_line = (
+        ("Allowed redline IDs (must be a subset): " + ", ".join(allowed) + "\n")
+        if allowed
+        else ""
+    )
+    user = (
+        _language_line(cfg) + f"Short Idea: {desc}\n\n"
+        f"Redlines:\n{build_rubric(rules)}\n\n"
+        f"{allow_line}"
+        "Output JSON (single object, no extra text):\n"
+        '{\n  "idea": ' + EXPAND_SCHEMA + ",\n"
+        '  "verdict": {"decision": "deny|caution|go", "conf_level": 0.0, "reasons": ["..."], '
+        '"redlines": ["RL-001"], "next_steps": ["..."], "reasons_map": [{"rule_id": "RL-001", "reason": "..."}]}\n}'
+        "\nRules: be conservative; redlines MUST only contain IDs from Allowed list when provided; "
+        "keep conf_level in [0,1] rounded to 2 decimals."
+    )
+
+    stream = getattr(client, "complete_json_stream", None)
+    if on_idea is None or stream is None:
+        return _parse_object(client.complete_json(system, user))
+
+    sent = False
+
+    def on_text(text: str) -> None:
+        nonlocal sent
+        if not sent:
+            idea = closed_object(text, "idea")
+            if idea is not None:
+                sent = True
+                on_idea(idea)
+
+    return _parse_object(stream(system, user, on_text))
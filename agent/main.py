@@ -3,14 +3,17 @@ from __future__ import annotations
 import argparse
 import json
 import os
+import sys
 from pathlib import Path
-from typing import Any
+from typing import TYPE_CHECKING, Any, List, Optional
 
-import yaml
+from .fastload import load_yaml
 
-from .schemas import Idea
-from .engine import load_rules, arbitrate_llm
+if TYPE_CHECKING:
+    from .context import EvaluationContext
 
+# Heavy modules (PyYAML, Pydantic, the LLM stack) are imported inside the
+# commands that need them so `report` and `intake` start fast.
 
 ROOT = Path(__file__).resolve().parents[1]
 CONFIG_DIR = ROOT / "config"
@@ -31,11 +34,30 @@ def slugify(text: str) -> str:
     return "-".join([t for t in text.lower().strip().split()[:6]]) or "idea"
 
 
-def cmd_intake(args: argparse.Namespace) -> None:
-    ensure_dirs()
+def resolve_model_cfg(model_cfg: Optional[str] = None) -> Path:
+    # Explicit path first, then the local override, then the default
+    if model_cfg:
+        return Path(model_cfg)
+    return MODEL_LOCAL_CFG_PATH if MODEL_LOCAL_CFG_PATH.exists() else MODEL_CFG_PATH
+
+
+def select_template(lang: str, templates_dir: Path = TEMPLATES_DIR) -> Path:
+    lang = (lang or "").lower()
+    if lang.startswith("en") and (templates_dir / "report.en.md").exists():
+        return templates_dir / "report.en.md"
+    if (lang.startswith("zh") or not lang) and (
+        templates_dir / "report.zh-CN.md"
+    ).exists():
+        return templates_dir / "report.zh-CN.md"
+    return templates_dir / "report.md"
+
+
+def run_intake(args: argparse.Namespace) -> Path:
+    from .pipeline import Pipeline
+    from .schemas import Idea
+
     if args.input and os.path.exists(args.input):
-        with open(args.input, "r", encoding="utf-8") as f:
-            data = yaml.safe_load(f) or {}
+        data = load_yaml(args.input) or {}
         idea = Idea(**data)
         slug = args.out or slugify(idea.intent)
     else:
@@ -50,55 +72,35 @@ def cmd_intake(args: argparse.Namespace) -> None:
             assumptions=args.assumptions or [desc],
             risks=args.risks or [],
         )
+    return Pipeline().intake(idea, slug=slug).path
 
-    out_path = IDEAS_DIR / (slug if slug.endswith(".yaml") else f"{slug}.yaml")
-    with open(out_path, "w", encoding="utf-8") as f:
-        yaml.safe_dump(
-            json.loads(json.dumps(idea, default=lambda o: o.__dict__)),
-            f,
-            allow_unicode=True,
-            sort_keys=False,
-        )
-    print(str(out_path))
 
+def cmd_intake(args: argparse.Namespace) -> None:
+    print(str(run_intake(args)))
 
-def cmd_evaluate(args: argparse.Namespace) -> None:
-    ensure_dirs()
-    # Optional language override
-    if getattr(args, "lang", None):
-        os.environ["IC_LANG"] = args.lang
-    with open(args.idea, "r", encoding="utf-8") as f:
-        idea = Idea(**(yaml.safe_load(f) or {}))
-
-    rules = load_rules(str(RULES_DIR))
-    # Resolve model config: prefer local override, then default
-    chosen_cfg = None
-    if getattr(args, "model_cfg", None):
-        chosen_cfg = Path(args.model_cfg)
-    else:
-        chosen_cfg = (
-            MODEL_LOCAL_CFG_PATH if MODEL_LOCAL_CFG_PATH.exists() else MODEL_CFG_PATH
-        )
-    model_cfg = str(Path(chosen_cfg))
-    verdict = arbitrate_llm(idea, rules, model_cfg, mode="llm-only")
 
-    slug = slugify(Path(args.idea).stem)
-    out_json = REPORTS_DIR / f"{slug}.verdict.json"
-    with open(out_json, "w", encoding="utf-8") as f:
-        # Support Pydantic v2 and fallback
-        if hasattr(verdict, "model_dump_json"):
-            payload = json.loads(verdict.model_dump_json())
-        else:
-            payload = verdict.__dict__
-        json.dump(payload, f, indent=2, ensure_ascii=False)
-    print(str(out_json))
+def run_evaluate(
+    args: argparse.Namespace, ctx: Optional["EvaluationContext"] = None
+) -> Path:
+    # `ctx` lets long-lived callers (the daemon) pass per-request settings and warm rules
+    from .pipeline import Pipeline
+
+    pipeline = Pipeline(
+        model_cfg=getattr(args, "model_cfg", None),
+        lang=getattr(args, "lang", None),
+        ctx=ctx,
+    )
+    return pipeline.evaluate(args.idea).path
+
+
+def cmd_evaluate(args: argparse.Namespace) -> None:
+    print(str(run_evaluate(args)))
 
 
 def render_report(
     idea_path: Path, verdict_path: Path, template_path: Path, out_path: Path
 ) -> None:
-    with open(idea_path, "r", encoding="utf-8") as f:
-        idea_data = yaml.safe_load(f) or {}
+    idea_data = load_yaml(idea_path) or {}
     with open(verdict_path, "r", encoding="utf-8") as f:
         verdict = json.load(f)
     with open(template_path, "r", encoding="utf-8") as f:
@@ -120,6 +122,12 @@ def render_report(
         "reasons": bullets(verdict.get("reasons", []) or []),
         "redlines": bullets(verdict.get("redlines", []) or []),
         "next_steps": bullets(verdict.get("next_steps", []) or []),
+        "evidence": bullets(
+            [
+                f"[E{i}] {' '.join(e.get('excerpts') or [])} ({e.get('provenance', '')})"
+                for i, e in enumerate(verdict.get("evidence") or [], start=1)
+            ]
+        ),
     }
 
     content = tmpl.format(**ctx)
@@ -127,31 +135,74 @@ def render_report(
         f.write(content)
 
 
+def run_report(
+    args: argparse.Namespace, ctx: Optional["EvaluationContext"] = None
+) -> Path:
+    from .pipeline import Pipeline
+
+    pipeline = Pipeline(lang=getattr(args, "lang", None), ctx=ctx)
+    return pipeline.report(args.idea).path
+
+
+def run_report_languages(
+    args: argparse.Namespace, ctx: Optional["EvaluationContext"] = None
+) -> list:
+    from .pipeline import Pipeline
+
+    pipeline = Pipeline(model_cfg=getattr(args, "model_cfg", None), ctx=ctx)
+    langs = [lang.strip() for lang in args.langs.split(",") if lang.strip()]
+    return [r.path for r in pipeline.report_languages(args.idea, langs)]
+
+
 def cmd_report(args: argparse.Namespace) -> None:
-    ensure_dirs()
-    # Optional language override
-    if getattr(args, "lang", None):
-        os.environ["IC_LANG"] = args.lang
-    idea_path = Path(args.idea)
-    slug = slugify(idea_path.stem)
-    verdict_path = REPORTS_DIR / f"{slug}.verdict.json"
-    # Template selection by language
-    lang = os.environ.get("IC_LANG", "").lower()
-    if lang.startswith("en") and (TEMPLATES_DIR / "report.en.md").exists():
-        template_path = TEMPLATES_DIR / "report.en.md"
-    elif (lang.startswith("zh") or not lang) and (
-        TEMPLATES_DIR / "report.zh-CN.md"
-    ).exists():
-        template_path = TEMPLATES_DIR / "report.zh-CN.md"
-    else:
-        template_path = TEMPLATES_DIR / "report.md"
-    out_path = REPORTS_DIR / f"{slug}.md"
-    render_report(idea_path, verdict_path, template_path, out_path)
-    print(str(out_path))
+    if getattr(args, "langs", None):
+        for path in run_report_languages(args):
+            print(str(path))
+        return
+    print(str(run_report(args)))
 
     # no benchmark functionality in minimal build
 
 
+def cmd_watch(args: argparse.Namespace) -> None:
+    from .context import EvaluationContext
+    from .watch import IncrementalEvaluator
+
+    ctx = EvaluationContext.create(args.model_cfg, args.lang)
+    langs = [lang.strip() for lang in (args.langs or "").split(",") if lang.strip()]
+    IncrementalEvaluator(ctx, languages=langs).run(
+        poll=args.poll, interval_s=args.interval, debounce_s=args.debounce
+    )
+
+
+def cmd_serve(args: argparse.Namespace) -> None:
+    from .daemon import serve
+
+    serve(args.socket)
+
+
+def cmd_evidence_ingest(args: argparse.Namespace) -> None:
+    from .evidence import EvidenceIndex, iter_passages
+
+    index = EvidenceIndex(args.index)
+    errors: List[str] = []
+    passages = iter_passages(args.paths, args.type, args.max_chars, errors)
+    added = index.add(passages, segment_docs=args.segment_docs)
+    for line in errors[:20]:
+        print(f"Skipped {line}", file=sys.stderr)
+    if len(errors) > 20:
+        print(f"... {len(errors) - 20} more skipped lines", file=sys.stderr)
+    print(f"Indexed {added} passages ({index.docs} total) in {index.root}")
+
+
+def cmd_evidence_search(args: argparse.Namespace) -> None:
+    from .evidence import EvidenceIndex
+
+    index = EvidenceIndex(args.index)
+    for score, p in index.search(args.query, k=args.k, budget_ms=args.budget_ms):
+        print(f"{score:.3f}\t{p.get('provenance', '')}\t{p.get('text', '')[:120]}")
+
+
 def build_parser() -> argparse.ArgumentParser:
     p = argparse.ArgumentParser(
         prog="idea-crucible", description="Redline-first idea evaluation CLI"
@@ -187,8 +238,64 @@ def build_parser() -> argparse.ArgumentParser:
     s.add_argument(
         "--lang", type=str, help="Override report language, e.g. en or zh-CN"
     )
+    s.add_argument(
+        "--langs",
+        type=str,
+        help="Comma-separated languages, e.g. zh-CN,en: one report each from the "
+        "existing verdict, translating only reasons/next steps",
+    )
+    s.add_argument("--model-cfg", type=str, help=argparse.SUPPRESS)
     s.set_defaults(func=cmd_report)
 
+    # watch
+    s = sub.add_parser(
+        "watch",
+        help="Re-evaluate and re-render ideas as idea or rule YAMLs are saved",
+    )
+    s.add_argument("--model-cfg", type=str, help=argparse.SUPPRESS)
+    s.add_argument("--lang", type=str, help="Evaluation language, e.g. en or zh-CN")
+    s.add_argument(
+        "--langs", type=str, help="Also render these report languages, e.g. zh-CN,en"
+    )
+    s.add_argument("--poll", action="store_true", help="Poll instead of using inotify")
+    s.add_argument("--interval", type=float, default=1.0, help="Poll interval (s)")
+    s.add_argument(
+        "--debounce",
+        type=float,
+        default=0.5,
+        help="Wait until saves have been quiet this long (s)",
+    )
+    s.set_defaults(func=cmd_watch)
+
+    # serve
+    s = sub.add_parser(
+        "serve", help="Run a warm evaluation daemon the short commands forward to"
+    )
+    s.add_argument("--socket", type=str, help="Unix socket path (default: .cache/)")
+    s.set_defaults(func=cmd_serve)
+
+    # evidence
+    s = sub.add_parser("evidence", help="Build or query the local evidence index")
+    ev = s.add_subparsers(dest="evidence_command", required=True)
+    s = ev.add_parser("ingest", help="Index .md/.txt/.jsonl files or directories")
+    s.add_argument("paths", nargs="+", help="Files or directories to ingest")
+    s.add_argument("--index", type=str, help="Index directory (default: .cache/)")
+    s.add_argument(
+        "--type",
+        choices=["primary", "secondary", "tertiary"],
+        default="secondary",
+        help="Evidence type for passages that do not set one",
+    )
+    s.add_argument("--segment-docs", type=int, default=200_000)
+    s.add_argument("--max-chars", type=int, default=600, help="Passage size")
+    s.set_defaults(func=cmd_evidence_ingest)
+    s = ev.add_parser("search", help="Show the top BM25 passages for a query")
+    s.add_argument("query", type=str)
+    s.add_argument("-k", type=int, default=5)
+    s.add_argument("--index", type=str, help="Index directory (default: .cache/)")
+    s.add_argument("--budget-ms", type=float, help="Stop scoring after this long")
+    s.set_defaults(func=cmd_evidence_search)
+
     # no benchmark subcommand in minimal build
 
     return p
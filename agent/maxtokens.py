@@ -0,0 +1,108 @@
+from __future__ import annotations
+
+import json
+import os
+import threading
+from collections import deque
+from pathlib import Path
+from typing import Any, Deque, Dict, Optional, Union
+
+from .fastload import CACHE_DIR
+
+DEFAULT_STATE = CACHE_DIR / "output_tokens.json"
+
+
+class OutputLengths:
+    """Completion lengths (tokens per choice) seen per "model|language", on disk.
+
+    `max_tokens` is then set from a high percentile of what that model actually
+    writes in that language, instead of one fixed number for everything.
+    """
+
+    def __init__(self, path: Union[str, Path], window: int = 200) -> None:
+        self.path = Path(path)
+        self.window = window
+        self._lock = threading.Lock()
+        self._samples: Optional[Dict[str, Deque[int]]] = None
+
+    def _load(self) -> Dict[str, Deque[int]]:
+        if self._samples is None:
+            try:
+                raw = json.loads(self.path.read_text(encoding="utf-8"))
+            except (OSError, ValueError):
+                raw = {}
+            self._samples = {
+                k: deque((int(x) for x in v), maxlen=self.window)
+                for k, v in raw.items()
+                if isinstance(v, list)
+            }
+        return self._samples
+
+    def record(self, key: str, tokens: int) -> None:
+        with self._lock:
+            samples = self._load()
+            samples.setdefault(key, deque(maxlen=self.window)).append(int(tokens))
+            data = {k: list(v) for k, v in samples.items()}
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            tmp = self.path.with_name(f"{self.path.name}.{os.getpid()}.tmp")
+            tmp.write_text(json.dumps(data), encoding="utf-8")
+            os.replace(tmp, self.path)
+        except OSError:
+            pass  # learning is best effort; the in-memory window still works
+
+    def count(self, key: str) -> int:
+        with self._lock:
+            return len(self._load().get(key) or ())
+
+    def percentile(self, key: str, p: float) -> Optional[int]:
+        with self._lock:
+            data = sorted(self._load().get(key) or ())
+        if not data:
+            return None
+        return data[min(len(data) - 1, max(0, int(round(p * (len(data) - 1)))))]
+
+
+_STORES: Dict[str, OutputLengths] = {}
+_STORES_LOCK = threading.Lock()
+
+
+def lengths_for(path: Union[str, Path, None] = None) -> OutputLengths:
+    key = str(path or DEFAULT_STATE)
+    with _STORES_LOCK:
+        return _STORES.setdefault(key, OutputLengths(key))
+
+
+class TokenBudget:
+    """max_tokens for one (model, language), learned from history within bounds.
+
+    Config (`output_budget:`): adaptive, percentile, headroom, min_samples,
+    min_tokens, max_tokens (also the ceiling for truncation retries), state_path.
+    """
+
+    def __init__(self, model: str, language: str, default: int, cfg: Dict[str, Any]):
+        self.key = f"{model}|{language or 'auto'}"
+        self.default = default
+        self.adaptive = bool(cfg.get("adaptive", True))
+        self.percentile = float(cfg.get("percentile", 0.98))
+        self.headroom = float(cfg.get("headroom", 1.25))
+        self.min_samples = int(cfg.get("min_samples", 20))
+        self.floor = int(cfg.get("min_tokens", 256))
+        self.cap = max(default, int(cfg.get("max_tokens", 4 * default)))
+        self.lengths = lengths_for(cfg.get("state_path"))
+
+    def suggest(self) -> int:
+        if not self.adaptive or self.lengths.count(self.key) < self.min_samples:
+            return self.default
+        p = self.lengths.percentile(self.key, self.percentile) or self.default
+        return max(self.floor, min(self.cap, int(p * self.headroom)))
+
+    def grow(self, budget: int) -> Optional[int]:
+        """Next budget after a `finish_reason == "length"` cut; None at the cap."""
+        if budget >= self.cap:
+            return None
+        return min(self.cap, max(budget * 2, self.default))
+
+    def record(self, completion_tokens: Optional[int], choices: int) -> None:
+        if self.adaptive and completion_tokens and choices:
+            self.lengths.record(self.key, -(-completion_tokens // choices))
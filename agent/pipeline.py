@@ -0,0 +1,220 @@
+from __future__ import annotations
+
+import json
+from dataclasses import dataclass
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Union
+
+from . import main as am
+from .context import EvaluationContext
+
+if TYPE_CHECKING:
+    from .schemas import Idea, Rule, Verdict
+
+
+@dataclass
+class IntakeResult:
+    path: Path
+    idea: "Idea"
+
+
+@dataclass
+class EvaluateResult:
+    idea_path: Path
+    verdict: "Verdict"
+    path: Path
+
+
+@dataclass
+class ReportResult:
+    idea_path: Path
+    verdict_path: Path
+    path: Path
+
+
+@dataclass
+class ExpandResult:
+    intake: IntakeResult
+    evaluate: EvaluateResult
+    # "combined" (single LLM round trip) or "two-call" (validation fallback)
+    mode: str
+
+
+@dataclass
+class PipelineResult:
+    intake: IntakeResult
+    evaluate: Optional[EvaluateResult]
+    report: Optional[ReportResult]
+
+
+class Pipeline:
+    """In-process intake -> evaluate -> report, loading rules and config once.
+
+    Used by the CLI commands and the wizard scripts instead of chaining
+    `python -m agent.main` subprocesses.
+    """
+
+    def __init__(
+        self,
+        model_cfg: Optional[Union[str, Path]] = None,
+        lang: Optional[str] = None,
+        rules: Optional[List["Rule"]] = None,
+        rules_dir: Path = am.RULES_DIR,
+        ideas_dir: Path = am.IDEAS_DIR,
+        reports_dir: Path = am.REPORTS_DIR,
+        templates_dir: Path = am.TEMPLATES_DIR,
+        ctx: Optional[EvaluationContext] = None,
+    ) -> None:
+        self.ctx = ctx or EvaluationContext.create(
+            model_cfg,
+            lang,
+            rules=rules,
+            rules_dir=rules_dir,
+            ideas_dir=ideas_dir,
+            reports_dir=reports_dir,
+            templates_dir=templates_dir,
+        )
+
+    @property
+    def rules(self) -> List["Rule"]:
+        return self.ctx.get_rules()
+
+    def verdict_path(self, idea_path: Union[str, Path]) -> Path:
+        return self.ctx.reports_dir / f"{am.slugify(Path(idea_path).stem)}.verdict.json"
+
+    def intake(
+        self, idea: Union["Idea", Dict[str, Any]], slug: Optional[str] = None
+    ) -> IntakeResult:
+        import yaml
+
+        from .schemas import Idea
+
+        if not isinstance(idea, Idea):
+            idea = Idea(**idea)
+        slug = slug or am.slugify(idea.intent)
+        self.ctx.ideas_dir.mkdir(parents=True, exist_ok=True)
+        out_path = self.ctx.ideas_dir / (
+            slug if slug.endswith(".yaml") else f"{slug}.yaml"
+        )
+        with open(out_path, "w", encoding="utf-8") as f:
+            yaml.safe_dump(
+                json.loads(json.dumps(idea, default=lambda o: o.__dict__)),
+                f,
+                allow_unicode=True,
+                sort_keys=False,
+            )
+        return IntakeResult(path=out_path, idea=idea)
+
+    def evaluate(self, idea_path: Union[str, Path]) -> EvaluateResult:
+        from .compact import load_idea_data
+        from .engine import arbitrate_llm
+        from .schemas import Idea
+
+        cfg = self.ctx.llm_config()
+        # Long ideas are evaluated in their compact form (cached next to the idea)
+        idea = Idea(**load_idea_data(idea_path, cfg))
+        verdict = arbitrate_llm(idea, self.rules, cfg, mode="llm-only")
+        return self._write_verdict(idea_path, verdict)
+
+    def _write_verdict(
+        self, idea_path: Union[str, Path], verdict: "Verdict"
+    ) -> EvaluateResult:
+        self.ctx.reports_dir.mkdir(parents=True, exist_ok=True)
+        out_json = self.verdict_path(idea_path)
+        with open(out_json, "w", encoding="utf-8") as f:
+            # Support Pydantic v2 and fallback
+            if hasattr(verdict, "model_dump_json"):
+                payload = json.loads(verdict.model_dump_json())
+            else:
+                payload = verdict.__dict__
+            json.dump(payload, f, indent=2, ensure_ascii=False)
+        return EvaluateResult(idea_path=Path(idea_path), verdict=verdict, path=out_json)
+
+    def expand_and_evaluate(
+        self, desc: str, slug: Optional[str] = None, stream: bool = True
+    ) -> ExpandResult:
+        """Expand a one-line idea and evaluate it in a single LLM round trip.
+
+        With `stream`, the idea YAML is written as soon as the expansion part of
+        the response is complete, while the verdict is still streaming.
+        """
+        from .expand import coerce_idea, expand_and_evaluate
+
+        streamed: List[Path] = []
+
+        def on_idea(raw: Dict[str, Any]) -> None:
+            streamed.append(self.intake(coerce_idea(raw, desc), slug=slug).path)
+
+        idea, verdict, mode = expand_and_evaluate(
+            desc, self.rules, self.ctx.llm_config(), on_idea if stream else None
+        )
+        intake = self.intake(idea, slug=slug)
+        for path in streamed:
+            if path != intake.path:
+                # The fallback re-expanded under another slug: drop the early file
+                path.unlink(missing_ok=True)
+        return ExpandResult(
+            intake=intake, evaluate=self._write_verdict(intake.path, verdict), mode=mode
+        )
+
+    def report(self, idea_path: Union[str, Path]) -> ReportResult:
+        idea_path = Path(idea_path)
+        verdict_path = self.verdict_path(idea_path)
+        self.ctx.reports_dir.mkdir(parents=True, exist_ok=True)
+        out_path = self.ctx.reports_dir / f"{am.slugify(idea_path.stem)}.md"
+        am.render_report(idea_path, verdict_path, self.ctx.template_path(), out_path)
+        return ReportResult(
+            idea_path=idea_path, verdict_path=verdict_path, path=out_path
+        )
+
+    def report_languages(
+        self, idea_path: Union[str, Path], languages: List[str]
+    ) -> List[ReportResult]:
+        """Render one report per language from the single verdict on disk.
+
+        Only `reasons` and `next_steps` are translated (one batched, cached call
+        per language), so the idea is judged once and every language shows the
+        same decision.
+        """
+        from .translate import localize_verdict
+
+        idea_path = Path(idea_path)
+        verdict_path = self.verdict_path(idea_path)
+        with open(verdict_path, "r", encoding="utf-8") as f:
+            verdict = json.load(f)
+        slug = am.slugify(idea_path.stem)
+        self.ctx.reports_dir.mkdir(parents=True, exist_ok=True)
+        results: List[ReportResult] = []
+        for lang in languages:
+            localized = localize_verdict(
+                verdict, lang, self.ctx.llm_config(), self.ctx.translations()
+            )
+            lang_verdict_path = verdict_path
+            if localized is not verdict:
+                lang_verdict_path = self.ctx.reports_dir / f"{slug}.verdict.{lang}.json"
+                with open(lang_verdict_path, "w", encoding="utf-8") as f:
+                    json.dump(localized, f, indent=2, ensure_ascii=False)
+            out_path = self.ctx.reports_dir / f"{slug}.{lang}.md"
+            template = self.ctx.with_changes(language=lang).template_path()
+            am.render_report(idea_path, lang_verdict_path, template, out_path)
+            results.append(
+                ReportResult(
+                    idea_path=idea_path, verdict_path=lang_verdict_path, path=out_path
+                )
+            )
+        return results
+
+    def run(
+        self,
+        idea: Union["Idea", Dict[str, Any]],
+        slug: Optional[str] = None,
+        skip_existing: bool = False,
+    ) -> PipelineResult:
+        """Intake, evaluate and render; `skip_existing` reuses a verdict already on disk."""
+        intake = self.intake(idea, slug=slug)
+        evaluated: Optional[EvaluateResult] = None
+        if not (skip_existing and self.verdict_path(intake.path).exists()):
+            evaluated = self.evaluate(intake.path)
+        return PipelineResult(
+            intake=intake, evaluate=evaluated, report=self.report(intake.path)
+        )
@@ -0,0 +1,198 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import re
+import tempfile
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Dict, Iterator, Mapping, Optional
+
+try:
+    import fcntl
+except Exception:  # non-POSIX: fall back to in-process locking only
+    fcntl = None  # type: ignore
+
+
+_DURATION_RE = re.compile(r"(\d+(?:\.\d+)?)(ms|s|m|h)")
+
+
+def parse_duration(value: Optional[str]) -> Optional[float]:
+    """Parse reset/retry values such as "1.5", "6m0s", "20ms" or an epoch in ms."""
+    if value is None:
+        return None
+    text = str(value).strip()
+    try:
+        num = float(text)
+    except ValueError:
+        parts = _DURATION_RE.findall(text)
+        if not parts:
+            return None
+        scale = {"ms": 0.001, "s": 1.0, "m": 60.0, "h": 3600.0}
+        return sum(float(n) * scale[u] for n, u in parts)
+    # Some providers (e.g. OpenRouter) send an absolute reset time in epoch ms
+    if num > 1e12:
+        return max(0.0, num / 1000.0 - time.time())
+    return num
+
+
+class RateLimiter:
+    """Token bucket for requests/min and tokens/min, shared through a locked state file.
+
+    Threads share the in-process lock; worker processes share the file lock, so
+    every caller draws from the same buckets. Limits adapt to `x-ratelimit-*`
+    headers and `Retry-After`, keeping a `safety` margin below the provider limit.
+    """
+
+    def __init__(
+        self,
+        rpm: float,
+        tpm: float,
+        state_path: Path,
+        safety: float = 0.9,
+    ) -> None:
+        self.rpm = float(rpm)
+        self.tpm = float(tpm)
+        self.safety = float(safety)
+        self.state_path = state_path
+        self._lock = threading.Lock()
+        state_path.parent.mkdir(parents=True, exist_ok=True)
+
+    @contextmanager
+    def _locked(self) -> Iterator[Dict[str, Any]]:
+        with self._lock:
+            with open(self.state_path.with_suffix(".lock"), "a+") as lock_f:
+                if fcntl is not None:
+                    fcntl.flock(lock_f, fcntl.LOCK_EX)
+                try:
+                    state = self._read()
+                    yield state
+                    self._write(state)
+                finally:
+                    if fcntl is not None:
+                        fcntl.flock(lock_f, fcntl.LOCK_UN)
+
+    def _read(self) -> Dict[str, Any]:
+        now = time.time()
+        try:
+            state = json.loads(self.state_path.read_text(encoding="utf-8"))
+        except Exception:
+            state = {}
+        base = [self.rpm, self.tpm, self.safety]
+        if state.get("base") != base:
+            # Configured limits changed since the file was written: they win over
+            # rates learned from headers under the old configuration
+            state["base"] = base
+            state["rpm"] = self.rpm * self.safety
+            state["tpm"] = self.tpm * self.safety
+        state.setdefault("requests", state["rpm"])
+        state.setdefault("tokens", state["tpm"])
+        state.setdefault("blocked_until", 0.0)
+        # Refill both buckets for the time elapsed since the last update
+        elapsed = max(0.0, now - float(state.get("updated", now)))
+        state["requests"] = min(
+            state["rpm"], state["requests"] + elapsed * state["rpm"] / 60.0
+        )
+        state["tokens"] = min(
+            state["tpm"], state["tokens"] + elapsed * state["tpm"] / 60.0
+        )
+        state["updated"] = now
+        return state
+
+    def _write(self, state: Dict[str, Any]) -> None:
+        tmp = self.state_path.with_suffix(".tmp")
+        tmp.write_text(json.dumps(state), encoding="utf-8")
+        os.replace(tmp, self.state_path)
+
+    def acquire(self, est_tokens: int = 0) -> None:
+        while True:
+            with self._locked() as state:
+                now = time.time()
+                need = min(float(est_tokens), state["tpm"])
+                wait_s = max(0.0, state["blocked_until"] - now)
+                if not wait_s:
+                    if state["requests"] >= 1.0 and state["tokens"] >= need:
+                        state["requests"] -= 1.0
+                        state["tokens"] -= need
+                        return
+                    wait_s = max(
+                        (1.0 - state["requests"]) * 60.0 / max(state["rpm"], 1e-6),
+                        (need - state["tokens"]) * 60.0 / max(state["tpm"], 1e-6),
+                        0.01,
+                    )
+            time.sleep(min(wait_s, 60.0))
+
+    def settle(self, est_tokens: int, actual_tokens: Optional[int]) -> None:
+        if actual_tokens is None:
+            return
+        with self._locked() as state:
+            state["tokens"] -= float(actual_tokens - est_tokens)
+
+    def observe(self, headers: Optional[Mapping[str, str]]) -> None:
+        if not headers:
+            return
+        h = {str(k).lower(): v for k, v in headers.items()}
+        with self._locked() as state:
+            for kind, rate_key, bucket_key in (
+                ("requests", "rpm", "requests"),
+                ("tokens", "tpm", "tokens"),
+            ):
+                # OpenAI uses *-requests/*-tokens suffixes; OpenRouter sends bare names
+                limit = h.get(f"x-ratelimit-limit-{kind}")
+                remaining = h.get(f"x-ratelimit-remaining-{kind}")
+                if kind == "requests":
+                    limit = limit or h.get("x-ratelimit-limit")
+                    remaining = remaining or h.get("x-ratelimit-remaining")
+                if limit is not None:
+                    try:
+                        state[rate_key] = float(limit) * self.safety
+                    except ValueError:
+                        pass
+                if remaining is not None:
+                    try:
+                        left = float(remaining)
+                    except ValueError:
+                        continue
+                    state[bucket_key] = min(state[bucket_key], left * self.safety)
+                    # Exhausted: nothing more until the provider's window resets
+                    reset = parse_duration(h.get(f"x-ratelimit-reset-{kind}"))
+                    if left < 1.0 and reset is not None:
+                        state["blocked_until"] = max(
+                            state["blocked_until"], time.time() + reset
+                        )
+            retry_after = parse_duration(h.get("retry-after"))
+            if retry_after is None and h.get("retry-after-ms"):
+                retry_after = float(h["retry-after-ms"]) / 1000.0
+            if retry_after is not None:
+                state["blocked_until"] = max(
+                    state["blocked_until"], time.time() + retry_after
+                )
+
+
+_LIMITERS: Dict[str, RateLimiter] = {}
+_LIMITERS_LOCK = threading.Lock()
+
+
+def limiter_for(cfg: Dict[str, Any], key: str) -> RateLimiter:
+    state_path = cfg.get("state_path")
+    if not state_path:
+        digest = hashlib.sha1(key.encode("utf-8")).hexdigest()[:12]
+        state_path = str(
+            Path(tempfile.gettempdir()) / f"idea-crucible-ratelimit-{digest}.json"
+        )
+    settings = (
+        float(cfg.get("rpm", 60)),
+        float(cfg.get("tpm", 100000)),
+        float(cfg.get("safety", 0.9)),
+    )
+    with _LIMITERS_LOCK:
+        limiter = _LIMITERS.get(state_path)
+        if limiter is None or (limiter.rpm, limiter.tpm, limiter.safety) != settings:
+            limiter = RateLimiter(
+                settings[0], settings[1], Path(state_path), settings[2]
+            )
+            _LIMITERS[state_path] = limiter
+        return limiter
@@ -0,0 +1,191 @@
+from __future__ import annotations
+
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional, Tuple, TypeVar
+
+from .llm import LLMConfig, OpenAIClient
+
+T = TypeVar("T")
+
+
+class CircuitBreaker:
+    """closed -> open after `failure_threshold` consecutive failures -> half-open probe."""
+
+    def __init__(self, failure_threshold: int = 3, cooldown_s: float = 30.0) -> None:
+        self.failure_threshold = failure_threshold
+        self.cooldown_s = cooldown_s
+        self.state = "closed"
+        self.failures = 0
+        self.opened_at = 0.0
+        self._probing = False
+        self._lock = threading.Lock()
+
+    def allow(self) -> bool:
+        with self._lock:
+            if self.state == "closed":
+                return True
+            if self.state == "open" and time.monotonic() - self.opened_at >= (
+                self.cooldown_s
+            ):
+                self.state = "half_open"
+            # Only one in-flight probe while half-open
+            if self.state == "half_open" and not self._probing:
+                self._probing = True
+                return True
+            return False
+
+    def record_success(self) -> None:
+        with self._lock:
+            self.state = "closed"
+            self.failures = 0
+            self._probing = False
+
+    def record_failure(self, trip: bool = True) -> None:
+        with self._lock:
+            self._probing = False
+            if not trip:
+                return
+            self.failures += 1
+            if self.state == "half_open" or self.failures >= self.failure_threshold:
+                self.state = "open"
+                self.opened_at = time.monotonic()
+
+
+class EndpointHealth:
+    def __init__(self, alpha: float = 0.3, default_latency_s: float = 60.0) -> None:
+        self.alpha = alpha
+        # Assumed until a call succeeds, so failures are not free (e.g. the timeout)
+        self.default_latency_s = default_latency_s
+        self.latency_s: Optional[float] = None
+        self.error_rate = 0.0
+        self._lock = threading.Lock()
+
+    def record(self, ok: bool, latency_s: Optional[float] = None) -> None:
+        with self._lock:
+            self.error_rate += self.alpha * ((0.0 if ok else 1.0) - self.error_rate)
+            if latency_s is not None:
+                self.latency_s = (
+                    latency_s
+                    if self.latency_s is None
+                    else self.latency_s + self.alpha * (latency_s - self.latency_s)
+                )
+
+    def score(self) -> float:
+        # Expected cost of a call: EWMA latency inflated by the recent error rate
+        latency = self.default_latency_s if self.latency_s is None else self.latency_s
+        return latency * (1.0 + 4.0 * self.error_rate)
+
+
+def is_transient(e: BaseException) -> bool:
+    status = getattr(e, "status_code", None)
+    if status is not None:
+        return status == 429 or status >= 500
+    name = type(e).__name__.lower()
+    return "timeout" in name or "connection" in name
+
+
+class _Endpoint:
+    def __init__(self, cfg: LLMConfig, breaker: Dict[str, Any]) -> None:
+        self.cfg = cfg
+        self.health = EndpointHealth(default_latency_s=cfg.timeout_s)
+        self.breaker = CircuitBreaker(
+            int(breaker.get("failure_threshold", 3)),
+            float(breaker.get("cooldown_s", 30.0)),
+        )
+        self._client: Optional[OpenAIClient] = None
+
+    @property
+    def client(self) -> OpenAIClient:
+        if self._client is None:
+            self._client = OpenAIClient(self.cfg)
+        return self._client
+
+
+# Health and breaker state is per process and shared by every RoutedClient
+_ENDPOINTS: Dict[Tuple[str, str, str], _Endpoint] = {}
+_ENDPOINTS_LOCK = threading.Lock()
+
+
+class RoutedClient:
+    """Sends each call to the healthiest configured endpoint, failing over in order."""
+
+    def __init__(self, cfg: LLMConfig) -> None:
+        self._cfg = cfg
+        self._endpoints: List[_Endpoint] = []
+        for item in cfg.endpoints:
+            overrides = {"model": item} if isinstance(item, str) else dict(item)
+            # Fail fast per endpoint: the router, not the SDK, handles retries
+            overrides["sdk_retries"] = 0
+            overrides["endpoints"] = []
+            ep_cfg = cfg.derive(overrides)
+            key = (ep_cfg.base_url or "", ep_cfg.model, str(ep_cfg.api_key or ""))
+            with _ENDPOINTS_LOCK:
+                if key not in _ENDPOINTS:
+                    _ENDPOINTS[key] = _Endpoint(ep_cfg, cfg.breaker)
+                self._endpoints.append(_ENDPOINTS[key])
+
+    def _ranked(self) -> List[_Endpoint]:
+        order = {id(ep): i for i, ep in enumerate(self._endpoints)}
+        return sorted(
+            self._endpoints, key=lambda ep: (ep.health.score(), order[id(ep)])
+        )
+
+    def _attempt(self, ep: _Endpoint, call: Callable[[OpenAIClient], T]) -> T:
+        start = time.monotonic()
+        try:
+            result = call(ep.client)
+        except Exception as e:
+            ep.health.record(False)
+            ep.breaker.record_failure(trip=is_transient(e))
+            raise
+        ep.health.record(True, time.monotonic() - start)
+        ep.breaker.record_success()
+        return result
+
+    def _route(
+        self,
+        call: Callable[[OpenAIClient], T],
+        can_fail_over: Callable[[], bool] = lambda: True,
+    ) -> T:
+        last_error: Optional[BaseException] = None
+        tried = 0
+        for ep in self._ranked():
+            if not ep.breaker.allow():
+                continue
+            tried += 1
+            try:
+                return self._attempt(ep, call)
+            except Exception as e:
+                last_error = e
+                if not can_fail_over():
+                    raise
+        if not tried:
+            # Every breaker is open: probe the one that tripped first, with the
+            # usual bookkeeping so a recovered endpoint closes its breaker
+            ep = min(self._endpoints, key=lambda ep: ep.breaker.opened_at)
+            return self._attempt(ep, call)
+        assert last_error is not None
+        raise last_error
+
+    def complete_json(self, system: str, user: str) -> str:
+        return self._route(lambda c: c.complete_json_once(system, user))
+
+    def complete_json_n(self, system: str, user: str, n: int) -> List[str]:
+        return self._route(lambda c: c.complete_json_n_once(system, user, n))
+
+    def complete_json_stream(
+        self, system: str, user: str, on_text: Callable[[str], None]
+    ) -> str:
+        started = False
+
+        def forward(text: str) -> None:
+            nonlocal started
+            started = True
+            on_text(text)
+
+        # Once text has reached the caller, another endpoint cannot take over
+        return self._route(
+            lambda c: c.complete_json_stream(system, user, forward),
+            lambda: not started,
+        )
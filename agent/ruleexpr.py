@@ -0,0 +1,215 @@
+from __future__ import annotations
+
+import ast
+import operator
+from typing import Any, Callable, Dict, List, Optional, Sequence, Set, Tuple
+
+# A compiled node maps fact columns (name -> one value per idea) to a result column.
+# None means "unknown": a missing fact, or an operation that does not apply.
+Column = List[Any]
+Node = Callable[[Dict[str, Column], int], Column]
+
+_COMPARE: Dict[type, Callable[[Any, Any], Any]] = {
+    ast.Lt: operator.lt,
+    ast.LtE: operator.le,
+    ast.Gt: operator.gt,
+    ast.GtE: operator.ge,
+    ast.Eq: operator.eq,
+    ast.NotEq: operator.ne,
+}
+_ARITH: Dict[type, Callable[[Any, Any], Any]] = {
+    ast.Add: operator.add,
+    ast.Sub: operator.sub,
+    ast.Mult: operator.mul,
+    ast.Div: operator.truediv,
+}
+
+
+class ExprError(ValueError):
+    pass
+
+
+def _apply(fn: Callable[[Any, Any], Any], a: Column, b: Column) -> Column:
+    out: Column = []
+    for x, y in zip(a, b):
+        if x is None or y is None:
+            out.append(None)
+            continue
+        try:
+            out.append(fn(x, y))
+        except (TypeError, ZeroDivisionError):
+            out.append(None)  # e.g. a string fact compared with a number
+    return out
+
+
+def _and(cols: List[Column]) -> Column:
+    # Kleene logic: any False wins, otherwise any unknown stays unknown
+    out: Column = []
+    for values in zip(*cols):
+        if any(v is not None and not v for v in values):
+            out.append(False)
+        elif any(v is None for v in values):
+            out.append(None)
+        else:
+            out.append(True)
+    return out
+
+
+def _or(cols: List[Column]) -> Column:
+    out: Column = []
+    for values in zip(*cols):
+        if any(v is not None and v for v in values):
+            out.append(True)
+        elif any(v is None for v in values):
+            out.append(None)
+        else:
+            out.append(False)
+    return out
+
+
+def _literal_set(node: ast.expr) -> Optional[frozenset]:
+    if isinstance(node, (ast.List, ast.Tuple, ast.Set)) and all(
+        isinstance(e, ast.Constant) for e in node.elts
+    ):
+        return frozenset(e.value for e in node.elts)  # type: ignore[attr-defined]
+    return None
+
+
+def _compile(node: ast.expr, names: Set[str]) -> Node:
+    if isinstance(node, ast.Constant):
+        if not isinstance(node.value, (int, float, str, bool)):
+            raise ExprError(f"Unsupported constant: {node.value!r}")
+        value = node.value
+        return lambda cols, n: [value] * n
+    if isinstance(node, ast.Name):
+        name = node.id
+        names.add(name)
+        return lambda cols, n: cols.get(name) or [None] * n
+    if isinstance(node, ast.UnaryOp):
+        inner = _compile(node.operand, names)
+        if isinstance(node.op, ast.Not):
+            return lambda cols, n: [
+                None if v is None else not v for v in inner(cols, n)
+            ]
+        if isinstance(node.op, ast.USub):
+            return lambda cols, n: _apply(operator.sub, [0] * n, inner(cols, n))
+    if isinstance(node, ast.BoolOp):
+        parts = [_compile(v, names) for v in node.values]
+        combine = _and if isinstance(node.op, ast.And) else _or
+        return lambda cols, n: combine([p(cols, n) for p in parts])
+    if isinstance(node, ast.BinOp) and type(node.op) in _ARITH:
+        fn = _ARITH[type(node.op)]
+        left, right = _compile(node.left, names), _compile(node.right, names)
+        return lambda cols, n: _apply(fn, left(cols, n), right(cols, n))
+    if isinstance(node, ast.Compare):
+        return _compile_compare(node, names)
+    raise ExprError(f"Unsupported syntax: {ast.dump(node)[:60]}")
+
+
+def _compile_compare(node: ast.Compare, names: Set[str]) -> Node:
+    # a < b <= c is (a < b) and (b <= c), as in Python
+    steps: List[Node] = []
+    left = _compile(node.left, names)
+    for op, right_node in zip(node.ops, node.comparators):
+        if isinstance(op, (ast.In, ast.NotIn)):
+            options = _literal_set(right_node)
+            if options is None:
+                raise ExprError(
+                    "`in` needs a literal list, e.g. stage in ['idea', 'mvp']"
+                )
+            negate = isinstance(op, ast.NotIn)
+
+            def member(
+                cols: Dict[str, Column],
+                n: int,
+                left: Node = left,
+                options: frozenset = options,
+                negate: bool = negate,
+            ) -> Column:
+                return [
+                    None if v is None else (v in options) != negate
+                    for v in left(cols, n)
+                ]
+
+            steps.append(member)
+            continue
+        if type(op) not in _COMPARE:
+            raise ExprError(f"Unsupported comparison: {type(op).__name__}")
+        right = _compile(right_node, names)
+
+        def compare(
+            cols: Dict[str, Column],
+            n: int,
+            fn: Callable[[Any, Any], Any] = _COMPARE[type(op)],
+            left: Node = left,
+            right: Node = right,
+        ) -> Column:
+            return _apply(fn, left(cols, n), right(cols, n))
+
+        steps.append(compare)
+        left = right
+    if len(steps) == 1:
+        return steps[0]
+    return lambda cols, n: _and([s(cols, n) for s in steps])
+
+
+class Predicate:
+    """A compiled `expr`: true/false per idea, or None when facts are missing."""
+
+    def __init__(self, source: str) -> None:
+        self.source = source
+        try:
+            tree = ast.parse(source, mode="eval")
+        except SyntaxError as e:
+            raise ExprError(f"Invalid expr {source!r}: {e.msg}") from None
+        self.names: Set[str] = set()
+        self._node = _compile(tree.body, self.names)
+
+    def evaluate(self, columns: Dict[str, Column], n: int) -> List[Optional[bool]]:
+        return [None if v is None else bool(v) for v in self._node(columns, n)]
+
+    def __call__(self, facts: Dict[str, Any]) -> Optional[bool]:
+        return self.evaluate({k: [facts.get(k)] for k in self.names}, 1)[0]
+
+
+_COMPILED: Dict[str, Predicate] = {}
+
+
+def compile_expr(source: str) -> Predicate:
+    if source not in _COMPILED:
+        _COMPILED[source] = Predicate(source)
+    return _COMPILED[source]
+
+
+def idea_facts(idea: Any) -> Dict[str, Any]:
+    facts = (
+        idea.get("facts") if isinstance(idea, dict) else getattr(idea, "facts", None)
+    )
+    return dict(facts or {})
+
+
+def fact_columns(ideas: Sequence[Any], names: Set[str]) -> Dict[str, Column]:
+    rows = [idea_facts(i) for i in ideas]
+    return {name: [r.get(name) for r in rows] for name in names}
+
+
+def check_rules(
+    ideas: Sequence[Any], rules: Sequence[Any]
+) -> List[Dict[str, Optional[bool]]]:
+    """Evaluate every rule `expr` over all `ideas` at once, one column per fact.
+
+    Returns one {rule_id: fired?} mapping per idea; rules without `expr`, or
+    whose facts are missing for that idea, are left to the LLM (None/absent).
+    """
+    compiled: List[Tuple[str, Predicate]] = [
+        (r.id, compile_expr(r.expr)) for r in rules if getattr(r, "expr", None)
+    ]
+    out: List[Dict[str, Optional[bool]]] = [{} for _ in ideas]
+    if not compiled or not ideas:
+        return out
+    names = set().union(*(p.names for _, p in compiled))
+    columns = fact_columns(ideas, names)
+    for rule_id, predicate in compiled:
+        for checks, result in zip(out, predicate.evaluate(columns, len(ideas))):
+            checks[rule_id] = result
+    return out
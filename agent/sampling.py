@@ -0,0 +1,93 @@
+from __future__ import annotations
+
+import statistics
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Optional
+
+from .ensemble import _conf, _decision, aggregate_verdicts
+from .llm import (
+    FALLBACK_REASON,
+    LLMConfig,
+    _parse_object,
+    get_client,
+    verdict_prompt,
+)
+
+
+def sample_config(cfg: LLMConfig) -> LLMConfig:
+    # Identical samples agree trivially; sampling needs some temperature
+    temperature = float(cfg.self_consistency.get("temperature", 0.7))
+    return cfg.derive({"temperature": temperature, "self_consistency": {}})
+
+
+def sample_completions(client: Any, system: str, user: str, n: int) -> List[str]:
+    """n raw completions: one request when the client supports `n`, else n concurrent calls."""
+    complete_n = getattr(client, "complete_json_n", None)
+    if complete_n is not None:
+        return list(complete_n(system, user, n))
+    with ThreadPoolExecutor(max_workers=n) as pool:
+        futures = [pool.submit(client.complete_json, system, user) for _ in range(n)]
+    out: List[str] = []
+    for fut in futures:
+        try:
+            out.append(fut.result())
+        except Exception:
+            continue
+    return out
+
+
+def valid_samples(raws: List[str]) -> List[Dict[str, Any]]:
+    # Malformed samples are simply dropped: the others still carry the vote
+    out = []
+    for raw in raws:
+        data = _parse_object(raw)
+        if data is not None and "decision" in data:
+            out.append(data)
+    return out
+
+
+def aggregate_samples(samples: List[Dict[str, Any]], n: int) -> Dict[str, Any]:
+    """Majority vote over samples; conf_level from agreement and confidence spread.
+
+    conf = agreement * (mean - stdev) of the agreeing samples' confidences, so
+    a split vote or scattered self-reports both lower it.
+    """
+    data = aggregate_verdicts([(s, 1.0) for s in samples], "vote")
+    decision = data["decision"]
+    agreeing = [_conf(s) for s in samples if _decision(s) == decision]
+    spread = statistics.pstdev(agreeing) if len(agreeing) > 1 else 0.0
+    agreement = len(agreeing) / len(samples)
+    conf = agreement * max(0.0, statistics.fmean(agreeing) - spread)
+    data["conf_level"] = float(f"{conf:.2f}")
+    data.pop("ensemble", None)
+    data["self_consistency"] = {
+        "n": n,
+        "valid": len(samples),
+        "agreement": float(f"{agreement:.2f}"),
+        "conf_stdev": float(f"{spread:.2f}"),
+    }
+    return data
+
+
+def llm_sampled_verdict_json(
+    idea: Dict[str, Any],
+    rules: List[Dict[str, Any]],
+    cfg: LLMConfig,
+    allowed_redline_ids: Optional[List[str]] = None,
+    correction_note: Optional[str] = None,
+) -> Dict[str, Any]:
+    n = max(1, int(cfg.self_consistency.get("n", 5)))
+    sample_cfg = sample_config(cfg)
+    system, user = verdict_prompt(
+        idea, rules, sample_cfg, allowed_redline_ids, correction_note
+    )
+    samples = valid_samples(sample_completions(get_client(sample_cfg), system, user, n))
+    if not samples:
+        return {
+            "decision": "caution",
+            "conf_level": 0.5,
+            "reasons": [FALLBACK_REASON],
+            "redlines": [],
+            "next_steps": [],
+        }
+    return aggregate_samples(samples, n)
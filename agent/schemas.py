@@ -1,21 +1,50 @@
 from __future__ import annotations
 
-from typing import List, Optional, Literal
+import copy
+from typing import (
+    Any,
+    Dict,
+    List,
+    Literal,
+    NamedTuple,
+    Optional,
+    Sequence,
+    Tuple,
+    Union,
+)
 
 try:
-    from pydantic import BaseModel, Field
+    from pydantic import BaseModel, Field, TypeAdapter, ValidationError
+
+    HAS_PYDANTIC = True
 except Exception:  # minimal fallback if pydantic is unavailable
-    from dataclasses import dataclass, field
+    HAS_PYDANTIC = False
 
     class BaseModel:  # type: ignore
-        pass
+        # Field presence and defaults only; no type coercion without pydantic
+        def __init__(self, **data: Any) -> None:
+            for cls in reversed(type(self).__mro__):
+                for name in getattr(cls, "__annotations__", {}):
+                    if name in data:
+                        value = data[name]
+                    elif hasattr(type(self), name):
+                        value = copy.copy(getattr(type(self), name))
+                    else:
+                        raise TypeError(
+                            f"{type(self).__name__}: missing required field '{name}'"
+                        )
+                    setattr(self, name, value)
+
+        def model_dump(self) -> Dict[str, Any]:
+            return dict(self.__dict__)
+
+        def __repr__(self) -> str:
+            fields = ", ".join(f"{k}={v!r}" for k, v in self.__dict__.items())
+            return f"{type(self).__name__}({fields})"
 
     def Field(default=None, **_):  # type: ignore
         return default
 
-    def dataclass_model(cls):
-        return dataclass(cls)
-
 
 class Rule(BaseModel):
     id: str
@@ -32,6 +61,8 @@ class Rule(BaseModel):
     keywords: Optional[List[str]] = None
     category: Optional[str] = None
     next_steps: Optional[List[str]] = None
+    # Optional structured condition over idea facts, e.g. "unit_cost > value_ceiling"
+    expr: Optional[str] = None
 
 
 class Idea(BaseModel):
@@ -42,6 +73,8 @@ class Idea(BaseModel):
     alts: str
     assumptions: List[str] = []
     risks: List[str] = []
+    # Optional numeric/enum facts that rule `expr` fields are checked against
+    facts: Dict[str, Union[bool, int, float, str]] = {}
 
 
 class Evidence(BaseModel):
@@ -51,6 +84,8 @@ class Evidence(BaseModel):
     sample_size: Optional[int] = None
     excerpts: List[str] = []
     timestamp: Optional[str] = None
+    # BM25 score when retrieved from the local evidence index
+    score: Optional[float] = None
 
 
 class Verdict(BaseModel):
@@ -59,3 +94,146 @@ class Verdict(BaseModel):
     conf_level: float = 0.5
     redlines: List[str] = []
     next_steps: List[str] = []
+    # Cascade tier that produced the verdict ("fast" | "strong"); None without a cascade
+    tier: Optional[str] = None
+    # Language the reasons/next_steps were written in; None when not pinned ("auto")
+    language: Optional[str] = None
+    # Decided by rule `expr` checks alone, without an LLM call
+    deterministic: bool = False
+    # Local evidence excerpts given to the model (cited as E1, E2, ...)
+    evidence: List[Evidence] = []
+
+
+class IdeaRecord(NamedTuple):
+    """Tuple-backed read-only idea for bulk scans (no model instance overhead)."""
+
+    intent: str
+    user: str
+    scenario: str
+    triggers: str
+    alts: str
+    assumptions: List[str] = []
+    risks: List[str] = []
+    facts: Dict[str, Any] = {}
+
+
+if HAS_PYDANTIC:
+    from typing_extensions import NotRequired, TypedDict
+
+    class _IdeaFields(TypedDict):
+        # Validated as plain dicts: much cheaper than building model instances
+        intent: str
+        user: str
+        scenario: str
+        triggers: str
+        alts: str
+        assumptions: NotRequired[List[str]]
+        risks: NotRequired[List[str]]
+        facts: NotRequired[Dict[str, Union[bool, int, float, str]]]
+
+
+class _Rejected:
+    __slots__ = ("row",)
+
+    def __init__(self, row: Any) -> None:
+        self.row = row
+
+
+# Compiled validators, built once on first use: (list adapter, row adapter)
+_ADAPTERS: Dict[Any, Tuple[Any, Any]] = {}
+
+
+def _adapters(tp: Any) -> Tuple[Any, Any]:
+    if tp not in _ADAPTERS:
+        from pydantic import AfterValidator
+        from typing_extensions import Annotated
+
+        # Invalid rows fall through to the second arm instead of raising, so the
+        # whole list is validated in a single pass even when some rows are bad.
+        item = Annotated[
+            Union[tp, Annotated[Any, AfterValidator(_Rejected)]],
+            Field(union_mode="left_to_right"),
+        ]
+        _ADAPTERS[tp] = (TypeAdapter(List[item]), TypeAdapter(tp))  # type: ignore[valid-type]
+    return _ADAPTERS[tp]
+
+
+def _error_message(e: ValidationError) -> str:
+    return "; ".join(
+        f"{'.'.join(str(x) for x in err.get('loc') or ()) or 'row'}: {err.get('msg')}"
+        for err in e.errors()
+    )
+
+
+def _bulk_validate(
+    model: Any, rows: Sequence[Dict[str, Any]]
+) -> Tuple[List[Any], List[Tuple[int, str]]]:
+    """Validate `rows` in one pass; returns (items with None for bad rows, errors)."""
+    items: List[Any] = []
+    errors: List[Tuple[int, str]] = []
+    if not HAS_PYDANTIC:
+        for i, row in enumerate(rows):
+            try:
+                items.append(model(**row))
+            except Exception as e:
+                items.append(None)
+                errors.append((i, str(e)))
+        return items, errors
+
+    many, one = _adapters(model)
+    items = many.validate_python(rows)
+    for i, item in enumerate(items):
+        if isinstance(item, _Rejected):
+            # Only the rejected rows pay for a second, per-row validation
+            items[i] = None
+            try:
+                one.validate_python(item.row)
+                errors.append((i, "row: invalid"))
+            except ValidationError as e:
+                errors.append((i, _error_message(e)))
+    return items, errors
+
+
+def validate_ideas(
+    rows: Sequence[Dict[str, Any]],
+) -> Tuple[List[Optional[Idea]], List[Tuple[int, str]]]:
+    return _bulk_validate(Idea, rows)
+
+
+def validate_rules(
+    rows: Sequence[Dict[str, Any]],
+) -> Tuple[List[Optional[Rule]], List[Tuple[int, str]]]:
+    return _bulk_validate(Rule, rows)
+
+
+def validate_evidence(
+    rows: Sequence[Dict[str, Any]],
+) -> Tuple[List[Optional[Evidence]], List[Tuple[int, str]]]:
+    return _bulk_validate(Evidence, rows)
+
+
+def validate_idea_records(
+    rows: Sequence[Dict[str, Any]],
+) -> Tuple[List[Optional[IdeaRecord]], List[Tuple[int, str]]]:
+    """Fast read-only path: validate as plain dicts, then pack into tuples."""
+    if not HAS_PYDANTIC:
+        fields = IdeaRecord._fields
+        return _bulk_validate(
+            IdeaRecord, [{k: row[k] for k in fields if k in row} for row in rows]
+        )
+    dicts, errors = _bulk_validate(_IdeaFields, rows)
+    return [
+        IdeaRecord(
+            d["intent"],
+            d["user"],
+            d["scenario"],
+            d["triggers"],
+            d["alts"],
+            d.get("assumptions") or [],
+            d.get("risks") or [],
+            d.get("facts") or {},
+        )
+        if d is not None
+        else None
+        for d in dicts
+    ], errors
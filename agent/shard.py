@@ -0,0 +1,110 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import shutil
+from pathlib import Path
+from typing import Any, Dict, List, Tuple
+
+
+def parse_shard(spec: str) -> Tuple[int, int]:
+    """Parse "2/4" into (2, 4); shards are numbered from 1."""
+    try:
+        i_text, n_text = spec.split("/", 1)
+        i, n = int(i_text), int(n_text)
+    except ValueError:
+        raise ValueError(f"Invalid shard {spec!r}: expected i/N, e.g. 1/4") from None
+    if not 1 <= i <= n:
+        raise ValueError(f"Invalid shard {spec!r}: need 1 <= i <= N")
+    return i, n
+
+
+def content_key(idea: Any) -> int:
+    """64-bit hash of the idea's content, independent of file name or row order."""
+    if isinstance(idea, dict):
+        data = idea
+    else:
+        data = idea.model_dump() if hasattr(idea, "model_dump") else idea.__dict__
+    blob = json.dumps(data, sort_keys=True, ensure_ascii=False)
+    return int.from_bytes(hashlib.sha1(blob.encode("utf-8")).digest()[:8], "big")
+
+
+def jump_hash(key: int, buckets: int) -> int:
+    # Jump consistent hash (Lamping & Veach): changing N only moves ~1/N of the keys
+    b, j = -1, 0
+    while j < buckets:
+        b = j
+        key = (key * 2862933555777941757 + 1) & 0xFFFFFFFFFFFFFFFF
+        j = int((b + 1) * (float(1 << 31) / float((key >> 33) + 1)))
+    return b
+
+
+def shard_of(idea: Any, n: int) -> int:
+    """1-based shard of `idea` among `n`; stable as the corpus grows."""
+    return jump_hash(content_key(idea), n) + 1
+
+
+def shard_name(i: int, n: int) -> str:
+    return f"{i}-of-{n}"
+
+
+MERGED_LOGS = ("_errors.jsonl", "_deferred.jsonl")
+
+
+def merge_shards(shard_dirs: List[Path], out_dir: Path) -> Dict[str, Any]:
+    """Combine per-shard verdicts, logs and stats into `out_dir`.
+
+    Shards are processed in name order and stats are recomputed from the merged
+    verdicts, so the result does not depend on the order shards finished in.
+    """
+    shard_dirs = sorted(shard_dirs, key=lambda p: p.name)
+    out_dir.mkdir(parents=True, exist_ok=True)
+    owners: Dict[str, str] = {}
+    conflicts: List[Dict[str, str]] = []
+    for shard in shard_dirs:
+        for p in sorted(shard.glob("*.verdict.json")):
+            if p.name in owners:
+                # Same slug in two shards: keep the first shard's verdict
+                conflicts.append(
+                    {"verdict": p.name, "kept": owners[p.name], "dropped": shard.name}
+                )
+                continue
+            owners[p.name] = shard.name
+            shutil.copy2(p, out_dir / p.name)
+
+    for log in MERGED_LOGS:
+        with open(out_dir / log, "w", encoding="utf-8") as out:
+            for shard in shard_dirs:
+                src = shard / log
+                if not src.exists():
+                    continue
+                for line in src.read_text(encoding="utf-8").splitlines():
+                    if line.strip():
+                        rec = json.loads(line)
+                        out.write(
+                            json.dumps({**rec, "shard": shard.name}, ensure_ascii=False)
+                            + "\n"
+                        )
+
+    from .stats import collect_stats
+
+    stats = collect_stats(sorted(out_dir / name for name in owners))
+    budgets = []
+    for shard in shard_dirs:
+        try:
+            shard_stats = json.loads(
+                (shard / "_stats.json").read_text(encoding="utf-8")
+            )
+        except (OSError, ValueError):
+            continue
+        if isinstance(shard_stats.get("budget"), dict):
+            budgets.append(shard_stats["budget"])
+    if budgets:
+        keys = sorted({k for b in budgets for k in b})
+        stats["budget"] = {k: round(sum(b.get(k, 0) for b in budgets), 4) for k in keys}
+    stats["shards"] = [p.name for p in shard_dirs]
+    stats["conflicts"] = conflicts
+    (out_dir / "_stats.json").write_text(
+        json.dumps(stats, indent=2, ensure_ascii=False), encoding="utf-8"
+    )
+    return stats
@@ -0,0 +1,77 @@
+from __future__ import annotations
+
+import json
+from pathlib import Path
+from typing import Any, Dict, List
+
+
+class StatsAccumulator:
+    """Incremental stats so corpus runs need not keep every verdict around."""
+
+    def __init__(self) -> None:
+        self.decisions: Dict[str, int] = {}
+        self.redline_counts: Dict[str, int] = {}
+        self.tier_counts: Dict[str, int] = {}
+        self.deterministic = 0
+        self.total = 0
+
+    def add(self, data: Dict[str, Any]) -> None:
+        self.total += 1
+        d = str(data.get("decision", "caution")).lower()
+        self.decisions[d] = self.decisions.get(d, 0) + 1
+        for rl in data.get("redlines", []) or []:
+            self.redline_counts[rl] = self.redline_counts.get(rl, 0) + 1
+        if data.get("deterministic"):
+            self.deterministic += 1
+        tier = data.get("tier")
+        if tier:
+            self.tier_counts[tier] = self.tier_counts.get(tier, 0) + 1
+
+    def result(self) -> Dict[str, Any]:
+        stats = summarize(self.decisions, self.redline_counts, self.total)
+        if self.tier_counts:
+            # Cascade runs: share of verdicts that needed the strong model
+            cascaded = sum(self.tier_counts.values())
+            stats["tier_counts"] = self.tier_counts
+            stats["escalation_rate"] = float(
+                f"{self.tier_counts.get('strong', 0) / cascaded:.4f}"
+            )
+        if self.deterministic:
+            # Decided by rule `expr` checks without an LLM call
+            stats["deterministic"] = self.deterministic
+        return stats
+
+
+def collect_stats(verdict_paths: List[Path]) -> Dict[str, Any]:
+    acc = StatsAccumulator()
+    for p in verdict_paths:
+        try:
+            data = json.loads(p.read_text(encoding="utf-8"))
+        except Exception:
+            continue
+        acc.add(data)
+    return acc.result()
+
+
+def summarize(
+    decisions: Dict[str, int], redline_counts: Dict[str, int], total: int
+) -> Dict[str, Any]:
+    decision_pct = {k: (v / total if total else 0.0) for k, v in decisions.items()}
+    redline_hit_rate = {
+        k: (v / total if total else 0.0) for k, v in redline_counts.items()
+    }
+
+    # Top-1 / Top-3 by hit-rate
+    sorted_rl = sorted(redline_hit_rate.items(), key=lambda x: x[1], reverse=True)
+    top1 = sorted_rl[:1]
+    top3 = sorted_rl[:3]
+
+    return {
+        "decision_counts": decisions,
+        "decision_pct": {k: float(f"{v:.4f}") for k, v in decision_pct.items()},
+        "redline_counts": redline_counts,
+        "redline_hit_rate": {k: float(f"{v:.4f}") for k, v in redline_hit_rate.items()},
+        "top1": {k: v for k, v in top1},
+        "top3": {k: v for k, v in top3},
+        "total": total,
+    }
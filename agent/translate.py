@@ -0,0 +1,99 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import threading
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Union
+
+from .fastload import CACHE_DIR
+from .llm import LLMConfig, llm_translate_json
+
+# Free-text verdict fields that differ per language; decision/redlines/conf do not
+TRANSLATED_FIELDS = ("reasons", "next_steps")
+DEFAULT_CACHE = CACHE_DIR / "translations.jsonl"
+
+log = logging.getLogger(__name__)
+
+
+def text_key(text: str, target: str) -> str:
+    return hashlib.sha1(f"{target}\0{text}".encode("utf-8")).hexdigest()
+
+
+class TranslationCache:
+    """Append-only JSONL of translated strings keyed by hash of (target, text)."""
+
+    def __init__(self, path: Union[str, Path] = DEFAULT_CACHE) -> None:
+        self.path = Path(path)
+        self._lock = threading.Lock()
+        self._entries: Dict[str, str] = {}
+        if self.path.exists():
+            for line in self.path.read_text(encoding="utf-8").splitlines():
+                try:
+                    rec = json.loads(line)
+                    self._entries[rec["k"]] = rec["t"]
+                except (ValueError, KeyError, TypeError):
+                    continue  # torn last line from an interrupted write
+
+    def get(self, text: str, target: str) -> Optional[str]:
+        return self._entries.get(text_key(text, target))
+
+    def put(self, pairs: Dict[str, str], target: str) -> None:
+        with self._lock:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            with open(self.path, "a", encoding="utf-8") as f:
+                for text, translated in pairs.items():
+                    key = text_key(text, target)
+                    self._entries[key] = translated
+                    f.write(json.dumps({"k": key, "t": translated}, ensure_ascii=False))
+                    f.write("\n")
+
+
+def translation_config(cfg: LLMConfig) -> LLMConfig:
+    # Translation is mechanical: use the configured cheap tier when there is one
+    overrides = cfg.translate or cfg.cascade.get("fast") or {}
+    return cfg.derive(dict(overrides))
+
+
+def translate_strings(
+    strings: List[str], target: str, cfg: LLMConfig, cache: TranslationCache
+) -> List[str]:
+    """Translate with one batched call for the strings not already cached.
+
+    If the call fails or returns the wrong number of strings, the originals are
+    kept (and not cached) so a report is still rendered.
+    """
+    misses = list(dict.fromkeys(s for s in strings if cache.get(s, target) is None))
+    if misses:
+        try:
+            translated = llm_translate_json(misses, target, translation_config(cfg))
+        except Exception:
+            translated = None
+        if translated is not None:
+            cache.put(dict(zip(misses, translated)), target)
+    return [cache.get(s, target) or s for s in strings]
+
+
+def localize_verdict(
+    payload: Dict[str, Any], target: str, cfg: LLMConfig, cache: TranslationCache
+) -> Dict[str, Any]:
+    """Copy of a verdict with its free-text fields translated into `target`.
+
+    When some strings could not be translated the copy keeps the source
+    `language` and is marked `translated: false`.
+    """
+    if str(payload.get("language") or "").lower() == target.lower():
+        return payload
+    strings = [str(s) for f in TRANSLATED_FIELDS for s in payload.get(f) or []]
+    translated = iter(translate_strings(strings, target, cfg, cache))
+    out = dict(payload)
+    for f in TRANSLATED_FIELDS:
+        out[f] = [next(translated) for _ in payload.get(f) or []]
+    if any(cache.get(s, target) is None for s in strings):
+        log.warning("translation to %s failed; keeping the original text", target)
+        out["translated"] = False
+    else:
+        out["language"] = target
+        out.pop("translated", None)
+    return out
@@ -0,0 +1,324 @@
+from __future__ import annotations
+
+import ctypes
+import ctypes.util
+import hashlib
+import json
+import os
+import select
+import struct
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, Optional, Set, Tuple
+
+from .context import EvaluationContext
+from .fastload import CACHE_DIR, load_yaml
+
+DEFAULT_STATE = CACHE_DIR / "watch" / "state.json"
+
+# <sys/inotify.h>
+IN_CLOSE_WRITE = 0x008
+IN_MOVED_FROM = 0x040
+IN_MOVED_TO = 0x080
+IN_CREATE = 0x100
+IN_DELETE = 0x200
+_EVENT = struct.Struct("iIII")
+
+
+class InotifyWatcher:
+    """Linux inotify through ctypes; yields changed *.yaml paths in the watched dirs."""
+
+    def __init__(self, dirs: Iterable[Path]) -> None:
+        libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6", use_errno=True)
+        self.fd = libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+        self.dirs: Dict[int, Path] = {}
+        # Editors save in place or via temp file + rename; catch both
+        mask = IN_CLOSE_WRITE | IN_MOVED_TO | IN_MOVED_FROM | IN_CREATE | IN_DELETE
+        for d in dirs:
+            wd = libc.inotify_add_watch(self.fd, os.fsencode(str(d)), mask)
+            if wd < 0:
+                os.close(self.fd)
+                raise OSError(ctypes.get_errno(), f"inotify_add_watch failed: {d}")
+            self.dirs[wd] = Path(d)
+
+    def wait(self, timeout: Optional[float]) -> Set[Path]:
+        deadline = None if timeout is None else time.monotonic() + timeout
+        changed: Set[Path] = set()
+        # Events for other files (editor swap files etc.) do not end the wait
+        while not changed:
+            left = None if deadline is None else max(0.0, deadline - time.monotonic())
+            ready, _, _ = select.select([self.fd], [], [], left)
+            if not ready:
+                break
+            data = os.read(self.fd, 65536)
+            offset = 0
+            while offset < len(data):
+                wd, _mask, _cookie, size = _EVENT.unpack_from(data, offset)
+                offset += _EVENT.size
+                raw = data[offset : offset + size].rstrip(b"\0")
+                offset += size
+                name = raw.decode("utf-8", "replace")
+                if wd in self.dirs and name.endswith(".yaml"):
+                    changed.add(self.dirs[wd] / name)
+        return changed
+
+    def close(self) -> None:
+        os.close(self.fd)
+
+
+class PollingWatcher:
+    """Portable fallback: compares (mtime, size) of *.yaml files every `interval_s`."""
+
+    def __init__(self, dirs: Iterable[Path], interval_s: float = 1.0) -> None:
+        self.dirs = [Path(d) for d in dirs]
+        self.interval_s = interval_s
+        self._seen = self._snapshot()
+
+    def _snapshot(self) -> Dict[Path, Tuple[int, int]]:
+        out: Dict[Path, Tuple[int, int]] = {}
+        for d in self.dirs:
+            for p in d.glob("*.yaml"):
+                try:
+                    st = p.stat()
+                except OSError:
+                    continue
+                out[p] = (st.st_mtime_ns, st.st_size)
+        return out
+
+    def wait(self, timeout: Optional[float]) -> Set[Path]:
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            now = self._snapshot()
+            changed = {
+                p
+                for p in now.keys() | self._seen.keys()
+                if now.get(p) != self._seen.get(p)
+            }
+            self._seen = now
+            if changed:
+                return changed
+            if deadline is not None and time.monotonic() >= deadline:
+                return set()
+            left = self.interval_s if deadline is None else deadline - time.monotonic()
+            time.sleep(max(0.0, min(self.interval_s, left)))
+
+    def close(self) -> None:
+        pass
+
+
+def make_watcher(
+    dirs: Iterable[Path], poll: bool = False, interval_s: float = 1.0
+) -> Any:
+    dirs = list(dirs)
+    if not poll:
+        try:
+            return InotifyWatcher(dirs)
+        except (OSError, AttributeError):
+            pass  # not Linux, or out of inotify watches
+    return PollingWatcher(dirs, interval_s)
+
+
+def collect(
+    watcher: Any, debounce_s: float, timeout: Optional[float] = None
+) -> Set[Path]:
+    """Block for a change, then keep gathering until saves go quiet for `debounce_s`."""
+    changed = watcher.wait(timeout)
+    while changed:
+        more = watcher.wait(debounce_s)
+        if not more:
+            break
+        changed |= more
+    return changed
+
+
+def file_hash(path: Path) -> Optional[str]:
+    try:
+        return hashlib.sha1(path.read_bytes()).hexdigest()
+    except OSError:
+        return None
+
+
+def _newer(a: Path, b: Path) -> bool:
+    try:
+        return a.stat().st_mtime_ns >= b.stat().st_mtime_ns
+    except OSError:
+        return False
+
+
+def rule_facts(path: Path) -> Dict[str, Any]:
+    data = load_yaml(path) or {}
+    return {
+        "id": str(data.get("id") or ""),
+        "keywords": [str(k).lower() for k in data.get("keywords") or []],
+    }
+
+
+def rule_affects(facts: Dict[str, Any], idea_text: str, redlines: List[str]) -> bool:
+    """Could a change to this rule change the idea's verdict?
+
+    Yes if the verdict cites the rule or the idea mentions one of its keywords;
+    a rule without keywords could apply anywhere.
+    """
+    if facts.get("id") in redlines:
+        return True
+    keywords = facts.get("keywords") or []
+    return not keywords or any(k in idea_text for k in keywords)
+
+
+class IncrementalEvaluator:
+    """Re-evaluates only ideas whose content changed or that a changed rule affects.
+
+    `state_path` remembers the hash each idea was last evaluated at, the
+    hash/id/keywords of each rule, and ideas whose last evaluation failed
+    (retried every cycle until one succeeds), so restarts also skip unchanged work.
+    """
+
+    def __init__(
+        self,
+        ctx: EvaluationContext,
+        state_path: Path = DEFAULT_STATE,
+        languages: Optional[List[str]] = None,
+        log: Callable[[str], None] = print,
+    ) -> None:
+        from .pipeline import Pipeline
+
+        self.ctx = ctx
+        self.pipeline = Pipeline(ctx=ctx)
+        self.state_path = Path(state_path)
+        self.languages = languages or []
+        self.log = log
+        self.state: Dict[str, Any] = {"ideas": {}, "rules": {}, "retry": []}
+        self._pending_rules: Dict[str, Any] = {}
+        if self.state_path.exists():
+            self.state.update(json.loads(self.state_path.read_text(encoding="utf-8")))
+
+    def _save(self) -> None:
+        self.state_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.state_path.with_suffix(".tmp")
+        tmp.write_text(
+            json.dumps(self.state, ensure_ascii=False, indent=2), encoding="utf-8"
+        )
+        os.replace(tmp, self.state_path)
+
+    def _changed_rules(self) -> List[Dict[str, Any]]:
+        old_rules = self.state["rules"]
+        current = {str(p): p for p in sorted(self.ctx.rules_dir.glob("*.yaml"))}
+        changes: List[Dict[str, Any]] = []
+        new_rules: Dict[str, Any] = {}
+        for key, path in current.items():
+            digest = file_hash(path)
+            old = old_rules.get(key)
+            if old and old["hash"] == digest:
+                new_rules[key] = old
+                continue
+            new_rules[key] = {"hash": digest, **rule_facts(path)}
+            changes.append(new_rules[key])
+            if old:
+                changes.append(old)  # the old keywords/id matter too
+        changes.extend(v for k, v in old_rules.items() if k not in current)
+        self._pending_rules = new_rules
+        return changes
+
+    def plan(self) -> List[Tuple[Path, str]]:
+        """(idea path, reason) for every idea that needs a fresh verdict."""
+        first_run = not self.state["rules"]
+        rule_changes = self._changed_rules()
+        if first_run:
+            rule_changes = []  # nothing to compare against yet
+        todo: List[Tuple[Path, str]] = []
+        ideas = sorted(self.ctx.ideas_dir.glob("*.yaml"))
+        for path in ideas:
+            digest = file_hash(path)
+            known = self.state["ideas"].get(str(path))
+            verdict_path = self.pipeline.verdict_path(path)
+            if str(path) in self.state["retry"]:
+                # Failed last time (possibly for a rule change already recorded)
+                todo.append((path, "retry"))
+                continue
+            if known is None and _newer(verdict_path, path):
+                # Evaluated by hand before watching started: adopt, don't redo
+                self.state["ideas"][str(path)] = known = digest
+            if known != digest:
+                todo.append((path, "changed"))
+                continue
+            if not verdict_path.exists():
+                todo.append((path, "no verdict"))
+                continue
+            if rule_changes:
+                text = path.read_text(encoding="utf-8").lower()
+                try:
+                    verdict = json.loads(verdict_path.read_text("utf-8"))
+                except ValueError:
+                    verdict = {}
+                redlines = [str(r) for r in verdict.get("redlines") or []]
+                hit = [c["id"] for c in rule_changes if rule_affects(c, text, redlines)]
+                if hit:
+                    todo.append((path, "rules " + ",".join(sorted(set(hit)))))
+        live = {str(p) for p in ideas}
+        self.state["ideas"] = {
+            k: v for k, v in self.state["ideas"].items() if k in live
+        }
+        self.state["retry"] = [k for k in self.state["retry"] if k in live]
+        return todo
+
+    def run_once(self) -> int:
+        """Evaluate and re-render everything `plan` selects; returns how many succeeded."""
+        try:
+            todo = self.plan()
+        except Exception as e:
+            self.log(f"[watch] skipped: {e}")  # e.g. a half-saved YAML
+            return 0
+        if self._pending_rules != self.state["rules"]:
+            # Rules changed on disk: drop the cached snapshot before evaluating
+            self.ctx.cache.pop("rules", None)
+            self.state["rules"] = self._pending_rules
+        done = 0
+        for path, reason in todo:
+            digest = file_hash(path)
+            try:
+                self.pipeline.evaluate(path)
+                if self.languages:
+                    outs = [
+                        r.path
+                        for r in self.pipeline.report_languages(path, self.languages)
+                    ]
+                else:
+                    outs = [self.pipeline.report(path).path]
+            except Exception as e:
+                # Not dropping its hash: that would let `plan` adopt the old verdict
+                if str(path) not in self.state["retry"]:
+                    self.state["retry"].append(str(path))
+                self.log(f"[watch] {path.name} ({reason}) failed: {e}")
+                continue
+            self.state["ideas"][str(path)] = digest
+            if str(path) in self.state["retry"]:
+                self.state["retry"].remove(str(path))
+            done += 1
+            self.log(f"[watch] {path.name} ({reason}) -> {', '.join(map(str, outs))}")
+        self._save()
+        return done
+
+    def run(
+        self,
+        poll: bool = False,
+        interval_s: float = 1.0,
+        debounce_s: float = 0.5,
+    ) -> None:
+        dirs = [self.ctx.ideas_dir, self.ctx.rules_dir]
+        for d in dirs:
+            d.mkdir(parents=True, exist_ok=True)
+        watcher = make_watcher(dirs, poll=poll, interval_s=interval_s)
+        self.log(
+            f"[watch] {type(watcher).__name__} on {', '.join(map(str, dirs))} (Ctrl-C to stop)"
+        )
+        try:
+            self.run_once()
+            while True:
+                if collect(watcher, debounce_s):
+                    self.run_once()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            watcher.close()
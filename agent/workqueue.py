@@ -0,0 +1,211 @@
+from __future__ import annotations
+
+import json
+import os
+import socket
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Tuple, Union
+
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS items (
+    key TEXT PRIMARY KEY,
+    payload TEXT NOT NULL,
+    state TEXT NOT NULL DEFAULT 'pending',
+    attempts INTEGER NOT NULL DEFAULT 0,
+    worker TEXT,
+    lease_until REAL,
+    error TEXT,
+    updated REAL
+);
+CREATE INDEX IF NOT EXISTS items_state ON items (state, lease_until);
+"""
+
+
+def default_worker_id() -> str:
+    return f"{socket.gethostname()}-{os.getpid()}"
+
+
+class WorkQueue:
+    """Leased work queue in one SQLite file, shared by any number of worker processes.
+
+    Items move pending -> leased -> done. A lease lasts `lease_s` seconds and is
+    extended by heartbeats; when a worker dies its leases expire and the items go
+    back to pending. Each lease counts as an attempt, and an item that fails or
+    expires `max_attempts` times is dead-lettered instead of retried forever.
+
+    Uses the default rollback journal rather than WAL, since WAL needs shared
+    memory and does not work for workers on different hosts sharing a filesystem.
+    """
+
+    def __init__(
+        self,
+        path: Union[str, Path],
+        lease_s: float = 300.0,
+        max_attempts: int = 3,
+        timeout_s: float = 60.0,
+    ) -> None:
+        self.path = Path(path)
+        self.lease_s = lease_s
+        self.max_attempts = max_attempts
+        self.timeout_s = timeout_s
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        db = sqlite3.connect(self.path, timeout=self.timeout_s)
+        try:
+            db.executescript(SCHEMA)
+        finally:
+            db.close()
+
+    @contextmanager
+    def _tx(self) -> Iterator[sqlite3.Connection]:
+        # A short-lived connection per call keeps this safe across threads and forks
+        db = sqlite3.connect(self.path, timeout=self.timeout_s, isolation_level=None)
+        try:
+            db.execute("BEGIN IMMEDIATE")
+            try:
+                yield db
+            except BaseException:
+                db.execute("ROLLBACK")
+                raise
+            db.execute("COMMIT")
+        finally:
+            db.close()
+
+    def enqueue(self, items: Iterable[Tuple[str, Dict[str, Any]]]) -> int:
+        """Add (key, payload) pairs; keys already queued (in any state) are kept as is."""
+        now = time.time()
+        with self._tx() as db:
+            before = db.total_changes
+            db.executemany(
+                "INSERT OR IGNORE INTO items (key, payload, updated) VALUES (?, ?, ?)",
+                (
+                    (key, json.dumps(payload, ensure_ascii=False), now)
+                    for key, payload in items
+                ),
+            )
+            return db.total_changes - before
+
+    def _expire(self, db: sqlite3.Connection, now: float) -> None:
+        db.execute(
+            "UPDATE items SET state = 'dead', worker = NULL, error = 'lease expired', "
+            "updated = ? WHERE state = 'leased' AND lease_until < ? AND attempts >= ?",
+            (now, now, self.max_attempts),
+        )
+        db.execute(
+            "UPDATE items SET state = 'pending', worker = NULL, updated = ? "
+            "WHERE state = 'leased' AND lease_until < ?",
+            (now, now),
+        )
+
+    def lease(self, worker: str, n: int = 1) -> List[Tuple[str, Dict[str, Any]]]:
+        """Claim up to `n` pending items (requeueing expired leases first)."""
+        now = time.time()
+        with self._tx() as db:
+            self._expire(db, now)
+            rows = db.execute(
+                "SELECT key, payload FROM items WHERE state = 'pending' "
+                "ORDER BY rowid LIMIT ?",
+                (n,),
+            ).fetchall()
+            db.executemany(
+                "UPDATE items SET state = 'leased', worker = ?, lease_until = ?, "
+                "attempts = attempts + 1, updated = ? WHERE key = ?",
+                ((worker, now + self.lease_s, now, key) for key, _ in rows),
+            )
+        return [(key, json.loads(payload)) for key, payload in rows]
+
+    def heartbeat(self, worker: str, keys: Iterable[str]) -> int:
+        """Extend the leases `worker` still holds; returns how many were extended."""
+        now = time.time()
+        with self._tx() as db:
+            before = db.total_changes
+            db.executemany(
+                "UPDATE items SET lease_until = ?, updated = ? "
+                "WHERE key = ? AND worker = ? AND state = 'leased'",
+                ((now + self.lease_s, now, key, worker) for key in keys),
+            )
+            return db.total_changes - before
+
+    def complete(self, worker: str, key: str) -> bool:
+        """Mark `key` done; False if the lease was lost (another worker may redo it)."""
+        with self._tx() as db:
+            cur = db.execute(
+                "UPDATE items SET state = 'done', worker = NULL, error = NULL, "
+                "updated = ? WHERE key = ? AND worker = ? AND state = 'leased'",
+                (time.time(), key, worker),
+            )
+            return cur.rowcount > 0
+
+    def fail(self, worker: str, key: str, error: str) -> str:
+        """Release a failed item: back to pending, or dead once out of attempts."""
+        with self._tx() as db:
+            db.execute(
+                "UPDATE items SET state = CASE WHEN attempts >= ? THEN 'dead' "
+                "ELSE 'pending' END, worker = NULL, error = ?, updated = ? "
+                "WHERE key = ? AND worker = ? AND state = 'leased'",
+                (self.max_attempts, error, time.time(), key, worker),
+            )
+            row = db.execute("SELECT state FROM items WHERE key = ?", (key,)).fetchone()
+        return str(row[0]) if row else "missing"
+
+    def requeue_dead(self) -> int:
+        """Give dead-lettered items a fresh set of attempts."""
+        with self._tx() as db:
+            cur = db.execute(
+                "UPDATE items SET state = 'pending', attempts = 0, updated = ? "
+                "WHERE state = 'dead'",
+                (time.time(),),
+            )
+            return cur.rowcount
+
+    def counts(self) -> Dict[str, int]:
+        with self._tx() as db:
+            self._expire(db, time.time())
+            rows = db.execute(
+                "SELECT state, COUNT(*) FROM items GROUP BY state"
+            ).fetchall()
+        counts = {"pending": 0, "leased": 0, "done": 0, "dead": 0}
+        counts.update({str(state): int(n) for state, n in rows})
+        return counts
+
+    def keys(self, state: str = "done") -> List[str]:
+        with self._tx() as db:
+            rows = db.execute(
+                "SELECT key FROM items WHERE state = ? ORDER BY rowid", (state,)
+            ).fetchall()
+        return [str(k) for (k,) in rows]
+
+    def dead_letters(self) -> List[Dict[str, Any]]:
+        with self._tx() as db:
+            rows = db.execute(
+                "SELECT key, attempts, error FROM items WHERE state = 'dead' "
+                "ORDER BY rowid"
+            ).fetchall()
+        return [{"row": k, "attempts": a, "error": e} for k, a, e in rows]
+
+    @contextmanager
+    def keep_alive(
+        self, worker: str, keys: List[str], interval_s: float = 0.0
+    ) -> Iterator[None]:
+        """Heartbeat `keys` from a background thread while the body runs."""
+        interval = interval_s or max(1.0, self.lease_s / 3)
+        stop = threading.Event()
+
+        def beat() -> None:
+            while not stop.wait(interval):
+                try:
+                    self.heartbeat(worker, keys)
+                except sqlite3.Error:
+                    pass  # transient lock contention; the next beat retries
+
+        thread = threading.Thread(target=beat, daemon=True)
+        thread.start()
+        try:
+            yield
+        finally:
+            stop.set()
+            thread.join()
@@ -2,13 +2,45 @@ from __future__ import annotations
 
 import argparse
 import json
+import time
 from pathlib import Path
-from typing import Dict, List, Any
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    TextIO,
+    Tuple,
+)
 
-import yaml
-
-from agent.schemas import Idea
+from agent import main as am
+from agent.schemas import Idea, Rule
+from agent.compact import load_idea_data
+from agent.llm import LLMConfig, load_model_config
 from agent.engine import load_rules, arbitrate_llm
+from agent.ruleexpr import check_rules
+from agent.budget import (
+    PRIORITIES,
+    BudgetScheduler,
+    compact_idea,
+    parse_deadline,
+    prioritized,
+)
+from agent.corpus import iter_ideas, row_slug
+from agent.shard import parse_shard, shard_name, shard_of
+from agent.stats import StatsAccumulator, collect_stats
+from agent.workqueue import WorkQueue, default_worker_id
+from agent.dedup import (
+    DEFAULT_INDEX,
+    DEFAULT_THRESHOLD,
+    NearDupIndex,
+    facts_digest,
+    rules_digest,
+    signature,
+)
 
 
 ROOT = Path(__file__).resolve().parents[1]
@@ -17,56 +49,101 @@ DEFAULT_MODEL_CFG = ROOT / "config" / "model.local.yaml"
 REPORTS_DIR = ROOT / "reports"
 
 
-def evaluate_one(idea_path: Path, rules_dir: Path, model_cfg: Path) -> Path:
-    with open(idea_path, "r", encoding="utf-8") as f:
-        idea = Idea(**(yaml.safe_load(f) or {}))
-    rules = load_rules(str(rules_dir))
-    verdict = arbitrate_llm(idea, rules, str(model_cfg))
-    slug = idea_path.stem
+def evaluate_idea(
+    idea: Idea,
+    slug: str,
+    rules: List[Rule],
+    model_cfg: Path,
+    overrides: Optional[Dict[str, Any]] = None,
+    local: Optional[Dict[str, Optional[bool]]] = None,
+) -> Tuple[Path, Dict[str, Any]]:
+    verdict = arbitrate_llm(
+        idea, rules, str(model_cfg), overrides=overrides, local=local
+    )
+    payload = (
+        verdict.model_dump() if hasattr(verdict, "model_dump") else verdict.__dict__
+    )
+    return write_verdict(slug, payload), payload
+
+
+def write_verdict(slug: str, payload: Dict[str, Any]) -> Path:
     REPORTS_DIR.mkdir(parents=True, exist_ok=True)
     out_json = REPORTS_DIR / f"{slug}.verdict.json"
     with open(out_json, "w", encoding="utf-8") as f:
-        payload = (
-            verdict.model_dump() if hasattr(verdict, "model_dump") else verdict.__dict__
-        )
         json.dump(payload, f, indent=2, ensure_ascii=False)
     return out_json
 
 
-def collect_stats(verdict_paths: List[Path]) -> Dict[str, Any]:
-    decisions: Dict[str, int] = {}
-    redline_counts: Dict[str, int] = {}
-    total = 0
-    for p in verdict_paths:
-        try:
-            data = json.loads(p.read_text(encoding="utf-8"))
-        except Exception:
-            continue
-        total += 1
-        d = str(data.get("decision", "caution")).lower()
-        decisions[d] = decisions.get(d, 0) + 1
-        for rl in data.get("redlines", []) or []:
-            redline_counts[rl] = redline_counts.get(rl, 0) + 1
-
-    decision_pct = {k: (v / total if total else 0.0) for k, v in decisions.items()}
-    redline_hit_rate = {
-        k: (v / total if total else 0.0) for k, v in redline_counts.items()
-    }
-
-    # Top-1 / Top-3 by hit-rate
-    sorted_rl = sorted(redline_hit_rate.items(), key=lambda x: x[1], reverse=True)
-    top1 = sorted_rl[:1]
-    top3 = sorted_rl[:3]
-
-    return {
-        "decision_counts": decisions,
-        "decision_pct": {k: float(f"{v:.4f}") for k, v in decision_pct.items()},
-        "redline_counts": redline_counts,
-        "redline_hit_rate": {k: float(f"{v:.4f}") for k, v in redline_hit_rate.items()},
-        "top1": {k: v for k, v in top1},
-        "top3": {k: v for k, v in top3},
-        "total": total,
-    }
+class NearDup:
+    """Reuse (or cheaply confirm) verdicts of near-duplicate ideas already evaluated."""
+
+    def __init__(
+        self, index: NearDupIndex, rules: List[Rule], model_cfg: Path, confirm: bool
+    ) -> None:
+        self.index = index
+        self.digest = rules_digest(rules)
+        self.model_cfg = model_cfg
+        self.confirm = confirm
+        self.reused = 0
+
+    def evaluate(
+        self,
+        idea: Idea,
+        slug: str,
+        rules: List[Rule],
+        overrides: Optional[Dict[str, Any]] = None,
+    ) -> Tuple[Path, Dict[str, Any], Optional[str]]:
+        """Returns (verdict path, payload, key of the reused idea or None)."""
+        sig = signature(idea)
+        facts = facts_digest(idea)
+        hit = self.index.reusable(sig, self.digest, facts)
+        if hit is not None:
+            key, _, src = hit
+            payload = json.loads(src.read_text(encoding="utf-8"))
+            if not self.confirm or self._confirmed(idea, payload):
+                out = write_verdict(slug, payload)
+                self.index.add(slug, sig, str(out), self.digest, facts)
+                self.reused += 1
+                return out, payload, key
+        out, payload = evaluate_idea(idea, slug, rules, self.model_cfg, overrides)
+        self.index.add(slug, sig, str(out), self.digest, facts)
+        return out, payload, None
+
+    def _confirmed(self, idea: Idea, payload: Dict[str, Any]) -> bool:
+        from agent.llm import llm_confirm_verdict, load_model_config
+
+        idea_d = idea.model_dump() if hasattr(idea, "model_dump") else idea.__dict__
+        return llm_confirm_verdict(
+            idea_d, payload, load_model_config(str(self.model_cfg))
+        )
+
+    def write_clusters(self) -> None:
+        clusters = self.index.clusters()
+        out = REPORTS_DIR / "_clusters.json"
+        out.write_text(
+            json.dumps(
+                {"reused": self.reused, "clusters": clusters},
+                indent=2,
+                ensure_ascii=False,
+            ),
+            encoding="utf-8",
+        )
+        print(
+            f"Near-duplicates: reused {self.reused}, {len(clusters)} clusters -> {out}"
+        )
+
+
+def evaluate_one(
+    idea_path: Path,
+    rules_dir: Path,
+    model_cfg: Path,
+    near_dup: Optional[NearDup] = None,
+) -> Path:
+    idea = load_idea(idea_path, load_model_config(str(model_cfg)))
+    rules = load_rules(str(rules_dir))
+    if near_dup is not None:
+        return near_dup.evaluate(idea, am.slugify(idea_path.stem), rules)[0]
+    return evaluate_idea(idea, am.slugify(idea_path.stem), rules, model_cfg)[0]
 
 
 def main() -> None:
@@ -84,28 +161,557 @@ def main() -> None:
         action="store_true",
         help="Compute and write stats JSON to reports/_stats.json",
     )
+    ap.add_argument(
+        "--corpus",
+        type=str,
+        help="Stream ideas from a JSONL/CSV/multi-document YAML export instead of --ideas-dir",
+    )
+    ap.add_argument(
+        "--near-dup",
+        choices=["off", "reuse", "confirm"],
+        default="off",
+        help="Reuse verdicts of near-duplicate ideas (confirm: one short LLM check first)",
+    )
+    ap.add_argument("--near-dup-threshold", type=float, default=DEFAULT_THRESHOLD)
+    ap.add_argument("--near-dup-index", type=str, default=str(DEFAULT_INDEX))
+    budget = ap.add_argument_group("budget (any of these enables the scheduler)")
+    budget.add_argument("--max-tokens", type=int, help="Total token budget for the run")
+    budget.add_argument("--max-usd", type=float, help="Total dollar budget for the run")
+    budget.add_argument(
+        "--deadline", type=str, help='Stop by then: "90m", "2h", "06:30" or ISO time'
+    )
+    budget.add_argument("--tpm", type=float, help="Max tokens per minute for the run")
+    budget.add_argument(
+        "--price-in", type=float, default=0.0, help="USD per 1k input tokens"
+    )
+    budget.add_argument(
+        "--price-out", type=float, default=0.0, help="USD per 1k output tokens"
+    )
+    budget.add_argument(
+        "--priority",
+        choices=PRIORITIES,
+        default="fifo",
+        help="Order of work (cost-based orders sort within --priority-window items)",
+    )
+    budget.add_argument("--priority-window", type=int, default=1000)
+    budget.add_argument(
+        "--degrade-at",
+        type=float,
+        default=0.2,
+        help="Switch to the cheap tier with compacted prompts below this budget fraction",
+    )
+    budget.add_argument(
+        "--degrade-model",
+        type=str,
+        help="Model for degraded evaluations (default: cascade.fast)",
+    )
+    ap.add_argument(
+        "--batch-job",
+        type=str,
+        help="Use the provider batch API with this work dir (re-run to resume polling)",
+    )
+    ap.add_argument(
+        "--batch-timeout",
+        type=float,
+        help="Stop polling after this many seconds; the job keeps running and can be resumed",
+    )
+    ap.add_argument(
+        "--shard",
+        type=str,
+        help="Evaluate only shard i of N (e.g. 2/4), partitioned by idea content; "
+        "outputs go to reports/shards/<i>-of-<N>/",
+    )
+    queue = ap.add_argument_group("work queue")
+    queue.add_argument(
+        "--queue",
+        type=str,
+        help="Enqueue the selected ideas into this SQLite file and work from it; "
+        "run the same command on more processes or hosts to add workers",
+    )
+    queue.add_argument(
+        "--workers", type=int, default=1, help="Worker processes to start here"
+    )
+    queue.add_argument(
+        "--lease-s",
+        type=float,
+        default=300.0,
+        help="Lease length; heartbeats extend it, crashed workers' items requeue after it",
+    )
+    queue.add_argument(
+        "--max-attempts",
+        type=int,
+        default=3,
+        help="Dead-letter an idea after this many failed or expired attempts",
+    )
     args = ap.parse_args()
 
+    if args.shard:
+        # Per-shard namespace so nodes can share a filesystem; combine with merge_shards.py
+        global REPORTS_DIR
+        i, n = parse_shard(args.shard)
+        REPORTS_DIR = REPORTS_DIR / "shards" / shard_name(i, n)
+
+    if args.corpus:
+        run_corpus(args)
+        return
+
     ideas_dir = Path(args.ideas_dir)
     idea_files = sorted(ideas_dir.glob(args.pattern))
+    if args.shard:
+        i, n = parse_shard(args.shard)
+        idea_files = [p for p in idea_files if shard_of(load_idea(p), n) == i]
     if not idea_files:
         print(f"No ideas matched under {ideas_dir} with pattern {args.pattern}")
         return
 
+    cfg = compact_config(args)
+    # Idea files keep the slug `report` looks verdicts up by, whatever the mode
+    items = ((p.stem, load_idea(p, cfg)) for p in idea_files)
+    if args.queue:
+        run_queue(args, items, slug=am.slugify)
+        return
+    if args.batch_job:
+        run_batch_job(args, items, slug=am.slugify)
+        return
+    if budget_enabled(args):
+        run_budgeted(args, items, total=len(idea_files), slug=am.slugify)
+        return
+
+    near_dup = make_near_dup(args, load_rules(args.rules_dir))
     out_paths: List[Path] = []
     for i, idea_path in enumerate(idea_files, start=1):
-        out = evaluate_one(idea_path, Path(args.rules_dir), Path(args.model_cfg))
+        out = evaluate_one(
+            idea_path, Path(args.rules_dir), Path(args.model_cfg), near_dup
+        )
         print(f"[{i}/{len(idea_files)}] -> {out}")
         out_paths.append(out)
 
+    if near_dup is not None:
+        near_dup.write_clusters()
     if args.stats:
-        stats = collect_stats(out_paths)
-        REPORTS_DIR.mkdir(parents=True, exist_ok=True)
-        stats_path = REPORTS_DIR / "_stats.json"
-        stats_path.write_text(
-            json.dumps(stats, indent=2, ensure_ascii=False), encoding="utf-8"
+        write_stats(collect_stats(out_paths))
+
+
+def make_near_dup(args: argparse.Namespace, rules: List[Rule]) -> Optional[NearDup]:
+    if args.near_dup == "off":
+        return None
+    index = NearDupIndex(args.near_dup_index, threshold=args.near_dup_threshold)
+    return NearDup(index, rules, Path(args.model_cfg), args.near_dup == "confirm")
+
+
+def load_idea(path: Path, cfg: Optional[LLMConfig] = None) -> Idea:
+    # With `compact:` in the model config, long ideas come from their cached compact form
+    return Idea(**load_idea_data(path, cfg))
+
+
+def compact_config(args: argparse.Namespace) -> Optional[LLMConfig]:
+    path = Path(args.model_cfg)
+    return load_model_config(str(path)) if path.exists() else None
+
+
+def budget_enabled(args: argparse.Namespace) -> bool:
+    return (
+        any(
+            getattr(args, k, None) is not None
+            for k in ("max_tokens", "max_usd", "deadline", "tpm")
         )
-        print(f"Stats written -> {stats_path}")
+        or getattr(args, "priority", "fifo") != "fifo"
+    )
+
+
+def degrade_overrides(args: argparse.Namespace) -> Dict[str, Any]:
+    from agent.llm import load_model_config
+
+    if args.degrade_model:
+        overrides: Dict[str, Any] = {"model": args.degrade_model}
+    else:
+        overrides = dict(load_model_config(args.model_cfg).cascade.get("fast") or {})
+    # A single plain call: no ensemble, sampling or decomposition fan-out
+    overrides.update(ensemble={}, self_consistency={}, decompose={})
+    return overrides
+
+
+def usage_since(before: Tuple[int, int]) -> Tuple[int, int]:
+    from agent.llm import USAGE
+
+    now = USAGE.totals()
+    return now[0] - before[0], now[1] - before[1]
+
+
+def run_budgeted(
+    args: argparse.Namespace,
+    items: Iterable[Tuple[str, Idea]],
+    total: Optional[int] = None,
+    rules: Optional[List[Rule]] = None,
+    errors: Optional[TextIO] = None,
+    slug: Callable[[str], str] = row_slug,
+) -> StatsAccumulator:
+    """Evaluate `items` under the token/dollar/deadline budget from `args`."""
+    from agent.llm import USAGE, estimate_tokens
+
+    rules = rules if rules is not None else load_rules(args.rules_dir)
+    near_dup = make_near_dup(args, rules)
+    cfg = load_model_config(args.model_cfg)
+    degraded = degrade_overrides(args)
+    scheduler = BudgetScheduler(
+        rules,
+        max_tokens=args.max_tokens,
+        max_usd=args.max_usd,
+        deadline=parse_deadline(args.deadline),
+        tpm=args.tpm,
+        usd_per_1k_in=args.price_in,
+        usd_per_1k_out=args.price_out,
+        degrade_at=args.degrade_at,
+        cfg=cfg,
+        degraded_cfg=cfg.derive(degraded),
+    )
+    acc = StatsAccumulator()
+    REPORTS_DIR.mkdir(parents=True, exist_ok=True)
+    deferred_path = REPORTS_DIR / "_deferred.jsonl"
+    seen = 0
+    with open(deferred_path, "w", encoding="utf-8") as deferred:
+        for key, idea in prioritized(
+            items, scheduler, args.priority, args.priority_window
+        ):
+            seen += 1
+            remaining = total - seen + 1 if total is not None else None
+            action = scheduler.decide(idea, remaining)
+            if action == "deferred":
+                # Paused, not dropped: deferred ideas can be fed to the next run
+                scheduler.record("deferred")
+                deferred.write(json.dumps({"row": key}, ensure_ascii=False) + "\n")
+                continue
+            overrides = degraded if action == "degraded" else None
+            if action == "degraded":
+                idea = compact_idea(idea)
+            est = scheduler.estimate(idea, action)
+            scheduler.wait_for_rate(est, action)
+            used_before = USAGE.totals()
+            reused: Optional[str] = None
+            try:
+                if near_dup is not None:
+                    out, payload, reused = near_dup.evaluate(
+                        idea, slug(key), rules, overrides
+                    )
+                else:
+                    out, payload = evaluate_idea(
+                        idea, slug(key), rules, Path(args.model_cfg), overrides
+                    )
+            except Exception as e:
+                # Failed calls are billed too
+                scheduler.charge(*usage_since(used_before))
+                if errors is None:
+                    raise
+                errors.write(
+                    json.dumps({"row": key, "error": str(e)}, ensure_ascii=False) + "\n"
+                )
+                continue
+            used_in, used_out = usage_since(used_before)
+            if not used_in and not used_out and reused is None:
+                # The client reported no usage: charge the fan-out estimate
+                used_in = est
+                used_out = estimate_tokens(json.dumps(payload, ensure_ascii=False))
+                used_out *= scheduler.calls[action][1]
+            scheduler.record(action, used_in, used_out)
+            acc.add(payload)
+            print(f"[{seen}] {key} ({action}) -> {out}")
+    budget_summary = scheduler.summary()
+    print(f"Budget: {json.dumps(budget_summary)} (deferred -> {deferred_path})")
+    if near_dup is not None:
+        near_dup.write_clusters()
+    if args.stats:
+        write_stats({**acc.result(), "budget": budget_summary})
+    return acc
+
+
+def run_batch_job(
+    args: argparse.Namespace,
+    items: Iterable[Tuple[str, Idea]],
+    rules: Optional[List[Rule]] = None,
+    errors: Optional[TextIO] = None,
+    slug: Callable[[str], str] = row_slug,
+) -> Optional[StatsAccumulator]:
+    """Submit all items as one provider batch job, or resume the job in --batch-job."""
+    from agent.batchjob import BatchRun, backend_for
+    from agent.engine import (
+        apply_local_checks,
+        coerce_verdict,
+        idea_payload,
+        merge_fired,
+        rules_payload,
+    )
+    from agent.llm import load_model_config
+
+    rules = rules if rules is not None else load_rules(args.rules_dir)
+    cfg = load_model_config(args.model_cfg)
+    run = BatchRun(args.batch_job, backend_for(cfg))
+    acc = StatsAccumulator()
+
+    def requests() -> Iterator[Tuple[str, Dict[str, Any], Any, List[str]]]:
+        # The same local pre-check as arbitrate_llm, so both modes agree
+        rows = ((key, idea, None) for key, idea in items)
+        for key, idea, _, checks in with_local_checks(rows, rules):
+            decided, kept, fired = apply_local_checks(checks or {}, rules)
+            if decided is not None:
+                payload = (
+                    decided.model_dump()
+                    if hasattr(decided, "model_dump")
+                    else decided.__dict__
+                )
+                acc.add(payload)
+                print(f"{key} -> {write_verdict(slug(key), payload)} (local)")
+                continue
+            yield key, idea_payload(idea), rules_payload(kept), [r.id for r in fired]
+
+    n = run.prepare(requests(), rules_payload(rules), cfg)
+    max_attempts = int(cfg.batch.get("max_attempts", 3))
+    retried = run.retry_pending(max_attempts)
+    if retried:
+        print(
+            f"Resubmitting {retried} failed requests (attempt {run.state['attempt']})"
+        )
+    job_id = run.submit()
+    print(f"Batch job {job_id}: {n} requests (state: {run.state_path})")
+    status = run.wait(
+        poll_s=float(cfg.batch.get("poll_s", 30)),
+        max_poll_s=float(cfg.batch.get("max_poll_s", 600)),
+        timeout_s=args.batch_timeout,
+    )
+    if status != "completed":
+        print(f"Batch job {job_id} is {status}; re-run with --batch-job to resume.")
+        return None
+
+    done: List[str] = []
+    for key, data, error in run.results():
+        if data is None:
+            # Left pending: a later --batch-job run resubmits it
+            if errors is not None:
+                errors.write(
+                    json.dumps({"row": key, "error": error}, ensure_ascii=False) + "\n"
+                )
+            continue
+        done.append(key)
+        verdict, _ = coerce_verdict(data, run.allowed_for(key))
+        merge_fired(verdict, run.fired_for(key))
+        payload = (
+            verdict.model_dump() if hasattr(verdict, "model_dump") else verdict.__dict__
+        )
+        out = write_verdict(slug(key), payload)
+        acc.add(payload)
+        print(f"{key} -> {out}")
+        if len(done) >= 100:
+            run.mark_done(done)
+            done = []
+    run.mark_done(done)
+    run.mark_collected()
+    failed = run.pending()
+    if failed and int(run.state.get("attempt", 1)) < max_attempts:
+        print(f"{len(failed)} requests failed; re-run with --batch-job to retry them.")
+    elif failed:
+        print(f"{len(failed)} requests still failed after {max_attempts} attempts.")
+    if args.stats:
+        write_stats(acc.result())
+    return acc
+
+
+def run_queue(
+    args: argparse.Namespace,
+    items: Iterable[Tuple[str, Idea]],
+    slug: Callable[[str], str] = row_slug,
+) -> None:
+    """Enqueue `items` (idempotent) and work the queue until nothing is left."""
+    import multiprocessing
+
+    queue = WorkQueue(args.queue, lease_s=args.lease_s, max_attempts=args.max_attempts)
+    added = queue.enqueue((key, idea.model_dump()) for key, idea in items)
+    print(f"Queue {args.queue}: {added} new, {json.dumps(queue.counts())}")
+    if args.workers > 1:
+        procs = [
+            multiprocessing.Process(
+                target=queue_worker,
+                args=(args, f"{default_worker_id()}-{n}", REPORTS_DIR, slug),
+            )
+            for n in range(args.workers)
+        ]
+        for proc in procs:
+            proc.start()
+        for proc in procs:
+            proc.join()
+    else:
+        queue_worker(args, default_worker_id(), REPORTS_DIR, slug)
+
+    dead = queue.dead_letters()
+    REPORTS_DIR.mkdir(parents=True, exist_ok=True)
+    dead_path = REPORTS_DIR / "_dead.jsonl"
+    with open(dead_path, "w", encoding="utf-8") as f:
+        for rec in dead:
+            f.write(json.dumps(rec, ensure_ascii=False) + "\n")
+    print(f"Queue {args.queue}: {json.dumps(queue.counts())} (dead -> {dead_path})")
+    if args.stats:
+        done = [REPORTS_DIR / f"{slug(k)}.verdict.json" for k in queue.keys()]
+        write_stats(collect_stats(done))
+
+
+def queue_worker(
+    args: argparse.Namespace,
+    worker: str,
+    reports_dir: Path,
+    slug: Callable[[str], str] = row_slug,
+) -> None:
+    global REPORTS_DIR
+    REPORTS_DIR = reports_dir
+    queue = WorkQueue(args.queue, lease_s=args.lease_s, max_attempts=args.max_attempts)
+    rules = load_rules(args.rules_dir)
+    near_dup = make_near_dup(args, rules)
+    n = 0
+    while True:
+        leased = queue.lease(worker)
+        if not leased:
+            # Others may still hold leases; stay around to pick them up if they crash
+            if queue.counts()["leased"] == 0:
+                break
+            time.sleep(min(5.0, args.lease_s / 4))
+            continue
+        for key, idea_d in leased:
+            with queue.keep_alive(worker, [key]):
+                try:
+                    idea = Idea(**idea_d)
+                    if near_dup is not None:
+                        out, _, _ = near_dup.evaluate(idea, slug(key), rules)
+                    else:
+                        out, _ = evaluate_idea(
+                            idea, slug(key), rules, Path(args.model_cfg)
+                        )
+                except Exception as e:
+                    state = queue.fail(worker, key, str(e))
+                    print(f"[{worker}] {key} failed ({state}): {e}")
+                    continue
+            if queue.complete(worker, key):
+                n += 1
+                print(f"[{worker}] [{n}] {key} -> {out}")
+    if near_dup is not None:
+        near_dup.write_clusters()
+
+
+def write_stats(stats: Dict[str, Any]) -> None:
+    REPORTS_DIR.mkdir(parents=True, exist_ok=True)
+    stats_path = REPORTS_DIR / "_stats.json"
+    stats_path.write_text(
+        json.dumps(stats, indent=2, ensure_ascii=False), encoding="utf-8"
+    )
+    print(f"Stats written -> {stats_path}")
+
+
+def run_corpus(args: argparse.Namespace) -> None:
+    rules = load_rules(args.rules_dir)
+    near_dup = make_near_dup(args, rules)
+    acc = StatsAccumulator()
+    REPORTS_DIR.mkdir(parents=True, exist_ok=True)
+    errors_path = REPORTS_DIR / "_errors.jsonl"
+    n_ok = n_err = 0
+    if args.queue:
+        with open(errors_path, "w", encoding="utf-8") as errors:
+            run_queue(args, valid_rows(corpus_rows(args), errors))
+        return
+    if args.batch_job:
+        with open(errors_path, "w", encoding="utf-8") as errors:
+            run_batch_job(args, valid_rows(corpus_rows(args), errors), rules, errors)
+        return
+    if budget_enabled(args):
+        with open(errors_path, "w", encoding="utf-8") as errors:
+            run_budgeted(
+                args,
+                valid_rows(corpus_rows(args), errors),
+                rules=rules,
+                errors=errors,
+            )
+        return
+    with open(errors_path, "w", encoding="utf-8") as errors:
+        for row_id, idea, error, local in with_local_checks(corpus_rows(args), rules):
+            if idea is None:
+                # Row-level problems are logged and skipped, never fatal
+                n_err += 1
+                errors.write(
+                    json.dumps({"row": row_id, "error": error}, ensure_ascii=False)
+                    + "\n"
+                )
+                continue
+            try:
+                if near_dup is not None:
+                    out, payload, _ = near_dup.evaluate(idea, row_slug(row_id), rules)
+                else:
+                    out, payload = evaluate_idea(
+                        idea, row_slug(row_id), rules, Path(args.model_cfg), local=local
+                    )
+            except Exception as e:
+                n_err += 1
+                errors.write(
+                    json.dumps({"row": row_id, "error": str(e)}, ensure_ascii=False)
+                    + "\n"
+                )
+                continue
+            n_ok += 1
+            acc.add(payload)
+            print(f"[{n_ok}] {row_id} -> {out}")
+    print(f"Evaluated {n_ok} rows, {n_err} errors -> {errors_path}")
+    if near_dup is not None:
+        near_dup.write_clusters()
+    if args.stats:
+        write_stats(acc.result())
+
+
+def corpus_rows(
+    args: argparse.Namespace,
+) -> Iterator[Tuple[str, Any, Optional[str]]]:
+    rows = iter_ideas(args.corpus)
+    if not args.shard:
+        yield from rows
+        return
+    i, n = parse_shard(args.shard)
+    for row_id, idea, error in rows:
+        # Invalid rows have no content to hash; place them by row id instead
+        owner = shard_of(idea if idea is not None else {"row": row_id}, n)
+        if owner == i:
+            yield row_id, idea, error
+
+
+def with_local_checks(
+    rows: Iterable[Tuple[str, Any, Optional[str]]],
+    rules: List[Rule],
+    chunk: int = 1024,
+) -> Iterator[Tuple[str, Any, Optional[str], Optional[Dict[str, Optional[bool]]]]]:
+    """Attach rule `expr` results to each row, evaluated a chunk of rows at a time."""
+    if not any(r.expr for r in rules):
+        for row_id, idea, error in rows:
+            yield row_id, idea, error, None
+        return
+    buf: List[Tuple[str, Any, Optional[str]]] = []
+    for row in rows:
+        buf.append(row)
+        if len(buf) >= chunk:
+            yield from _checked(buf, rules)
+            buf = []
+    yield from _checked(buf, rules)
+
+
+def _checked(
+    buf: List[Tuple[str, Any, Optional[str]]], rules: List[Rule]
+) -> Iterator[Tuple[str, Any, Optional[str], Optional[Dict[str, Optional[bool]]]]]:
+    checks = iter(check_rules([idea for _, idea, _ in buf if idea is not None], rules))
+    for row_id, idea, error in buf:
+        yield row_id, idea, error, next(checks) if idea is not None else None
+
+
+def valid_rows(
+    rows: Iterable[Tuple[str, Any, Optional[str]]], errors: TextIO
+) -> Iterator[Tuple[str, Idea]]:
+    for row_id, idea, error in rows:
+        if idea is None:
+            errors.write(
+                json.dumps({"row": row_id, "error": error}, ensure_ascii=False) + "\n"
+            )
+            continue
+        yield row_id, idea
 
 
 if __name__ == "__main__":
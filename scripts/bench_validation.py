@@ -0,0 +1,79 @@
+from __future__ import annotations
+
+import argparse
+import gc
+import sys
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, List
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from agent.schemas import Idea, validate_idea_records, validate_ideas  # noqa: E402
+
+
+def make_rows(n: int) -> List[Dict[str, Any]]:
+    rows = []
+    for i in range(n):
+        rows.append(
+            {
+                "intent": f"Idea {i}: on-site assistant for electricians",
+                "user": "field electricians",
+                "scenario": "diagnose a fault with voice + camera",
+                "triggers": "downtime is expensive",
+                "alts": "phone a senior colleague",
+                "assumptions": ["workers wear headsets", "sites have coverage"],
+                "risks": ["safety liability"],
+            }
+        )
+    # A sprinkling of invalid rows to exercise the error path
+    for i in range(0, n, 1000):
+        rows[i] = {"intent": rows[i]["intent"]}
+    return rows
+
+
+def timed(label: str, n: int, fn: Callable[[], Any]) -> float:
+    # Keep results alive and pause GC so every path pays the same allocation cost
+    gc.collect()
+    gc.disable()
+    try:
+        start = time.perf_counter()
+        result = fn()
+        elapsed = time.perf_counter() - start
+    finally:
+        gc.enable()
+    del result
+    print(f"{label:<28} {elapsed * 1000:8.1f} ms  {n / elapsed:>10,.0f} rows/s")
+    return elapsed
+
+
+def per_row(rows: List[Dict[str, Any]]) -> List[Any]:
+    out: List[Any] = []
+    for row in rows:
+        try:
+            out.append(Idea(**row))
+        except Exception:
+            out.append(None)
+    return out
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description="Benchmark Idea validation paths.")
+    ap.add_argument("-n", type=int, default=100_000, help="Number of rows")
+    args = ap.parse_args()
+
+    rows = make_rows(args.n)
+    # Warm up the compiled adapters so the timings exclude one-off schema builds
+    validate_ideas(rows[:10])
+    validate_idea_records(rows[:10])
+
+    base = timed("Idea(**row) per row", args.n, lambda: per_row(rows))
+    bulk = timed("validate_ideas (bulk)", args.n, lambda: validate_ideas(rows))
+    recs = timed("validate_idea_records", args.n, lambda: validate_idea_records(rows))
+    print(f"speedup: bulk x{base / bulk:.1f}, records x{base / recs:.1f}")
+
+
+if __name__ == "__main__":
+    main()
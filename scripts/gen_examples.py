@@ -1,6 +1,5 @@
 from __future__ import annotations
 
-import subprocess
 import sys
 from pathlib import Path
 import os
@@ -8,30 +7,27 @@ import os
 
 ROOT = Path(__file__).resolve().parents[1]
 os.environ.setdefault("IC_LANG", "zh-CN")
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
 
+from agent.pipeline import Pipeline  # noqa: E402
 
-def run(cmd: list[str]) -> None:
-    proc = subprocess.run(cmd, cwd=ROOT, text=True)
-    if proc.returncode != 0:
-        raise SystemExit(proc.returncode)
 
-
-def ensure_demo(idea_rel: str) -> None:
+def ensure_demo(pipeline: Pipeline, idea_rel: str) -> None:
     idea = ROOT / idea_rel
-    slug = idea.stem
-    verdict = ROOT / "reports" / f"{slug}.verdict.json"
     # Only run evaluate if verdict is missing (avoids requiring LLM/network)
-    if not verdict.exists():
-        run([sys.executable, "-m", "agent.main", "evaluate", "--idea", str(idea)])
+    if not pipeline.verdict_path(idea).exists():
+        print(str(pipeline.evaluate(idea).path))
     # Always render report for consistency
-    run([sys.executable, "-m", "agent.main", "report", "--idea", str(idea)])
+    print(str(pipeline.report(idea).path))
 
 
 def main() -> None:
+    pipeline = Pipeline()
     # English demo
-    ensure_demo("ideas/demo-idea.yaml")
+    ensure_demo(pipeline, "ideas/demo-idea.yaml")
     # Chinese demo
-    ensure_demo("ideas/一句话-想法.yaml")
+    ensure_demo(pipeline, "ideas/一句话-想法.yaml")
     print("Demo examples available under reports/: demo-idea.*, 一句话-想法.*")
 
 
@@ -6,6 +6,8 @@ import os
 import yaml
 
 ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
 
 
 def main() -> None:
@@ -42,30 +44,11 @@ def main() -> None:
     out_dir = ROOT / "reports"
     out_dir.mkdir(parents=True, exist_ok=True)
 
-    # Call the CLI evaluate to produce a verdict JSON
-    import subprocess
+    # Evaluate in-process to produce a verdict JSON
+    from agent.pipeline import Pipeline
 
-    proc = subprocess.run(
-        [
-            sys.executable,
-            "-m",
-            "agent.main",
-            "evaluate",
-            "--idea",
-            str(idea_path),
-            "--model-cfg",
-            str(cfg_path),
-        ],
-        cwd=ROOT,
-        capture_output=True,
-        text=True,
-    )
-    if proc.returncode != 0:
-        print(proc.stdout)
-        print(proc.stderr)
-        raise SystemExit(proc.returncode)
-
-    verdict_path = Path(proc.stdout.strip().splitlines()[-1])
+    result = Pipeline(model_cfg=cfg_path).evaluate(idea_path)
+    verdict_path = result.path
     assert verdict_path.exists(), f"verdict file not found: {verdict_path}"
     data = json.loads(verdict_path.read_text(encoding="utf-8"))
 
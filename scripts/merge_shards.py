@@ -0,0 +1,39 @@
+from __future__ import annotations
+
+import argparse
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from agent.shard import merge_shards  # noqa: E402
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(
+        description="Merge batch_evaluate --shard outputs into one verdict store."
+    )
+    ap.add_argument(
+        "shards",
+        nargs="*",
+        help="Shard output dirs (default: every dir under reports/shards)",
+    )
+    ap.add_argument("--out", type=str, default=str(ROOT / "reports"))
+    args = ap.parse_args()
+
+    dirs = [Path(p) for p in args.shards] or [
+        p for p in (ROOT / "reports" / "shards").glob("*") if p.is_dir()
+    ]
+    if not dirs:
+        raise SystemExit("No shard directories found")
+    stats = merge_shards(dirs, Path(args.out))
+    print(
+        f"Merged {len(dirs)} shards: {stats['total']} verdicts, "
+        f"{len(stats['conflicts'])} conflicts -> {args.out}"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -9,6 +9,8 @@ import yaml
 
 ROOT = Path(__file__).resolve().parents[1]
 os.environ.setdefault("IC_LANG", "zh-CN")
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
 IDEAS_DIR = ROOT / "ideas"
 
 
@@ -54,29 +56,21 @@ def write_idea(data: dict) -> Path:
 
 
 def run_pipeline(idea_path: Path) -> Path:
-    import subprocess
+    from agent.pipeline import Pipeline
 
+    pipeline = Pipeline()
     # Evaluate (will require model config if verdict not present)
-    proc = subprocess.run(
-        [sys.executable, "-m", "agent.main", "evaluate", "--idea", str(idea_path)],
-        cwd=ROOT,
-        text=True,
-    )
-    if proc.returncode != 0:
-        print("[warn] 评估阶段失败，尝试继续渲染报告（若已有 verdict）")
+    try:
+        pipeline.evaluate(idea_path)
+    except Exception as e:
+        print(f"[warn] 评估阶段失败（{e}），尝试继续渲染报告（若已有 verdict）")
 
     # Report
-    proc2 = subprocess.run(
-        [sys.executable, "-m", "agent.main", "report", "--idea", str(idea_path)],
-        cwd=ROOT,
-        capture_output=True,
-        text=True,
-    )
-    if proc2.returncode != 0:
-        print(proc2.stdout)
-        print(proc2.stderr)
-        raise SystemExit(proc2.returncode)
-    out_md = Path(proc2.stdout.strip().splitlines()[-1])
+    try:
+        out_md = pipeline.report(idea_path).path
+    except Exception as e:
+        print(f"[error] 报告渲染失败：{e}")
+        raise SystemExit(1)
     print(str(out_md))
     return out_md
 
@@ -0,0 +1,104 @@
+from __future__ import annotations
+
+import json
+import sys
+import tempfile
+from pathlib import Path
+from typing import List
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+RULES = [{"id": "RL-001", "condition": "c", "severity": "critical", "rationale": "r"}]
+
+
+def respond(system: str, user: str) -> str:
+    if "flaky" in user:
+        raise RuntimeError("upstream 500")
+    decision = "deny" if "impossible" in user else "go"
+    return json.dumps({"decision": decision, "conf_level": 0.9, "redlines": []})
+
+
+def assert_resumable_run() -> None:
+    from agent.batchjob import BatchRun, LocalBatchBackend
+    from agent.llm import LLMConfig
+
+    tmp = Path(tempfile.mkdtemp())
+    cfg = LLMConfig({"model": "m"})
+    backend = LocalBatchBackend(root=tmp / "jobs", respond=respond, polls_until_done=4)
+    items = [
+        ("a", {"intent": "impossible FTL drive"}),
+        ("b", {"intent": "plain idea"}),
+        ("c", {"intent": "flaky idea"}),
+    ]
+    run = BatchRun(tmp / "work", backend)
+    assert run.prepare(iter(items), RULES, cfg) == 3
+    job_id = run.submit()
+
+    sleeps: List[float] = []
+    # Gives up before the job finishes; the job itself keeps going
+    assert run.wait(poll_s=1, timeout_s=0.5, sleep=sleeps.append) == "in_progress"
+
+    # A fresh process resumes from state.json: no new requests, no re-submit
+    run = BatchRun(tmp / "work", backend)
+    assert run.prepare(iter([]), RULES, cfg) == 3 and run.submit() == job_id
+    assert run.wait(poll_s=1, max_poll_s=1.2, sleep=sleeps.append) == "completed"
+    assert sleeps == [1, 1.2], sleeps
+
+    results = {k: (d or {}, e) for k, d, e in run.results()}
+    assert results["a"][0]["decision"] == "deny" and results["b"][0]["decision"] == "go"
+    assert results["c"][0] == {} and "500" in str(results["c"][1])
+
+    run.mark_done(["a", "b"])
+    run = BatchRun(tmp / "work", backend)
+    assert [k for k, _, _ in run.results()] == ["c"]
+    # Interrupted before every result was handled: nothing is resubmitted yet
+    assert run.retry_pending(max_attempts=3) == 0 and run.submit() == job_id
+
+    # Collected: the errored request stays pending and gets a job of its own
+    run.mark_collected()
+    assert run.pending() == ["c"]
+    flaky = {"calls": 0}
+
+    def recovering(system: str, user: str) -> str:
+        flaky["calls"] += 1
+        if flaky["calls"] == 1:
+            raise RuntimeError("upstream 500")
+        return respond(system, user.replace("flaky", "steady"))
+
+    backend = LocalBatchBackend(root=tmp / "jobs", respond=recovering)
+    for attempt in (2, 3):
+        run = BatchRun(tmp / "work", backend)
+        assert run.retry_pending(max_attempts=3) == 1
+        assert run.state["attempt"] == attempt and run.submit() != job_id
+        assert run.wait(poll_s=1, sleep=sleeps.append) == "completed"
+        batch = list(run.results())
+        assert [k for k, _, _ in batch] == ["c"]
+        run.mark_done(k for k, d, _ in batch if d is not None)
+        run.mark_collected()
+    assert run.pending() == [] and flaky["calls"] == 2
+
+    # Bounded: after max_attempts jobs nothing more is resubmitted
+    run.state["done"] = ["r0", "r1"]
+    assert run.retry_pending(max_attempts=3) == 0
+
+
+def assert_openai_backend_with_endpoints() -> None:
+    from agent.batchjob import OpenAIBatchBackend
+    from agent.llm import LLMConfig
+
+    # `endpoints:` routes synchronous calls; the batch backend still builds its client
+    cfg = LLMConfig(
+        {"api_key": "sk-test", "model": "m", "endpoints": [{"model": "a"}, "b"]}
+    )
+    assert OpenAIBatchBackend(cfg)._client.batches is not None
+
+
+def main() -> None:
+    assert_resumable_run()
+    assert_openai_backend_with_endpoints()
+    print("Batch job checks passed.")
+
+
+if __name__ == "__main__":
+    main()
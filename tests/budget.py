@@ -0,0 +1,200 @@
+from __future__ import annotations
+
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+
+def idea(intent: str, n_assumptions: int = 1):
+    from agent.schemas import Idea
+
+    return Idea(
+        intent=intent,
+        user="u",
+        scenario="s",
+        triggers="t",
+        alts="a",
+        assumptions=[f"assumption {i}" for i in range(n_assumptions)],
+    )
+
+
+def assert_deadline() -> None:
+    from agent.budget import parse_deadline
+
+    now = 1_700_000_000.0
+    assert parse_deadline("90m", now) == now + 5400
+    at = parse_deadline("06:30", now)
+    assert at is not None and now < at <= now + 86400
+    assert parse_deadline(None) is None
+
+
+def assert_decisions() -> None:
+    from agent.budget import BudgetScheduler
+
+    sched = BudgetScheduler([], max_tokens=10_000, max_output_tokens=800)
+    small = idea("short")
+    big = idea("long " * 2000, n_assumptions=40)
+    assert sched.decide(small) == "full"
+
+    sched.record("full", 7_000, 500)
+    # Below the degrade threshold only cheap, compacted calls are made
+    sched.degrade_at = 0.3
+    assert sched.decide(small) == "degraded"
+    # The full prompt no longer fits but the compacted one does
+    sched.degrade_at = 0.0
+    assert sched.decide(big) == "degraded"
+
+    sched.record("full", 2_000, 0)
+    assert sched.decide(small) == "deferred"
+
+    late = BudgetScheduler([], deadline=time.time() - 1)
+    assert late.decide(small) == "deferred"
+
+
+def assert_priority() -> None:
+    from agent.budget import BudgetScheduler, compact_idea, prioritized
+
+    sched = BudgetScheduler([])
+    items = [("a", idea("x" * 400)), ("b", idea("x")), ("c", idea("x" * 40))]
+    order = [k for k, _ in prioritized(items, sched, "cheap-first")]
+    assert order == ["b", "c", "a"], order
+    order = [k for k, _ in prioritized(items, sched, "expensive-first", window=2)]
+    assert order == ["a", "b", "c"], order
+
+    compacted = compact_idea(idea("y" * 1000, n_assumptions=10))
+    assert len(compacted.intent) <= 301 and len(compacted.assumptions) == 3
+
+
+def assert_per_run_tpm() -> None:
+    from agent.budget import BudgetScheduler
+
+    fast = BudgetScheduler([], tpm=600_000, max_output_tokens=0)
+    fast.wait_for_rate(1_000)
+    # A later run's --tpm applies as given, not what an earlier run left behind
+    slow = BudgetScheduler([], tpm=600, max_output_tokens=0)
+    assert slow.limiter is not None and fast.limiter is not None
+    assert slow.limiter.state_path != fast.limiter.state_path
+    with slow.limiter._locked() as state:
+        assert state["tpm"] == 600 and state["tokens"] == 600, state
+
+
+def assert_fan_out() -> None:
+    from types import SimpleNamespace
+
+    from agent.budget import BudgetScheduler, evaluation_calls
+    from agent.llm import LLMConfig, UsageMeter
+
+    ensemble = {"models": ["a", "b", {"model": "c", "weight": 2}]}
+    assert evaluation_calls(LLMConfig({"ensemble": ensemble}), 5) == (3, 3)
+    assert evaluation_calls(LLMConfig({"self_consistency": {"n": 5}}), 5) == (1, 5)
+    decompose = {"enabled": True, "group_size": 2}
+    assert evaluation_calls(LLMConfig({"decompose": decompose}), 5) == (3, 3)
+    # Escalation runs both cascade tiers
+    cascade = LLMConfig({"cascade": {"fast": {"model": "m"}}, "ensemble": ensemble})
+    assert evaluation_calls(cascade, 5) == (4, 4)
+
+    single = BudgetScheduler([], max_tokens=10_000)
+    fanned = BudgetScheduler(
+        [],
+        max_tokens=10_000,
+        cfg=LLMConfig({"ensemble": ensemble}),
+        degraded_cfg=LLMConfig({}),
+    )
+    small = idea("short")
+    assert fanned.estimate(small) == 3 * single.estimate(small)
+    assert fanned.estimate(small, "degraded") == single.estimate(small)
+    # Room for one call but not for three: only the single-call tier runs
+    single.record("full", 7_000, 0)
+    fanned.record("full", 7_000, 0)
+    assert single.decide(small) == "full" and fanned.decide(small) == "degraded"
+
+    meter = UsageMeter()
+    meter.add({"prompt_tokens": 10, "completion_tokens": 5})
+    meter.add(SimpleNamespace(prompt_tokens=1, completion_tokens=None))
+    meter.add(None)
+    assert meter.totals() == (11, 5)
+
+
+def assert_degrade_overrides() -> None:
+    import tempfile
+    from argparse import Namespace
+
+    sys.path.insert(0, str(ROOT / "scripts"))
+    from batch_evaluate import degrade_overrides
+
+    cfg = Path(tempfile.mkdtemp()) / "model.yaml"
+    cfg.write_text(
+        "model: m\nself_consistency: {n: 5}\ncascade: {fast: {model: f}}\n",
+        encoding="utf-8",
+    )
+    overrides = degrade_overrides(Namespace(degrade_model=None, model_cfg=str(cfg)))
+    assert overrides["model"] == "f"
+    assert not overrides["self_consistency"] and not overrides["ensemble"]
+    assert not overrides["decompose"]
+
+
+def assert_idea_slugs() -> None:
+    import contextlib
+    import io
+    import shutil
+    import tempfile
+
+    sys.path.insert(0, str(ROOT / "scripts"))
+    import agent.engine as engine
+    import batch_evaluate
+    from agent import main as am
+
+    tmp = Path(tempfile.mkdtemp())
+    (tmp / "ideas").mkdir()
+    name = "一个电工辅助实时多模态agnet助手，语音交互。.yaml"
+    shutil.copy(ROOT / "ideas" / name, tmp / "ideas" / "Field Helper，语音.yaml")
+    cfg = tmp / "model.yaml"
+    cfg.write_text("model: m\n", encoding="utf-8")
+
+    def fake_verdict(idea, rules, cfg, allowed_redline_ids=None, correction_note=None):
+        return {"decision": "caution", "conf_level": 0.6, "reasons": ["r"]}
+
+    base = [
+        "batch_evaluate",
+        "--ideas-dir",
+        str(tmp / "ideas"),
+        "--model-cfg",
+        str(cfg),
+    ]
+    expected = f"{am.slugify('Field Helper，语音')}.verdict.json"
+    original = (engine.llm_verdict_json, batch_evaluate.REPORTS_DIR, sys.argv)
+    engine.llm_verdict_json = fake_verdict  # type: ignore[assignment]
+    try:
+        # Plain and budgeted runs write the verdict where `report` looks for it
+        for n, extra in enumerate([[], ["--max-tokens", "1000000"]]):
+            batch_evaluate.REPORTS_DIR = tmp / f"reports-{n}"
+            sys.argv = base + extra
+            with contextlib.redirect_stdout(io.StringIO()):
+                batch_evaluate.main()
+            written = sorted(
+                p.name for p in (tmp / f"reports-{n}").glob("*.verdict.json")
+            )
+            assert written == [expected], (extra, written)
+    finally:
+        engine.llm_verdict_json = original[0]  # type: ignore[assignment]
+        batch_evaluate.REPORTS_DIR = original[1]
+        sys.argv = original[2]
+        shutil.rmtree(tmp, ignore_errors=True)
+
+
+def main() -> None:
+    assert_deadline()
+    assert_decisions()
+    assert_priority()
+    assert_per_run_tpm()
+    assert_fan_out()
+    assert_degrade_overrides()
+    assert_idea_slugs()
+    print("Budget checks passed.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,55 @@
+from __future__ import annotations
+
+import sys
+from pathlib import Path
+from typing import Any, Dict, List
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+CASCADE = {"fast": {"model": "cheap"}, "min_conf": 0.75}
+
+
+def run(fast_answer: Dict[str, Any]) -> Any:
+    import agent.engine as engine
+    from agent.llm import LLMConfig
+
+    calls: List[str] = []
+
+    def fake_verdict(idea, rules, cfg, allowed_redline_ids=None, correction_note=None):
+        calls.append(cfg.model)
+        if cfg.model == "cheap":
+            return fast_answer
+        return {"decision": "deny", "conf_level": 0.9, "redlines": ["RL-001"]}
+
+    original = engine.llm_verdict_json
+    engine.llm_verdict_json = fake_verdict  # type: ignore[assignment]
+    try:
+        cfg = LLMConfig({"model": "strong", "cascade": CASCADE})
+        verdict = engine._cascade({}, [], cfg, ["RL-001"])
+    finally:
+        engine.llm_verdict_json = original  # type: ignore[assignment]
+    return verdict, calls
+
+
+def assert_cascade() -> None:
+    verdict, calls = run({"decision": "go", "conf_level": 0.9})
+    assert (verdict.tier, calls) == ("fast", ["cheap"]), (verdict, calls)
+
+    for answer in (
+        {"decision": "go", "conf_level": 0.5},  # low confidence
+        {"decision": "caution", "conf_level": 0.9},  # borderline
+        {"decision": "deny", "conf_level": 0.9, "redlines": ["RL-999"]},  # repair
+    ):
+        verdict, calls = run(answer)
+        assert verdict.tier == "strong" and verdict.decision == "deny", answer
+        assert calls[0] == "cheap" and calls[-1] == "strong", calls
+
+
+def main() -> None:
+    assert_cascade()
+    print("Cascade checks passed.")
+
+
+if __name__ == "__main__":
+    main()
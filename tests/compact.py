@@ -0,0 +1,132 @@
+from __future__ import annotations
+
+import json
+import shutil
+import sys
+import tempfile
+from pathlib import Path
+from typing import Any, Dict, List
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+LONG_IDEA = next((ROOT / "ideas").glob("为现场电工*.yaml"))
+
+
+def assert_local_steps() -> None:
+    from agent.compact import clip, dedup_items
+
+    items = [
+        "噪音大",
+        "现场噪音大，语音识别困难",
+        "  ",
+        "现场噪音大，语音识别困难。",
+        "Data privacy",
+        "data privacy!",
+        "电工",
+    ]
+    stated = ["一线现场电工维护技术人员"]
+    assert dedup_items(items, stated) == ["现场噪音大，语音识别困难", "Data privacy"]
+    assert clip("第一句话说完了。第二句很长", 10) == "第一句话说完了。"
+    assert clip("no sentence end here at all", 10) == "no sentenc…"
+
+
+def assert_cached_sidecar() -> None:
+    import agent.compact as compact
+    from agent.llm import LLMConfig
+
+    tmp = Path(tempfile.mkdtemp())
+    idea_path = tmp / "long.yaml"
+    shutil.copy(LONG_IDEA, idea_path)
+    short_path = tmp / "short.yaml"
+    shutil.copy(ROOT / "ideas" / "一句话-想法.yaml", short_path)
+
+    calls: List[Dict[str, Any]] = []
+
+    def fake_summary(idea: Dict[str, Any], target: int, cfg) -> Dict[str, Any]:
+        calls.append(idea)
+        return {
+            "intent": "电工实时多模态故障诊断助手",
+            "user": "一线电工",
+            "scenario": "双手被占用时语音+视觉提问",
+            "triggers": "故障报警、陌生操作",
+            "alts": "纯语音助手、AR 眼镜、离线知识库",
+            "assumptions": ["现场网络可用", "现场网络可用", "能获取设备文档"],
+            "risks": ["嘈杂环境识别率", "过度依赖"],
+        }
+
+    cfg = LLMConfig({"compact": {"threshold_tokens": 300, "target_tokens": 150}})
+    original = compact.llm_compact_idea_json
+    compact.llm_compact_idea_json = fake_summary  # type: ignore[assignment]
+    try:
+        # Short ideas are passed through untouched, with no sidecar
+        assert compact.load_idea_data(short_path, cfg) == compact.load_yaml(short_path)
+        assert not compact.sidecar_path(short_path).exists()
+
+        data = compact.load_idea_data(idea_path, cfg)
+        side = json.loads(compact.sidecar_path(idea_path).read_text("utf-8"))
+        assert len(calls) == 1 and side["method"] == "llm"
+        assert data["assumptions"] == ["现场网络可用", "能获取设备文档"]
+        assert side["tokens"]["before"] > 300 >= side["tokens"]["after"]
+
+        # Re-evaluations reuse the stored form; an edit invalidates it
+        assert compact.load_idea_data(idea_path, cfg) == data and len(calls) == 1
+        idea_path.write_text(
+            idea_path.read_text("utf-8") + "- 新增风险\n", encoding="utf-8"
+        )
+        compact.load_idea_data(idea_path, cfg)
+        assert len(calls) == 2
+
+        # Without the summarizer: local dedup, then a hard bound
+        local = LLMConfig(
+            {"compact": {"summarize": False, "max_chars": 40, "max_items": 2}}
+        )
+        data = compact.load_idea_data(idea_path, local)
+        assert len(calls) == 2 and len(data["risks"]) == 2
+        assert all(len(data[k]) <= 41 for k in compact.TEXT_FIELDS)
+        side = json.loads(compact.sidecar_path(idea_path).read_text("utf-8"))
+        assert side["method"] == "local"
+    finally:
+        compact.llm_compact_idea_json = original  # type: ignore[assignment]
+
+
+def assert_pipeline_uses_compact() -> None:
+    import agent.engine as engine
+    from agent.context import EvaluationContext
+    from agent.pipeline import Pipeline
+
+    tmp = Path(tempfile.mkdtemp())
+    idea_path = tmp / "long.yaml"
+    shutil.copy(LONG_IDEA, idea_path)
+    cfg_path = tmp / "model.yaml"
+    cfg_path.write_text(
+        "model: m\ncompact:\n  summarize: false\n  max_chars: 30\n", encoding="utf-8"
+    )
+    seen: List[Dict[str, Any]] = []
+
+    def fake_verdict(idea, rules, cfg, allowed_redline_ids=None, correction_note=None):
+        seen.append(idea)
+        return {"decision": "go", "conf_level": 0.9}
+
+    ctx = EvaluationContext.create(cfg_path, language="zh-CN", reports_dir=tmp)
+    original = engine.llm_verdict_json
+    engine.llm_verdict_json = fake_verdict  # type: ignore[assignment]
+    try:
+        Pipeline(ctx=ctx).evaluate(idea_path)
+    finally:
+        engine.llm_verdict_json = original  # type: ignore[assignment]
+    assert len(seen[0]["scenario"]) <= 31, seen[0]["scenario"]
+    # The report still renders the idea as written
+    report = Pipeline(ctx=ctx).report(idea_path).path.read_text("utf-8")
+    assert "AI助手实时分析电路图" in report
+
+
+def main() -> None:
+    assert_local_steps()
+    assert_cached_sidecar()
+    assert_pipeline_uses_compact()
+    print("Compaction checks passed.")
+
+
+if __name__ == "__main__":
+    main()
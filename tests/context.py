@@ -0,0 +1,89 @@
+from __future__ import annotations
+
+import os
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+from typing import Dict
+
+import yaml
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+IDEA = {
+    "intent": "x",
+    "user": "u",
+    "scenario": "s",
+    "triggers": "t",
+    "alts": "a",
+    "assumptions": ["a1"],
+    "risks": [],
+}
+
+
+def assert_concurrent_languages() -> None:
+    import agent.engine as engine
+    from agent.context import EvaluationContext
+    from agent.pipeline import Pipeline
+
+    seen: Dict[str, str] = {}
+
+    def fake_verdict(idea, rules, cfg, allowed_redline_ids=None, correction_note=None):
+        time.sleep(0.05)  # overlap the two evaluations
+        seen[threading.current_thread().name] = cfg.language
+        return {"decision": "go", "conf_level": 0.9, "reasons": ["ok"]}
+
+    tmp = Path(tempfile.mkdtemp())
+    (tmp / "idea.yaml").write_text(yaml.safe_dump(IDEA), encoding="utf-8")
+    env_before = os.environ.get("IC_LANG")
+    base = EvaluationContext.create(
+        ROOT / "config" / "model.yaml", rules=[], reports_dir=tmp / "reports"
+    )
+    reports: Dict[str, str] = {}
+
+    def work(lang: str) -> None:
+        ctx = base.with_changes(language=lang, reports_dir=tmp / lang)
+        pipeline = Pipeline(ctx=ctx)
+        pipeline.evaluate(tmp / "idea.yaml")
+        reports[lang] = pipeline.report(tmp / "idea.yaml").path.read_text("utf-8")
+
+    original = engine.llm_verdict_json
+    engine.llm_verdict_json = fake_verdict  # type: ignore[assignment]
+    try:
+        threads = [
+            threading.Thread(target=work, args=(lang,), name=lang)
+            for lang in ("en", "zh-CN")
+        ]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+    finally:
+        engine.llm_verdict_json = original  # type: ignore[assignment]
+
+    assert seen == {"en": "en", "zh-CN": "zh-CN"}, seen
+    en = (ROOT / "templates" / "report.en.md").read_text("utf-8")
+    zh = (ROOT / "templates" / "report.zh-CN.md").read_text("utf-8")
+    assert reports["en"].startswith(en.splitlines()[0]), reports["en"][:80]
+    assert reports["zh-CN"].startswith(zh.splitlines()[0]), reports["zh-CN"][:80]
+    assert os.environ.get("IC_LANG") == env_before
+    # Copies share the loaded config; a different model config starts fresh
+    assert "llm_config" in base.cache
+    assert not base.with_changes(model_cfg=ROOT / "x.yaml").cache
+    # One lock guards one cache, however many copies share it
+    copy = base.with_changes(language="en").with_changes(reports_dir=ROOT)
+    assert copy.cache is base.cache and copy._lock is base._lock
+    fresh = base.with_changes(rules_dir=ROOT / "rules")
+    assert fresh._lock is not base._lock
+
+
+def main() -> None:
+    assert_concurrent_languages()
+    print("Context checks passed.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,60 @@
+from __future__ import annotations
+
+import sys
+import tempfile
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+IDEA = {
+    "intent": "i",
+    "user": "u",
+    "scenario": "s",
+    "triggers": "t",
+    "alts": "a",
+}
+
+
+def assert_formats() -> None:
+    import json
+
+    from agent.corpus import iter_ideas
+
+    tmp = Path(tempfile.mkdtemp())
+    jsonl = tmp / "ideas.jsonl"
+    jsonl.write_text(
+        json.dumps({**IDEA, "id": "a-1"})
+        + "\n{not json}\n"
+        + json.dumps({"intent": "missing fields"})
+        + "\n",
+        encoding="utf-8",
+    )
+    rows = list(iter_ideas(jsonl, chunk_size=2))
+    assert [r[0] for r in rows] == ["a-1", "ideas-2", "ideas-3"], rows
+    assert rows[0][1] is not None and rows[1][1] is None and rows[2][1] is None
+
+    csv_path = tmp / "ideas.csv"
+    csv_path.write_text(
+        "intent,user,scenario,triggers,alts,assumptions\ni,u,s,t,a,x; y\n",
+        encoding="utf-8",
+    )
+    (row,) = list(iter_ideas(csv_path))
+    assert row[1].assumptions == ["x", "y"], row
+
+    yaml_path = tmp / "ideas.yaml"
+    yaml_path.write_text(
+        "intent: i\nuser: u\nscenario: s\ntriggers: t\nalts: a\n---\n- not a map\n",
+        encoding="utf-8",
+    )
+    rows = list(iter_ideas(yaml_path))
+    assert rows[0][1] is not None and rows[1][2] == "document is not a mapping"
+
+
+def main() -> None:
+    assert_formats()
+    print("Corpus checks passed.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,174 @@
+from __future__ import annotations
+
+import os
+import shutil
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, List
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+CORE = ROOT / "config" / "rules" / "core"
+
+
+def assert_forwarding(tmp: Path) -> None:
+    import agent.engine as engine
+    from agent import main as am
+    from agent.daemon import EvaluationServer, forward, forward_ping
+
+    sock = tmp / "d.sock"
+    server = EvaluationServer(sock)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+
+    idea = tmp / f"daemon-test-{os.getpid()}.yaml"
+    shutil.copy(ROOT / "ideas" / "一句话-想法.yaml", idea)
+    cfg = tmp / "model.yaml"
+    cfg.write_text("model: m\n", encoding="utf-8")
+    seen: List[Dict[str, Any]] = []
+
+    def fake_verdict(idea, rules, cfg, allowed_redline_ids=None, correction_note=None):
+        seen.append(idea)
+        return {"decision": "caution", "conf_level": 0.6, "reasons": ["r"]}
+
+    outputs: List[Path] = []
+    original = engine.llm_verdict_json
+    engine.llm_verdict_json = fake_verdict  # type: ignore[assignment]
+    os.environ["IC_SOCKET"] = str(sock)
+    os.environ.pop("IC_NO_DAEMON", None)
+    try:
+        assert forward_ping(sock)
+        assert forward("ping", {}) == "pong"
+
+        out = forward(
+            "evaluate", {"idea": str(idea), "model_cfg": str(cfg), "lang": "en"}
+        )
+        assert out is not None and out.endswith(".verdict.json") and len(seen) == 1
+        outputs.append(Path(out))
+        report = forward("report", {"idea": str(idea), "lang": "en"})
+        assert report is not None
+        outputs.append(Path(report))
+        assert "caution" in Path(report).read_text(encoding="utf-8")
+
+        # Errors come back as exceptions, not as output
+        try:
+            forward("bogus", {})
+        except RuntimeError as e:
+            assert "Unknown command" in str(e)
+        else:
+            raise AssertionError("unknown command accepted")
+
+        # Opted out, or nothing listening: the caller runs locally
+        os.environ["IC_NO_DAEMON"] = "1"
+        assert forward("ping", {}) is None
+        del os.environ["IC_NO_DAEMON"]
+        os.environ["IC_SOCKET"] = str(tmp / "absent.sock")
+        assert forward("ping", {}) is None
+    finally:
+        engine.llm_verdict_json = original  # type: ignore[assignment]
+        os.environ.pop("IC_SOCKET", None)
+        os.environ.pop("IC_NO_DAEMON", None)
+        server.shutdown()
+        server.server_close()
+        for path in outputs:
+            path.unlink(missing_ok=True)
+        (am.REPORTS_DIR / f"{idea.stem}.verdict.json").unlink(missing_ok=True)
+    assert not forward_ping(sock)
+
+
+def assert_client_language(tmp: Path) -> None:
+    import agent.engine as engine
+    from agent import main as am
+    from agent.cli import _daemon_args
+    from agent.daemon import EvaluationServer, forward
+
+    sock = tmp / "lang.sock"
+    server = EvaluationServer(sock)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    idea = tmp / f"daemon-lang-{os.getpid()}.yaml"
+    shutil.copy(ROOT / "ideas" / "一句话-想法.yaml", idea)
+    cfg = tmp / "model.yaml"
+    cfg.write_text("model: m\nlanguage: zh-CN\n", encoding="utf-8")
+    seen: List[str] = []
+
+    def fake_verdict(idea, rules, cfg, allowed_redline_ids=None, correction_note=None):
+        seen.append(cfg.language)
+        return {"decision": "caution", "conf_level": 0.6, "reasons": ["r"]}
+
+    outputs: List[Path] = []
+    original = engine.llm_verdict_json
+    engine.llm_verdict_json = fake_verdict  # type: ignore[assignment]
+    env_before = os.environ.get("IC_LANG")
+    os.environ["IC_SOCKET"] = str(sock)
+    os.environ.pop("IC_NO_DAEMON", None)
+    try:
+        # IC_LANG set on the client only: the payload carries it
+        os.environ["IC_LANG"] = "en"
+        args = _daemon_args(idea)
+        assert args["lang"] == "en" and Path(args["model_cfg"]).is_absolute()
+        os.environ.pop("IC_LANG")
+        out = forward("evaluate", {**args, "model_cfg": str(cfg)})
+        report = forward("report", {**args, "model_cfg": str(cfg)})
+        assert out is not None and report is not None
+        outputs += [Path(out), Path(report)]
+        assert seen == ["en"], seen
+        assert Path(report).read_text("utf-8").startswith("# One-Page Verdict")
+
+        # Unset on the client: the daemon's own IC_LANG is not used either
+        args = _daemon_args(idea)
+        assert args["lang"] is None
+        os.environ["IC_LANG"] = "en"
+        forward("evaluate", {**args, "model_cfg": str(cfg)})
+        assert seen == ["en", "zh-CN"], seen
+    finally:
+        engine.llm_verdict_json = original  # type: ignore[assignment]
+        os.environ.pop("IC_SOCKET", None)
+        if env_before is None:
+            os.environ.pop("IC_LANG", None)
+        else:
+            os.environ["IC_LANG"] = env_before
+        server.shutdown()
+        server.server_close()
+        for path in outputs:
+            path.unlink(missing_ok=True)
+        (am.REPORTS_DIR / f"{idea.stem}.verdict.json").unlink(missing_ok=True)
+
+
+def assert_rules_reload(tmp: Path) -> None:
+    from agent.daemon import RulesSnapshot
+
+    rules_dir = tmp / "rules"
+    rules_dir.mkdir()
+    shutil.copy(CORE / "01_tech_impossibility.yaml", rules_dir / "01.yaml")
+    snapshot = RulesSnapshot(rules_dir)
+    first = snapshot.get()
+    assert [r.id for r in first] == ["RL-001"]
+    assert snapshot.get() is first  # unchanged files: no reload
+
+    text = (rules_dir / "01.yaml").read_text(encoding="utf-8")
+    time.sleep(0.01)
+    (rules_dir / "01.yaml").write_text(
+        text.replace("RL-001", "RL-101"), encoding="utf-8"
+    )
+    assert [r.id for r in snapshot.get()] == ["RL-101"]
+    shutil.copy(CORE / "02_unit_economics.yaml", rules_dir / "02.yaml")
+    assert [r.id for r in snapshot.get()] == ["RL-101", "RL-002"]
+
+
+def main() -> None:
+    tmp = Path(tempfile.mkdtemp())
+    try:
+        assert_forwarding(tmp)
+        assert_client_language(tmp)
+        assert_rules_reload(tmp)
+    finally:
+        shutil.rmtree(tmp, ignore_errors=True)
+    print("Daemon checks passed.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+from __future__ import annotations
+
+import sys
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, List
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+RULES: List[Dict[str, Any]] = [
+    {"id": "RL-low", "severity": "low", "decision": "caution"},
+    {"id": "RL-crit", "severity": "critical", "decision": "deny", "next_steps": ["x"]},
+    {"id": "RL-high", "severity": "high", "decision": "caution"},
+]
+
+
+def assert_grouping() -> None:
+    from agent.decompose import group_rules
+
+    groups = group_rules(RULES, group_size=2)
+    assert [[r["id"] for r in g] for g in groups] == [
+        ["RL-crit", "RL-high"],
+        ["RL-low"],
+    ]
+
+
+def assert_early_deny() -> None:
+    from agent.decompose import group_rules, run_checks
+
+    release = threading.Event()
+
+    def check(group: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        rule = group[0]
+        if rule["id"] != "RL-crit":
+            release.wait(5)
+        fires = rule["id"] == "RL-crit"
+        return [{"rule_id": rule["id"], "fires": fires, "conf": 0.9, "reason": "r"}]
+
+    start = time.monotonic()
+    data = run_checks(group_rules(RULES), check, max_workers=4, deny_conf=0.8)
+    release.set()
+    assert time.monotonic() - start < 2, "did not exit early"
+    assert data["decision"] == "deny" and data["redlines"] == ["RL-crit"], data
+    assert data["next_steps"] == ["x"] and data["decomposed"]["early_exit"] == "RL-crit"
+
+
+def assert_merge() -> None:
+    from agent.decompose import group_rules, run_checks
+
+    def check(group: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        rule = group[0]
+        if rule["id"] == "RL-low":
+            raise RuntimeError("timeout")
+        fires = rule["id"] == "RL-high"
+        return [{"rule_id": rule["id"], "fires": fires, "conf": 0.6, "reason": "r"}]
+
+    data = run_checks(group_rules(RULES), check, max_workers=4, deny_conf=0.8)
+    assert data["decision"] == "caution" and data["redlines"] == ["RL-high"], data
+    # A failed group is surfaced so the cascade can escalate
+    assert "LLM parsing fallback" in data["reasons"]
+
+
+def main() -> None:
+    assert_grouping()
+    assert_early_deny()
+    assert_merge()
+    print("Decompose checks passed.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,75 @@
+from __future__ import annotations
+
+import sys
+import tempfile
+from pathlib import Path
+from typing import Any, Dict
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+BASE: Dict[str, Any] = {
+    "intent": "为现场电工提供实时、多模态（语音、视觉）的故障诊断和操作指导",
+    "user": "一线现场电工、维护技术人员",
+    "scenario": "电工双手被占用，通过语音提问，助手实时分析电路图并给出分步指令",
+    "assumptions": ["现场有稳定的网络连接", "电工愿意使用语音交互"],
+}
+
+
+def assert_similarity() -> None:
+    from agent.dedup import shingles, signature, similarity
+
+    assert shingles(["电工 agent"]) == {"电 工", "工 agent"}
+    near = {**BASE, "intent": BASE["intent"] + "，提高维修效率"}
+    other = {
+        "intent": "Two-sided marketplace for expert answers",
+        "user": "Consumers who need instant expert advice",
+        "scenario": "Ask any question and get an authoritative answer",
+    }
+    assert similarity(signature(BASE), signature(near)) >= 0.8
+    assert similarity(signature(BASE), signature(other)) < 0.2
+
+
+def assert_index() -> None:
+    from agent.dedup import NearDupIndex, signature
+
+    tmp = Path(tempfile.mkdtemp())
+    verdict = tmp / "a.verdict.json"
+    verdict.write_text("{}", encoding="utf-8")
+    index = NearDupIndex(tmp / "index.jsonl")
+    assert index.add("a", signature(BASE), str(verdict), "r1") == "a"
+    near = {**BASE, "intent": BASE["intent"] + "，提高维修效率"}
+    assert index.add("b", signature(near)) == "a"
+    assert index.add("c", signature({"intent": "unrelated idea"})) == "c"
+
+    # Reloaded from the append-only log
+    index = NearDupIndex(tmp / "index.jsonl")
+    assert len(index) == 3 and index.clusters() == {"a": ["a", "b"]}
+    hit = index.reusable(signature(near), "r1")
+    assert hit is not None and hit[0] == "a", hit
+    # Verdicts produced under other rules are never reused
+    assert index.reusable(signature(near), "r2") is None
+
+    # Same text, different facts: `expr` rules may decide differently
+    from agent.dedup import facts_digest
+
+    cheap = facts_digest({**BASE, "facts": {"unit_cost": 1}})
+    dear = facts_digest({**BASE, "facts": {"unit_cost": 900}})
+    assert cheap != dear and facts_digest(BASE) == facts_digest({**BASE, "facts": {}})
+    index.add("d", signature(BASE), str(verdict), "r1", cheap)
+    assert index.reusable(signature(BASE), "r1", dear) is None
+    hit = index.reusable(signature(BASE), "r1", cheap)
+    assert hit is not None and hit[0] == "d", hit
+
+    index.compact()
+    assert len((tmp / "index.jsonl").read_text(encoding="utf-8").splitlines()) == 4
+
+
+def main() -> None:
+    assert_similarity()
+    assert_index()
+    print("Dedup checks passed.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,86 @@
+from __future__ import annotations
+
+import sys
+import threading
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+
+def assert_aggregation() -> None:
+    from agent.ensemble import aggregate_verdicts
+
+    results = [
+        ({"decision": "deny", "conf_level": 0.9, "redlines": ["RL-001"]}, 1.0),
+        ({"decision": "deny", "conf_level": 0.7, "redlines": ["RL-001"]}, 1.0),
+        ({"decision": "go", "conf_level": 0.8, "redlines": ["RL-008"]}, 1.0),
+    ]
+    vote = aggregate_verdicts(results, "vote")
+    assert vote["decision"] == "deny"
+    assert vote["redlines"] == ["RL-001"]
+    # mean agreeing conf 0.8 scaled by 2/3 agreement
+    assert vote["conf_level"] == 0.53, vote["conf_level"]
+
+    strict = aggregate_verdicts(results, "strictest")
+    assert strict["decision"] == "deny"
+    assert strict["redlines"] == ["RL-001", "RL-008"]
+
+
+def assert_quorum_early_exit() -> None:
+    from agent.ensemble import fan_out
+    from agent.llm import LLMConfig
+
+    release = threading.Event()
+    base = LLMConfig({"model": "a"})
+    members = [(base.derive({"model": m}), 1.0) for m in ["a", "b", "slow"]]
+
+    def call(cfg: LLMConfig) -> dict:
+        if cfg.model == "slow":
+            release.wait(5)
+        return {"decision": "go", "conf_level": 0.8}
+
+    results = fan_out(members, call, "vote", quorum=2)
+    release.set()
+    assert len(results) == 2, results
+
+
+def assert_weighted_quorum() -> None:
+    from agent.ensemble import aggregate_verdicts, fan_out, quorum_reached
+    from agent.llm import LLMConfig
+
+    base = LLMConfig({"model": "a"})
+    members = [
+        (base.derive({"model": "heavy"}), 3.0),
+        (base.derive({"model": "b"}), 1.0),
+        (base.derive({"model": "c"}), 1.0),
+    ]
+
+    def call(cfg: LLMConfig) -> dict:
+        if cfg.model == "heavy":
+            time.sleep(0.2)  # the heavy member answers last
+            return {"decision": "deny", "conf_level": 0.9}
+        return {"decision": "go", "conf_level": 0.8}
+
+    # Two "go" votes reach the count quorum, but weight 3 is still pending
+    results = fan_out(members, call, "vote")
+    assert len(results) == 3, results
+    assert aggregate_verdicts(results, "vote")["decision"] == "deny"
+
+    go = ({"decision": "go"}, 1.0)
+    assert not quorum_reached([go, go], "vote", 2, pending_weight=3.0)
+    assert quorum_reached([go, go], "vote", 2, pending_weight=1.0)
+    # A tie would go to the stricter pending decision
+    assert not quorum_reached([go, go], "vote", 2, pending_weight=2.0)
+
+
+def main() -> None:
+    assert_aggregation()
+    assert_quorum_early_exit()
+    assert_weighted_quorum()
+    print("Ensemble checks passed.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,200 @@
+from __future__ import annotations
+
+import json
+import shutil
+import sys
+import tempfile
+from pathlib import Path
+from types import SimpleNamespace
+from typing import Any, Dict, List
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+NOTES = """\
+电工现场故障诊断依赖经验，新手排查 PLC 报警平均耗时 40 分钟。
+
+Field technicians rarely carry laptops; voice input is preferred on site.
+
+咖啡店会员复购率与积分活动相关，与本想法无关。
+"""
+
+RECORDS = [
+    {"text": "《电工作业安全规程》要求带电作业须两人协同。", "type": "primary"},
+    {"text": "Smart glasses shipments grew 20% in 2024.", "provenance": "IDC 2024"},
+    {"text": "外卖骑手路线规划与天气的关系。"},
+]
+
+
+def build_corpus(tmp: Path) -> Path:
+    corpus = tmp / "corpus"
+    corpus.mkdir()
+    (corpus / "notes.md").write_text(NOTES, encoding="utf-8")
+    with open(corpus / "records.jsonl", "w", encoding="utf-8") as f:
+        for rec in RECORDS:
+            f.write(json.dumps(rec, ensure_ascii=False) + "\n")
+        f.write("not json\n")
+    return corpus
+
+
+def assert_tokenize() -> None:
+    from agent.evidence import tokenize
+
+    assert tokenize("电工故障 PLC-200 a") == ["电工", "工故", "故障", "plc", "200"]
+    assert tokenize("Voice, 语") == ["voice", "语"]
+
+
+def assert_index(tmp: Path) -> None:
+    from agent.evidence import EvidenceIndex, iter_passages
+
+    root = tmp / "index"
+    index = EvidenceIndex(root)
+    assert index.search("电工") == []
+    passages = list(iter_passages([build_corpus(tmp)], max_chars=60))
+    assert len(passages) == 6, passages
+    # Small segments so the query spans several of them
+    assert index.add(passages, segment_docs=2) == 6
+    assert len(index.segments) == 3 and index.docs == 6
+
+    hits = index.search("现场电工故障诊断", k=2)
+    assert "PLC" in hits[0][1]["text"], hits
+    assert all("咖啡" not in p["text"] for _, p in hits)
+    hits = index.search("field voice input", k=1)
+    assert hits[0][1]["provenance"].endswith("notes.md#p2"), hits
+    assert index.search("电工作业", k=1)[0][1]["type"] == "primary"
+    assert index.search("quantum", k=3) == []
+    # A zero budget still scores the most selective term
+    assert index.search("电工 glasses", k=5, budget_ms=0)
+
+    # Another process (a fresh instance) maps the same segments; an existing
+    # instance picks up later ingests when the manifest changes
+    other = EvidenceIndex(root)
+    assert other.docs == 6
+    index.add([{"text": "AR 眼镜续航不足两小时。", "type": "secondary"}])
+    other.reload()
+    assert other.docs == 7 and "眼镜" in other.search("眼镜续航")[0][1]["text"]
+    other.close()
+    index.close()
+
+
+def assert_budget_and_concurrent_ingest(tmp: Path) -> None:
+    import threading
+
+    import agent.evidence as evidence
+
+    root = tmp / "common"
+    index = evidence.EvidenceIndex(root)
+    index.add([{"text": f"电工 record {i}"} for i in range(1000)])
+    original = evidence.time, evidence.POSTINGS_CHUNK
+    ticks = iter(range(1000))
+    # A fake clock that runs out after the first chunk of the term's postings
+    evidence.time = SimpleNamespace(perf_counter=lambda: float(next(ticks)))  # type: ignore[assignment]
+    evidence.POSTINGS_CHUNK = 100
+    try:
+        hits = index.search("record", k=1000, budget_ms=500, max_terms=1)
+    finally:
+        evidence.time, evidence.POSTINGS_CHUNK = original  # type: ignore[assignment]
+    assert len(hits) == 100, len(hits)
+    index.close()
+
+    # Concurrent ingests each keep their segments
+    def ingest(n: int) -> None:
+        evidence.EvidenceIndex(root).add([{"text": f"并发 ingest {n}"}])
+
+    threads = [threading.Thread(target=ingest, args=(n,)) for n in range(4)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    index = evidence.EvidenceIndex(root)
+    assert index.docs == 1004 and len(set(index._manifest()["segments"])) == 5
+    index.close()
+
+
+def assert_loose_fields(tmp: Path) -> None:
+    import agent.evidence as evidence
+    from agent.schemas import HAS_PYDANTIC
+
+    path = tmp / "loose.jsonl"
+    rows = [
+        {"text": "电工巡检样本", "sample_size": "120", "weight": "0.5"},
+        {"text": "电工巡检缺样本量", "sample_size": "n/a"},
+        {"text": "电工巡检时间戳", "timestamp": 2024},
+        {"text": "电工巡检权重", "weight": "heavy"},
+        {"text": "电工巡检类型", "type": "blog", "timestamp": "2024-05"},
+    ]
+    path.write_text(
+        "".join(json.dumps(r, ensure_ascii=False) + "\n" for r in rows) + "{oops\n",
+        encoding="utf-8",
+    )
+    errors: List[str] = []
+    passages = list(evidence.iter_passages([path], errors=errors))
+    if HAS_PYDANTIC:
+        # Coercible fields are coerced; the rest are skipped with their line
+        assert [p["text"] for p in passages] == ["电工巡检样本", "电工巡检类型"]
+        assert passages[0]["sample_size"] == 120 and passages[0]["weight"] == 0.5
+        assert sorted(e.split(": ")[0] for e in errors) == [
+            f"{path}:{n}" for n in (2, 3, 4, 6)
+        ], errors
+    assert passages[-1]["type"] == "secondary"
+
+    # Hits that no longer validate (e.g. from an older index) are dropped
+    index = evidence.EvidenceIndex(tmp / "loose-index")
+    index.add(passages + [{"text": "电工巡检旧记录", "type": "secondary"}])
+    index.add([{"text": "电工巡检坏记录", "provenance": "old", "sample_size": "n/a"}])
+    found = evidence.retrieve_evidence(
+        SimpleNamespace(intent="电工巡检"), {"index": str(tmp / "loose-index"), "k": 10}
+    )
+    if HAS_PYDANTIC:
+        assert "old" not in [e.provenance for e in found] and len(found) == 3
+    index.close()
+
+
+def assert_prompt_and_report(tmp: Path) -> None:
+    import agent.engine as engine
+    from agent.context import EvaluationContext
+    from agent.pipeline import Pipeline
+
+    idea_path = tmp / "idea.yaml"
+    shutil.copy(next((ROOT / "ideas").glob("为现场电工*.yaml")), idea_path)
+    cfg_path = tmp / "model.yaml"
+    cfg_path.write_text(
+        f"model: m\nevidence:\n  index: {tmp / 'index'}\n  k: 2\n  max_chars: 30\n",
+        encoding="utf-8",
+    )
+    seen: List[Dict[str, Any]] = []
+
+    def fake_verdict(idea, rules, cfg, allowed_redline_ids=None, correction_note=None):
+        seen.append(idea)
+        return {"decision": "go", "conf_level": 0.9, "reasons": ["见 [E1]"]}
+
+    ctx = EvaluationContext.create(cfg_path, language="zh-CN", reports_dir=tmp)
+    original = engine.llm_verdict_json
+    engine.llm_verdict_json = fake_verdict  # type: ignore[assignment]
+    try:
+        verdict = Pipeline(ctx=ctx).evaluate(idea_path).verdict
+    finally:
+        engine.llm_verdict_json = original  # type: ignore[assignment]
+    cited = seen[0]["evidence"]
+    assert [e["id"] for e in cited] == ["E1", "E2"], cited
+    assert len(cited[0]["excerpt"]) <= 30
+    assert verdict.evidence[0].score and verdict.evidence[0].provenance
+    report = Pipeline(ctx=ctx).report(idea_path).path.read_text("utf-8")
+    assert "— 证据 —" in report and f"[E1] {cited[0]['excerpt']}" in report
+
+
+def main() -> None:
+    tmp = Path(tempfile.mkdtemp())
+    try:
+        assert_tokenize()
+        assert_index(tmp)
+        assert_loose_fields(tmp)
+        assert_budget_and_concurrent_ingest(tmp)
+        assert_prompt_and_report(tmp)
+    finally:
+        shutil.rmtree(tmp, ignore_errors=True)
+    print("Evidence checks passed.")
+
+
+if __name__ == "__main__":
+    main()
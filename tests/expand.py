@@ -0,0 +1,138 @@
+from __future__ import annotations
+
+import json
+import sys
+import tempfile
+from pathlib import Path
+from typing import Any, Callable, Dict, List
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+IDEA: Dict[str, Any] = {
+    "intent": "voice copilot for electricians",
+    "user": "field electricians",
+    "scenario": "hands-busy fault diagnosis",
+    "triggers": "alarm on site",
+    "alts": "paper manuals",
+    "assumptions": ["network on site"],
+    "risks": ["noise"],
+}
+
+
+class FakeClient:
+    """Streams {"idea", "verdict"} in small chunks; answers the two-call path too."""
+
+    def __init__(self, verdict: Dict[str, Any], idea: Dict[str, Any]) -> None:
+        self.verdict = verdict
+        self.idea = idea
+        self.calls: List[str] = []
+
+    def complete_json_stream(
+        self, system: str, user: str, on_text: Callable[[str], None]
+    ) -> str:
+        self.calls.append("combined")
+        text = json.dumps({"idea": self.idea, "verdict": self.verdict})
+        for end in range(8, len(text) + 8, 8):
+            on_text(text[:end])
+        return text
+
+    def complete_json(self, system: str, user: str) -> str:
+        if "Expand a terse idea" in system:
+            self.calls.append("expand")
+            return json.dumps({**IDEA, "intent": "offline manual search for techs"})
+        self.calls.append("verdict")
+        return json.dumps({"decision": "caution", "conf_level": 0.6, "reasons": ["r"]})
+
+
+def assert_closed_object() -> None:
+    from agent.llm import closed_object
+
+    text = '{"idea": {"intent": "a {brace} \\"quoted\\"", "n": {"x": 1}}, "verdict": {'
+    assert closed_object(text, "idea") == {
+        "intent": 'a {brace} "quoted"',
+        "n": {"x": 1},
+    }
+    assert closed_object(text, "verdict") is None
+    assert closed_object('{"idea": {"intent": "unfinished', "idea") is None
+    assert closed_object('{"other": {}}', "idea") is None
+
+
+def run(verdict: Dict[str, Any], idea: Dict[str, Any] = IDEA) -> Any:
+    from agent.context import EvaluationContext
+    from agent.llm import register_provider
+    from agent.pipeline import Pipeline
+
+    tmp = Path(tempfile.mkdtemp())
+    client = FakeClient(verdict, idea)
+    provider = f"fake-expand-{tmp.name}"
+    register_provider(provider, lambda cfg: client)
+    cfg = tmp / "model.yaml"
+    cfg.write_text(f"provider: {provider}\nmodel: m\n", encoding="utf-8")
+    ctx = EvaluationContext.create(
+        cfg, language="en", ideas_dir=tmp / "ideas", reports_dir=tmp / "reports"
+    )
+    pipeline = Pipeline(ctx=ctx)
+    seen: List[List[str]] = []
+    original = client.complete_json_stream
+
+    def watching(system: str, user: str, on_text: Callable[[str], None]) -> str:
+        def spy(text: str) -> None:
+            on_text(text)
+            files = sorted(p.name for p in (tmp / "ideas").glob("*.yaml"))
+            if files and not seen:
+                seen.append(files)
+
+        return original(system, user, spy)
+
+    client.complete_json_stream = watching  # type: ignore[method-assign]
+    result = pipeline.expand_and_evaluate("voice copilot")
+    return result, client, seen, tmp
+
+
+def assert_combined() -> None:
+    verdict = {"decision": "go", "conf_level": 0.8, "reasons": ["fine"], "redlines": []}
+    result, client, seen, tmp = run(verdict)
+    assert result.mode == "combined" and client.calls == ["combined"]
+    # The idea file exists while the verdict is still streaming
+    assert seen == [[result.intake.path.name]], seen
+    assert result.evaluate.verdict.decision == "go"
+    assert result.evaluate.path.exists()
+
+
+def assert_rejected_fallback() -> None:
+    # A redline outside the allowed ids fails _strict_verdict
+    verdict = {"decision": "deny", "conf_level": 0.9, "redlines": ["RL-999"]}
+    result, client, seen, tmp = run(verdict)
+    assert result.mode == "two-call"
+    assert client.calls == ["combined", "verdict"], client.calls
+    assert result.evaluate.verdict.decision == "caution"
+    assert [p.name for p in (tmp / "ideas").glob("*.yaml")] == [result.intake.path.name]
+
+
+def assert_reexpanded_fallback() -> None:
+    from agent.expand import _strict_verdict
+
+    assert _strict_verdict({"decision": "go", "conf_level": "high"}, []) is None
+    assert _strict_verdict({"decision": "maybe", "conf_level": 0.5}, []) is None
+
+    # An incomplete streamed idea: re-expanded under another slug, and the
+    # early file does not stay behind next to the final one
+    result, client, seen, tmp = run(
+        {"decision": "go", "conf_level": 0.8}, {**IDEA, "alts": ""}
+    )
+    assert client.calls == ["combined", "expand", "verdict"], client.calls
+    assert result.intake.path.name.startswith("offline-manual")
+    assert [p.name for p in (tmp / "ideas").glob("*.yaml")] == [result.intake.path.name]
+
+
+def main() -> None:
+    assert_closed_object()
+    assert_combined()
+    assert_rejected_fallback()
+    assert_reexpanded_fallback()
+    print("Expand checks passed.")
+
+
+if __name__ == "__main__":
+    main()
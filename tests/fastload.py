@@ -0,0 +1,64 @@
+from __future__ import annotations
+
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+
+def assert_cached_and_bounded() -> None:
+    import agent.fastload as fastload
+
+    tmp = Path(tempfile.mkdtemp())
+    original = fastload.CACHE_DIR
+    fastload.CACHE_DIR = tmp / "cache"
+    try:
+        paths = []
+        for n in range(6):
+            path = tmp / f"f{n}.yaml"
+            path.write_text(f"n: {n}\n", encoding="utf-8")
+            paths.append(path)
+        assert fastload.load_yaml(paths[0]) == {"n": 0}
+        cache = fastload._cache_path(paths[0])
+        assert cache.exists()
+        # Edits are picked up (mtime/size changed)
+        paths[0].write_text("n: 10\n", encoding="utf-8")
+        assert fastload.load_yaml(paths[0]) == {"n": 10}
+
+        for path in paths[1:4]:
+            fastload.load_yaml(path)
+        # Entries of deleted files go first, then the least recently used,
+        # down to 3/4 of the bound
+        paths[1].unlink()
+        old = time.time() - 60
+        os.utime(fastload._cache_path(paths[2]), (old, old))
+        assert fastload.prune_cache(max_entries=4) == 0
+        assert fastload.prune_cache(max_entries=3) == 2
+        left = {p.name for p in (tmp / "cache" / "yaml").glob("*.json")}
+        assert left == {fastload._cache_path(p).name for p in paths[::3]}, left
+
+        # Writes keep the cache bounded on their own
+        original_max = fastload.MAX_ENTRIES
+        fastload.MAX_ENTRIES = 4
+        try:
+            for path in paths:
+                if path.exists():
+                    fastload.load_yaml(path)
+        finally:
+            fastload.MAX_ENTRIES = original_max
+        assert len(list((tmp / "cache" / "yaml").glob("*.json"))) <= 4
+    finally:
+        fastload.CACHE_DIR = original
+
+
+def main() -> None:
+    assert_cached_and_bounded()
+    print("Fastload checks passed.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,46 @@
+from __future__ import annotations
+
+import sys
+import threading
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+
+def assert_backup_wins() -> None:
+    from agent.hedging import HedgeBudget, hedged_call
+
+    stalled = threading.Event()
+
+    def primary() -> str:
+        stalled.wait(5)
+        return '{"who": "primary"}'
+
+    out = hedged_call(
+        primary, lambda: '{"who": "backup"}', 0.05, HedgeBudget(), lambda s: True
+    )
+    stalled.set()
+    assert out == '{"who": "backup"}', out
+
+
+def assert_budget_caps_hedges() -> None:
+    from agent.hedging import HedgeBudget
+
+    budget = HedgeBudget(ratio=0.05)
+    assert budget.try_acquire()
+    granted = 0
+    for _ in range(100):
+        budget.on_request()
+        granted += budget.try_acquire()
+    assert granted == 5, granted
+
+
+def main() -> None:
+    assert_backup_wins()
+    assert_budget_caps_hedges()
+    print("Hedging checks passed.")
+
+
+if __name__ == "__main__":
+    main()
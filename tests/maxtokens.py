@@ -0,0 +1,102 @@
+from __future__ import annotations
+
+import sys
+import tempfile
+from pathlib import Path
+from types import SimpleNamespace
+from typing import Any, Dict, List
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+
+def assert_learned_budget() -> None:
+    from agent.maxtokens import OutputLengths, TokenBudget
+
+    state = Path(tempfile.mkdtemp()) / "lengths.json"
+    cfg = {"state_path": str(state), "min_samples": 5, "max_tokens": 2000}
+    en = TokenBudget("m", "en", 800, cfg)
+    zh = TokenBudget("m", "zh-CN", 800, cfg)
+    assert en.suggest() == zh.suggest() == 800  # not enough history yet
+    for tokens in (150, 180, 200, 170, 160):
+        en.record(tokens, 1)
+    for tokens in (700, 900, 1000, 950, 1600):
+        zh.record(tokens * 2, 2)  # usage counts all choices of an n-request
+    assert en.suggest() == 256, en.suggest()  # 200 * 1.25 raised to min_tokens
+    assert zh.suggest() == 2000, zh.suggest()  # 1600 * 1.25 capped
+    # Persisted per model|language for the next process
+    assert OutputLengths(state).count("m|zh-CN") == 5
+    assert en.grow(256) == 800 and en.grow(1600) == 2000 and en.grow(2000) is None
+    off = TokenBudget("m", "en", 800, {**cfg, "adaptive": False})
+    assert off.suggest() == 800
+
+
+class FakeCompletions:
+    def __init__(self, needed: int) -> None:
+        self.needed = needed
+        self.budgets: List[int] = []
+
+    def create(self, **kwargs: Any) -> Any:
+        budget = kwargs["max_tokens"]
+        n = (kwargs["extra_body"] or {}).get("n", 1)
+        self.budgets.append(budget)
+        choices = []
+        for i in range(n):
+            # Every other sample of an n-request is long
+            needed = self.needed * (2 if i % 2 else 1)
+            cut = budget < needed
+            choices.append(
+                SimpleNamespace(
+                    index=i,
+                    message=SimpleNamespace(
+                        content='{"decision": "go"' + ("" if cut else "}")
+                    ),
+                    finish_reason="length" if cut else "stop",
+                )
+            )
+        usage = SimpleNamespace(completion_tokens=min(budget, self.needed) * n)
+        resp = SimpleNamespace(choices=choices, usage=usage)
+        return SimpleNamespace(parse=lambda: resp, headers={})
+
+
+def client_for(needed: int, cfg: Dict[str, Any]) -> Any:
+    from agent.llm import LLMConfig, OpenAIClient
+
+    client = OpenAIClient(LLMConfig({"api_key": "sk-test", "model": "m", **cfg}))
+    fake = FakeCompletions(needed)
+    client._client = SimpleNamespace(  # type: ignore[assignment]
+        chat=SimpleNamespace(completions=SimpleNamespace(with_raw_response=fake))
+    )
+    return client, fake
+
+
+def assert_truncation_retry() -> None:
+    from agent.llm import parse_verdict_json
+
+    state = str(Path(tempfile.mkdtemp()) / "lengths.json")
+    budget = {"output_budget": {"state_path": state, "max_tokens": 3000}}
+    client, fake = client_for(1200, {"max_tokens": 800, **budget})
+    # Cut off at 800: retried with a doubled budget instead of falling back
+    raw = client.complete_json("s", "u")
+    assert fake.budgets == [800, 1600] and parse_verdict_json(raw)["decision"] == "go"
+
+    # Among n samples the truncated ones are dropped, without another request
+    client, fake = client_for(1000, {"max_tokens": 1500, **budget})
+    assert client.complete_json_n("s", "u", 4) == ['{"decision": "go"}'] * 2
+    assert fake.budgets == [1500]
+
+    # At the ceiling the cut-off text is returned and parsing falls back
+    client, fake = client_for(5000, {"max_tokens": 800, **budget})
+    raw = client.complete_json("s", "u")
+    assert fake.budgets == [800, 1600, 3000], fake.budgets
+    assert parse_verdict_json(raw)["decision"] == "caution"
+
+
+def main() -> None:
+    assert_learned_budget()
+    assert_truncation_retry()
+    print("Max tokens checks passed.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,113 @@
+from __future__ import annotations
+
+import json
+import shutil
+import sys
+import tempfile
+from pathlib import Path
+from typing import Any, Dict, List
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+IDEA: Dict[str, Any] = {
+    "intent": "Voice copilot for field electricians",
+    "user": "field electricians",
+    "scenario": "hands-busy fault diagnosis",
+    "triggers": "alarm on site",
+    "alts": "paper manuals",
+    "assumptions": ["network on site"],
+    "risks": ["noise"],
+}
+
+
+def assert_typed_results(tmp: Path) -> None:
+    import agent.engine as engine
+    from agent.context import EvaluationContext
+    from agent.pipeline import (
+        EvaluateResult,
+        IntakeResult,
+        Pipeline,
+        PipelineResult,
+        ReportResult,
+    )
+    from agent.schemas import Idea
+
+    cfg = tmp / "model.yaml"
+    cfg.write_text("model: m\nlanguage: en\n", encoding="utf-8")
+    ctx = EvaluationContext.create(
+        cfg, language="en", ideas_dir=tmp / "ideas", reports_dir=tmp / "reports"
+    )
+    seen: List[Dict[str, Any]] = []
+    loads: List[str] = []
+
+    def fake_verdict(idea, rules, cfg, allowed_redline_ids=None, correction_note=None):
+        seen.append(idea)
+        return {"decision": "caution", "conf_level": 0.6, "reasons": ["check demand"]}
+
+    def counting_load_rules(rules_dir: str) -> Any:
+        loads.append(rules_dir)
+        return original_load_rules(rules_dir)
+
+    original_verdict = engine.llm_verdict_json
+    original_load_rules = engine.load_rules
+    engine.llm_verdict_json = fake_verdict  # type: ignore[assignment]
+    engine.load_rules = counting_load_rules  # type: ignore[assignment]
+    try:
+        pipeline = Pipeline(ctx=ctx)
+        assert pipeline.ctx is ctx
+
+        intake = pipeline.intake(IDEA)
+        assert isinstance(intake, IntakeResult) and isinstance(intake.idea, Idea)
+        assert (
+            intake.path == tmp / "ideas" / "voice-copilot-for-field-electricians.yaml"
+        )
+        assert intake.path.exists()
+
+        evaluated = pipeline.evaluate(intake.path)
+        assert isinstance(evaluated, EvaluateResult)
+        assert evaluated.idea_path == intake.path
+        assert evaluated.verdict.decision == "caution"
+        assert evaluated.path == pipeline.verdict_path(intake.path)
+        on_disk = json.loads(evaluated.path.read_text(encoding="utf-8"))
+        assert on_disk["decision"] == "caution" and on_disk["language"] == "en"
+
+        report = pipeline.report(intake.path)
+        assert isinstance(report, ReportResult)
+        assert report.verdict_path == evaluated.path
+        text = report.path.read_text(encoding="utf-8")
+        assert text.startswith("# One-Page Verdict") and "check demand" in text
+
+        # run(): an existing verdict is reused without another LLM call
+        result = pipeline.run(IDEA, skip_existing=True)
+        assert isinstance(result, PipelineResult)
+        assert result.evaluate is None and result.report is not None
+        assert len(seen) == 1
+        result = pipeline.run({**IDEA, "intent": "Second idea"}, slug="second")
+        assert result.evaluate is not None
+        assert result.evaluate.path.name == "second.verdict.json"
+        assert len(seen) == 2
+
+        # Rules and the model config are loaded once per context, also by a
+        # second pipeline sharing it
+        config = ctx.cache["llm_config"]
+        Pipeline(ctx=ctx).evaluate(intake.path)
+        assert len(loads) == 1, loads
+        assert ctx.cache["llm_config"] is config
+        assert len(seen) == 3
+    finally:
+        engine.llm_verdict_json = original_verdict  # type: ignore[assignment]
+        engine.load_rules = original_load_rules  # type: ignore[assignment]
+
+
+def main() -> None:
+    tmp = Path(tempfile.mkdtemp())
+    try:
+        assert_typed_results(tmp)
+    finally:
+        shutil.rmtree(tmp, ignore_errors=True)
+    print("Pipeline checks passed.")
+
+
+if __name__ == "__main__":
+    main()
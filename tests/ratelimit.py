@@ -0,0 +1,126 @@
+from __future__ import annotations
+
+import sys
+import tempfile
+from pathlib import Path
+from types import SimpleNamespace
+from typing import List
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 1_000_000.0
+        self.sleeps: List[float] = []
+
+    def time(self) -> float:
+        return self.now
+
+    def sleep(self, s: float) -> None:
+        self.sleeps.append(s)
+        self.now += s
+
+
+def with_clock(fn) -> None:
+    import agent.ratelimit as ratelimit
+
+    clock = FakeClock()
+    original = ratelimit.time
+    ratelimit.time = SimpleNamespace(time=clock.time, sleep=clock.sleep)  # type: ignore[assignment]
+    try:
+        fn(clock)
+    finally:
+        ratelimit.time = original  # type: ignore[assignment]
+
+
+def state_file() -> Path:
+    return Path(tempfile.mkdtemp()) / "limits.json"
+
+
+def assert_parse_duration() -> None:
+    from agent.ratelimit import parse_duration
+
+    assert parse_duration("1.5") == 1.5
+    assert parse_duration("6m0s") == 360.0
+    assert parse_duration("20ms") == 0.02
+    assert parse_duration("1h2m") == 3720.0
+    assert parse_duration("soon") is None and parse_duration(None) is None
+
+
+def assert_pacing(clock: FakeClock) -> None:
+    from agent.ratelimit import RateLimiter
+
+    limiter = RateLimiter(600, 600, state_file(), safety=1.0)  # 10 tokens/s
+    limiter.acquire(600)  # the bucket starts full
+    assert clock.sleeps == []
+    limiter.acquire(5)
+    assert abs(sum(clock.sleeps) - 0.5) < 1e-6, clock.sleeps
+    # Under-estimates are charged back, delaying the next call
+    limiter.settle(0, 10)
+    clock.sleeps.clear()
+    limiter.acquire(0)
+    assert abs(sum(clock.sleeps) - 1.0) < 1e-6, clock.sleeps
+
+
+def assert_observe(clock: FakeClock) -> None:
+    from agent.ratelimit import RateLimiter
+
+    path = state_file()
+    limiter = RateLimiter(60, 100000, path, safety=1.0)
+    limiter.observe(
+        {
+            "X-RateLimit-Limit-Tokens": "6000",
+            "X-RateLimit-Remaining-Tokens": "0",
+            "X-RateLimit-Reset-Tokens": "2s",
+        }
+    )
+    limiter.acquire(1)
+    # Blocked until the provider's reset, then paced at the learned 100 tokens/s
+    assert sum(clock.sleeps) >= 2.0, clock.sleeps
+    with limiter._locked() as state:
+        assert state["tpm"] == 6000
+
+    clock.sleeps.clear()
+    limiter.observe({"retry-after-ms": "1500"})
+    limiter.acquire(0)
+    assert abs(sum(clock.sleeps) - 1.5) < 1e-6, clock.sleeps
+    clock.sleeps.clear()
+    limiter.observe({"Retry-After": "3"})
+    limiter.acquire(0)
+    assert abs(sum(clock.sleeps) - 3.0) < 1e-6, clock.sleeps
+
+    # Learned rates persist for a limiter with the same configuration
+    with RateLimiter(60, 100000, path, safety=1.0)._locked() as state:
+        assert state["tpm"] == 6000
+
+
+def assert_config_change(clock: FakeClock) -> None:
+    from agent.ratelimit import RateLimiter, limiter_for
+
+    path = state_file()
+    RateLimiter(60, 100000, path).acquire(10)
+    limiter = RateLimiter(60, 1000, path)
+    with limiter._locked() as state:
+        assert state["tpm"] == 900 and state["tokens"] <= 900, state
+    limiter.acquire(900)
+    limiter.acquire(90)
+    assert abs(sum(clock.sleeps) - 6.0) < 1e-6, clock.sleeps
+
+    cfg = {"rpm": 60, "tpm": 1000, "state_path": str(state_file())}
+    first = limiter_for(cfg, "k")
+    assert limiter_for(cfg, "k") is first
+    assert limiter_for({**cfg, "tpm": 2000}, "k").tpm == 2000
+
+
+def main() -> None:
+    assert_parse_duration()
+    with_clock(assert_pacing)
+    with_clock(assert_observe)
+    with_clock(assert_config_change)
+    print("Rate limit checks passed.")
+
+
+if __name__ == "__main__":
+    main()
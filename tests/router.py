@@ -0,0 +1,144 @@
+from __future__ import annotations
+
+import sys
+import time
+from pathlib import Path
+from typing import Callable, List
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+
+def assert_breaker_cycle() -> None:
+    from agent.router import CircuitBreaker
+
+    br = CircuitBreaker(failure_threshold=2, cooldown_s=0.05)
+    br.record_failure()
+    assert br.allow()
+    br.record_failure()
+    assert br.state == "open" and not br.allow()
+    time.sleep(0.06)
+    # One half-open probe at a time
+    assert br.allow() and not br.allow()
+    br.record_failure()
+    assert br.state == "open"
+    time.sleep(0.06)
+    assert br.allow()
+    br.record_success()
+    assert br.state == "closed" and br.allow()
+
+
+def assert_health_ranking() -> None:
+    from agent.router import EndpointHealth
+
+    fast, flaky = EndpointHealth(), EndpointHealth()
+    fast.record(True, 1.0)
+    flaky.record(True, 0.8)
+    flaky.record(False)
+    assert fast.score() < flaky.score()
+    # Never succeeded: scored at the default latency, so errors still count
+    dead = EndpointHealth(default_latency_s=30.0)
+    for _ in range(3):
+        dead.record(False)
+    assert dead.score() > EndpointHealth(default_latency_s=30.0).score()
+    assert fast.score() < dead.score()
+
+
+class FakeClient:
+    def __init__(self, fail: bool, partial: bool = False) -> None:
+        self.fail = fail
+        self.partial = partial
+        self.calls = 0
+
+    def complete_json_once(self, system: str, user: str) -> str:
+        self.calls += 1
+        if self.fail:
+            err = RuntimeError("upstream down")
+            err.status_code = 503  # type: ignore[attr-defined]
+            raise err
+        return '{"decision": "go"}'
+
+    def complete_json_n_once(self, system: str, user: str, n: int) -> List[str]:
+        return [self.complete_json_once(system, user)] * n
+
+    def complete_json_stream(
+        self, system: str, user: str, on_text: Callable[[str], None]
+    ) -> str:
+        if self.partial:
+            on_text('{"deci')
+        return self.complete_json_once(system, user)
+
+
+def assert_routing() -> None:
+    from agent.llm import LLMConfig
+    from agent.router import RoutedClient
+
+    cfg = LLMConfig(
+        {
+            "api_key": "sk-test",
+            "endpoints": [{"model": "router-a"}, {"model": "router-b"}],
+            "breaker": {"failure_threshold": 1, "cooldown_s": 60},
+        }
+    )
+    client = RoutedClient(cfg)
+    a, b = client._endpoints
+    fake_a, fake_b = FakeClient(fail=True), FakeClient(fail=True)
+    a._client, b._client = fake_a, fake_b  # type: ignore[assignment]
+    try:
+        client.complete_json("s", "u")
+        raise AssertionError("expected the last error")
+    except RuntimeError:
+        pass
+    assert a.breaker.state == b.breaker.state == "open"
+
+    # Every breaker open: the fallback probe is recorded like any other call
+    fake_a.fail = False
+    assert client.complete_json("s", "u") == '{"decision": "go"}'
+    assert a.breaker.state == "closed" and a.health.latency_s is not None
+    # The dead endpoint now ranks behind the recovered one
+    assert client._ranked()[0] is a
+    assert client.complete_json("s", "u") and fake_b.calls == 1
+
+
+def assert_every_client_path() -> None:
+    from agent.llm import LLMConfig, get_client
+    from agent.router import RoutedClient
+    from agent.sampling import sample_config
+
+    endpoints = [{"model": "path-a"}, {"model": "path-b"}]
+    cfg = LLMConfig({"api_key": "sk-test", "endpoints": endpoints})
+    # Derived configs keep routing unless they pick another model
+    assert cfg.derive({"temperature": 0.9}).endpoints == endpoints
+    assert not cfg.derive({"model": "other"}).endpoints
+    assert isinstance(get_client(sample_config(cfg)), RoutedClient)
+
+    client = RoutedClient(cfg)
+    a, b = client._endpoints
+    fake_a, fake_b = FakeClient(fail=True), FakeClient(fail=False)
+    a._client, b._client = fake_a, fake_b  # type: ignore[assignment]
+    assert client.complete_json_n("s", "u", 2) == ['{"decision": "go"}'] * 2
+    seen: List[str] = []
+    # Fails over while nothing was streamed yet
+    assert client.complete_json_stream("s", "u", seen.append)
+    # ...but not once partial output reached the caller
+    a.breaker.record_success()
+    b.health.latency_s = 1e6  # rank the failing endpoint first
+    fake_a.partial = True
+    try:
+        client.complete_json_stream("s", "u", seen.append)
+        raise AssertionError("expected the stream error")
+    except RuntimeError:
+        pass
+    assert seen == ['{"deci'] and fake_b.calls == 2, (seen, fake_b.calls)
+
+
+def main() -> None:
+    assert_breaker_cycle()
+    assert_health_ranking()
+    assert_routing()
+    assert_every_client_path()
+    print("Router checks passed.")
+
+
+if __name__ == "__main__":
+    main()
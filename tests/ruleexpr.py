@@ -0,0 +1,225 @@
+from __future__ import annotations
+
+import sys
+import tempfile
+from pathlib import Path
+from typing import Any, Dict, List
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+IDEA: Dict[str, Any] = {
+    "intent": "i",
+    "user": "u",
+    "scenario": "s",
+    "triggers": "t",
+    "alts": "a",
+}
+
+
+def assert_predicates() -> None:
+    from agent.ruleexpr import ExprError, compile_expr
+
+    p = compile_expr("time_to_proof_months > runway_months and not has_value_gates")
+    assert p({"time_to_proof_months": 40, "runway_months": 18}) is None  # unknown
+    assert p({"time_to_proof_months": 12, "runway_months": 18}) is False  # cleared
+    facts = {"time_to_proof_months": 40, "runway_months": 18, "has_value_gates": False}
+    assert p(facts) is True
+
+    assert compile_expr("stage in ['idea', 'mvp'] or arr >= 1e6")({"arr": 2e6}) is True
+    assert compile_expr("stage not in ('idea',)")({"stage": "idea"}) is False
+    assert compile_expr("0 < margin <= 0.2")({"margin": 0.1}) is True
+    assert compile_expr("price / users > 1")({"price": 5, "users": 0}) is None
+    assert compile_expr("stage > 3")({"stage": "mvp"}) is None
+    assert compile_expr("-loss < -10")({"loss": 20}) is True
+
+    for bad in ("__import__('os')", "a.b > 1", "x if y else z", "a in b", "a >"):
+        try:
+            compile_expr(bad)
+        except ExprError:
+            continue
+        raise AssertionError(f"accepted {bad}")
+
+
+def assert_vectorized() -> None:
+    from agent.ruleexpr import check_rules
+    from agent.schemas import Rule
+
+    rule = Rule(
+        id="RL-002",
+        condition="c",
+        rationale="r",
+        expr="unit_cost_floor > value_ceiling",
+    )
+    ideas = [
+        {"facts": {"unit_cost_floor": 10, "value_ceiling": 5}},
+        {"facts": {"unit_cost_floor": 1, "value_ceiling": 5}},
+        {"facts": {}},
+    ]
+    checks = check_rules(ideas, [rule, Rule(id="RL-001", condition="c", rationale="r")])
+    assert checks == [{"RL-002": True}, {"RL-002": False}, {"RL-002": None}], checks
+
+
+def assert_arbitration() -> None:
+    import agent.engine as engine
+    from agent.schemas import Idea, Rule
+
+    deny = Rule(
+        id="RL-002",
+        condition="c",
+        rationale="Negative unit economics.",
+        decision="deny",
+        expr="unit_cost_floor > value_ceiling",
+        next_steps=["Cut cost"],
+    )
+    warn = Rule(
+        id="RL-007",
+        condition="c",
+        rationale="r",
+        decision="caution",
+        expr="cac_months > 12",
+    )
+    plain = Rule(id="RL-001", condition="c", rationale="r", decision="deny")
+    rubrics: List[List[str]] = []
+
+    def fake_verdict(idea, rules, cfg, allowed_redline_ids=None, correction_note=None):
+        rubrics.append([r["id"] for r in rules])
+        return {"decision": "go", "conf_level": 0.8}
+
+    def idea(cost: int, cac: int) -> Idea:
+        facts: Dict[str, Any] = {
+            "unit_cost_floor": cost,
+            "value_ceiling": 5,
+            "cac_months": cac,
+        }
+        return Idea(**IDEA, facts=facts)
+
+    cfg = str(ROOT / "config" / "model.yaml")
+    original = engine.llm_verdict_json
+    engine.llm_verdict_json = fake_verdict  # type: ignore[assignment]
+    try:
+        verdict = engine.arbitrate_llm(idea(10, 20), [deny, warn, plain], cfg)
+        assert verdict.deterministic and verdict.decision == "deny" and not rubrics
+        assert verdict.redlines == ["RL-002"] and verdict.next_steps == ["Cut cost"]
+
+        # RL-002 cleared by the facts: not sent; RL-007 fired: kept as a redline
+        verdict = engine.arbitrate_llm(idea(1, 20), [deny, warn, plain], cfg)
+        assert rubrics == [["RL-007", "RL-001"]], rubrics
+        assert not verdict.deterministic and verdict.decision == "caution"
+        assert verdict.redlines == ["RL-007"]
+
+        # Every rule resolved locally: no LLM call even without a deny
+        verdict = engine.arbitrate_llm(idea(1, 3), [deny, warn], cfg)
+        assert verdict.deterministic and verdict.decision == "go" and len(rubrics) == 1
+    finally:
+        engine.llm_verdict_json = original  # type: ignore[assignment]
+
+
+def assert_batch_job_mode() -> None:
+    import contextlib
+    import io
+    import json
+    from argparse import Namespace
+
+    sys.path.insert(0, str(ROOT / "scripts"))
+    import batch_evaluate
+    from agent.batchjob import LocalBatchBackend, register_batch_backend
+    from agent.schemas import Idea, Rule
+
+    rules = [
+        Rule(
+            id="RL-002",
+            condition="c",
+            rationale="r",
+            decision="deny",
+            expr="unit_cost_floor > value_ceiling",
+        ),
+        Rule(
+            id="RL-007",
+            condition="c",
+            rationale="r",
+            decision="caution",
+            expr="cac_months > 12",
+        ),
+        Rule(id="RL-001", condition="c", rationale="r"),
+    ]
+    tmp = Path(tempfile.mkdtemp())
+    prompts: List[str] = []
+
+    def respond(system: str, user: str) -> str:
+        prompts.append(system + user)
+        return json.dumps({"decision": "go", "conf_level": 0.8, "redlines": []})
+
+    register_batch_backend(
+        "rule-test", lambda cfg: LocalBatchBackend(root=tmp / "jobs", respond=respond)
+    )
+    cfg_path = tmp / "model.yaml"
+    cfg_path.write_text("model: m\nbatch:\n  backend: rule-test\n", encoding="utf-8")
+    args = Namespace(
+        model_cfg=str(cfg_path),
+        batch_job=str(tmp / "work"),
+        batch_timeout=None,
+        stats=False,
+    )
+
+    def idea(cost: int, cac: int) -> Idea:
+        facts: Dict[str, Any] = {
+            "unit_cost_floor": cost,
+            "value_ceiling": 5,
+            "cac_months": cac,
+        }
+        return Idea(**IDEA, facts=facts)
+
+    items = [("denied", idea(10, 20)), ("warned", idea(1, 20)), ("clear", idea(1, 3))]
+    original = batch_evaluate.REPORTS_DIR
+    batch_evaluate.REPORTS_DIR = tmp / "reports"
+    try:
+        with contextlib.redirect_stdout(io.StringIO()):
+            batch_evaluate.run_batch_job(args, iter(items), rules)
+    finally:
+        batch_evaluate.REPORTS_DIR = original
+
+    def verdict(key: str) -> Dict[str, Any]:
+        path = tmp / "reports" / f"{key}.verdict.json"
+        return json.loads(path.read_text(encoding="utf-8"))
+
+    # Same outcome as arbitrate_llm: the fired deny never reaches the provider,
+    # cleared rules are pruned from each request, fired ones are merged back
+    assert len(prompts) == 2
+    assert (
+        verdict("denied")["deterministic"] and verdict("denied")["decision"] == "deny"
+    )
+    assert "RL-002" not in prompts[0] and "RL-007" in prompts[0]
+    assert verdict("warned")["decision"] == "caution"
+    assert verdict("warned")["redlines"] == ["RL-007"]
+    assert verdict("clear")["decision"] == "go" and "RL-007" not in prompts[1]
+
+
+def assert_rule_loading() -> None:
+    from agent.engine import load_rules
+
+    rules = load_rules(str(ROOT / "config" / "rules" / "core"))
+    assert {r.id for r in rules if r.expr} == {"RL-002", "RL-010"}
+    tmp = Path(tempfile.mkdtemp())
+    (tmp / "bad.yaml").write_text(
+        "id: RL-X\ncondition: c\nrationale: r\nexpr: \"open('x')\"\n", encoding="utf-8"
+    )
+    try:
+        load_rules(str(tmp))
+    except ValueError as e:
+        assert "bad.yaml" in str(e) and "expr" in str(e)
+    else:
+        raise AssertionError("unsafe expr accepted")
+
+
+def main() -> None:
+    assert_predicates()
+    assert_vectorized()
+    assert_arbitration()
+    assert_batch_job_mode()
+    assert_rule_loading()
+    print("Rule expr checks passed.")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,9 +1,10 @@
 from __future__ import annotations
 
+import glob
+import subprocess
 import sys
 from pathlib import Path
-import sys
-import glob
+from typing import Any, Dict, List
 import yaml
 
 ROOT = Path(__file__).resolve().parents[1]
@@ -29,9 +30,74 @@ def assert_idea_file() -> None:
     Idea(**data)
 
 
+IDEA_ROW: Dict[str, Any] = {
+    "intent": "i",
+    "user": "u",
+    "scenario": "s",
+    "triggers": "t",
+    "alts": "a",
+}
+RULE_ROW = {"id": "RL-X", "condition": "c", "rationale": "r"}
+
+
+def assert_bulk_validation() -> None:
+    from agent.schemas import (
+        Idea,
+        IdeaRecord,
+        validate_idea_records,
+        validate_ideas,
+        validate_rules,
+    )
+
+    rows: List[Dict[str, Any]] = [
+        IDEA_ROW,
+        {**IDEA_ROW, "user": None},
+        {**IDEA_ROW, "assumptions": ["a1"], "facts": {"arr": 2}},
+        {"intent": "only"},
+    ]
+    items, errors = validate_ideas(rows)
+    # One slot per row, None where invalid; errors carry the row index
+    assert [type(x) if x else None for x in items] == [Idea, None, Idea, None]
+    assert [i for i, _ in errors] == [1, 3], errors
+    assert "user" in errors[0][1] and "scenario" in errors[1][1], errors
+    assert items[2] is not None and items[2].facts == {"arr": 2}
+
+    records, rec_errors = validate_idea_records(rows)
+    assert [i for i, _ in rec_errors] == [1, 3]
+    assert isinstance(records[0], IdeaRecord) and records[1] is None
+    assert records[2] is not None and records[2].assumptions == ["a1"]
+
+    rules, rule_errors = validate_rules(
+        [RULE_ROW, {**RULE_ROW, "severity": "extreme"}, {"id": "RL-Y"}]
+    )
+    assert rules[0] is not None and rules[1] is None and rules[2] is None
+    assert [i for i, _ in rule_errors] == [1, 2]
+    assert "severity" in rule_errors[0][1] and "condition" in rule_errors[1][1]
+    assert validate_ideas([]) == ([], [])
+
+
+def assert_bulk_validation_without_pydantic() -> None:
+    # The fallback models check field presence only (no type coercion)
+    code = """
+import sys
+sys.modules["pydantic"] = None
+from agent.schemas import HAS_PYDANTIC, validate_idea_records, validate_ideas
+assert not HAS_PYDANTIC
+rows = [%r, {"intent": "only"}, %r]
+items, errors = validate_ideas(rows)
+assert items[0].intent == "i" and items[1] is None and items[2].facts == {"arr": 2}
+assert [i for i, _ in errors] == [1] and "user" in errors[0][1], errors
+records, errors = validate_idea_records(rows)
+assert records[0].alts == "a" and records[1] is None and [i for i, _ in errors] == [1]
+""" % (IDEA_ROW, {**IDEA_ROW, "facts": {"arr": 2}})
+    subprocess.run([sys.executable, "-c", code], cwd=ROOT, check=True)
+
+
 def main() -> None:
     assert_rule_files()
     assert_idea_file()
+    assert_bulk_validation()
+    assert_bulk_validation_without_pydantic()
     print("Schema checks passed.")
 
 
@@ -0,0 +1,130 @@
+from __future__ import annotations
+
+import json
+import sys
+from pathlib import Path
+from types import SimpleNamespace
+from typing import Any, Dict, List
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+IDEA: Dict[str, Any] = {
+    "intent": "i",
+    "user": "u",
+    "scenario": "s",
+    "triggers": "t",
+    "alts": "a",
+}
+
+
+def sample(decision: str, conf: float, redlines: List[str]) -> str:
+    return json.dumps(
+        {
+            "decision": decision,
+            "conf_level": conf,
+            "reasons": [f"{decision} reason"],
+            "redlines": redlines,
+        }
+    )
+
+
+class FakeChoicesClient:
+    requests: List[int] = []
+
+    def __init__(self, cfg) -> None:
+        self.cfg = cfg
+
+    def complete_json(self, system: str, user: str) -> str:
+        raise AssertionError("sampling should use a single n-choice request")
+
+    def complete_json_n(self, system: str, user: str, n: int) -> List[str]:
+        self.requests.append(n)
+        return [
+            sample("deny", 0.9, ["RL-001"]),
+            sample("deny", 0.7, ["RL-001", "RL-004"]),
+            "not json {",
+            sample("go", 0.8, []),
+            sample("deny", 0.8, ["RL-001"]),
+        ][:n]
+
+
+def assert_aggregation() -> None:
+    from agent.sampling import aggregate_samples, valid_samples
+
+    samples = valid_samples(
+        [sample("deny", 0.9, ["RL-001"]), "```json\n{}\n```", sample("go", 0.9, [])]
+    )
+    assert len(samples) == 2  # {} has no decision
+    # A 1:1 split goes to the stricter decision at half agreement
+    data = aggregate_samples(samples, 3)
+    assert data["decision"] == "deny" and data["conf_level"] == 0.45, data
+    assert data["self_consistency"] == {
+        "n": 3,
+        "valid": 2,
+        "agreement": 0.5,
+        "conf_stdev": 0.0,
+    }
+
+
+def assert_single_request() -> None:
+    import agent.engine as engine
+    from agent.llm import LLMConfig, register_provider
+    from agent.schemas import Idea, Rule
+
+    register_provider("fake-n", FakeChoicesClient)
+    cfg = LLMConfig(
+        {"provider": "fake-n", "temperature": 0.0, "self_consistency": {"n": 5}}
+    )
+    rules = [
+        Rule(id=rid, condition="c", rationale="r", decision="deny")
+        for rid in ("RL-001", "RL-004")
+    ]
+    verdict = engine.arbitrate_llm(Idea(**IDEA), rules, cfg)
+    assert FakeChoicesClient.requests == [5]
+    # 3 of 4 valid samples deny; confs 0.9/0.7/0.8 -> (0.8 - 0.08) * 0.75
+    assert verdict.decision == "deny" and verdict.conf_level == 0.54, verdict
+    # RL-004 was cited by only one sample
+    assert verdict.redlines == ["RL-001"] and verdict.reasons == ["deny reason"]
+
+
+def assert_openai_n() -> None:
+    from agent.llm import LLMConfig, OpenAIClient
+
+    sent: List[Dict[str, Any]] = []
+
+    def create(**kwargs: Any) -> Any:
+        sent.append(kwargs)
+        choices = [
+            SimpleNamespace(
+                index=i,
+                message=SimpleNamespace(content=f'{{"i": {i}}}'),
+                finish_reason="stop",
+            )
+            for i in reversed(range((kwargs["extra_body"] or {}).get("n", 1)))
+        ]
+        resp = SimpleNamespace(choices=choices, usage=None)
+        return SimpleNamespace(parse=lambda: resp, headers={})
+
+    client = OpenAIClient(LLMConfig({"api_key": "sk-test", "model": "m"}))
+    client._client = SimpleNamespace(  # type: ignore[assignment]
+        chat=SimpleNamespace(
+            completions=SimpleNamespace(
+                with_raw_response=SimpleNamespace(create=create)
+            )
+        )
+    )
+    assert client.complete_json_n("s", "u", 3) == ['{"i": 0}', '{"i": 1}', '{"i": 2}']
+    assert client.complete_json("s", "u") == '{"i": 0}'
+    assert sent[0]["extra_body"] == {"n": 3} and sent[1]["extra_body"] is None
+
+
+def main() -> None:
+    assert_aggregation()
+    assert_single_request()
+    assert_openai_n()
+    print("Sampling checks passed.")
+
+
+if __name__ == "__main__":
+    main()
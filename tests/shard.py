@@ -0,0 +1,64 @@
+from __future__ import annotations
+
+import json
+import sys
+import tempfile
+from pathlib import Path
+from typing import Any, Dict
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+
+def assert_partitioning() -> None:
+    from agent.shard import parse_shard, shard_of
+
+    assert parse_shard("2/4") == (2, 4)
+    for bad in ("0/4", "5/4", "x"):
+        try:
+            parse_shard(bad)
+        except ValueError:
+            continue
+        raise AssertionError(f"accepted {bad}")
+
+    ideas = [{"intent": f"idea {k}"} for k in range(2000)]
+    four = [shard_of(i, 4) for i in ideas]
+    assert set(four) == {1, 2, 3, 4}
+    assert all(300 < four.count(s) < 700 for s in range(1, 5)), four
+    # Growing from 4 to 5 shards only moves keys onto the new shard (~1/5 of them)
+    five = [shard_of(i, 5) for i in ideas]
+    moved = [(a, b) for a, b in zip(four, five) if a != b]
+    assert all(b == 5 for _, b in moved) and len(moved) < 600, len(moved)
+
+
+def assert_merge() -> None:
+    from agent.shard import merge_shards
+
+    tmp = Path(tempfile.mkdtemp())
+    a, b = tmp / "1-of-2", tmp / "2-of-2"
+    for shard, names in ((a, ["x", "y"]), (b, ["z", "x"])):
+        shard.mkdir()
+        for name in names:
+            verdict: Dict[str, Any] = {"decision": "go" if shard is a else "deny"}
+            (shard / f"{name}.verdict.json").write_text(json.dumps(verdict))
+        (shard / "_errors.jsonl").write_text(json.dumps({"row": shard.name}) + "\n")
+        (shard / "_stats.json").write_text(json.dumps({"budget": {"usd": 0.5}}))
+
+    stats = merge_shards([b, a], tmp / "out")
+    assert stats["total"] == 3 and stats["decision_counts"] == {"go": 2, "deny": 1}
+    assert stats["conflicts"] == [
+        {"verdict": "x.verdict.json", "kept": "1-of-2", "dropped": "2-of-2"}
+    ]
+    assert stats["budget"] == {"usd": 1.0}
+    errors = (tmp / "out" / "_errors.jsonl").read_text().splitlines()
+    assert [json.loads(e)["shard"] for e in errors] == ["1-of-2", "2-of-2"]
+
+
+def main() -> None:
+    assert_partitioning()
+    assert_merge()
+    print("Shard checks passed.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,47 @@
+from __future__ import annotations
+
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+
+# Modules the fast CLI paths (intake/report entry points) must not import eagerly
+HEAVY_MODULES = ["pydantic", "openai", "httpx", "yaml", "agent.engine", "agent.llm"]
+# Import budget for `agent.cli` on top of the bare interpreter (override via env)
+BUDGET_MS = float(os.environ.get("IC_STARTUP_BUDGET_MS", "60"))
+
+
+def import_times(stmt: str) -> dict[str, int]:
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", stmt],
+        cwd=ROOT,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    times: dict[str, int] = {}
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        parts = [x.strip() for x in line.split(":", 1)[1].split("|")]
+        if parts[1].isdigit():
+            times[parts[2]] = int(parts[1])
+    return times
+
+
+def main() -> None:
+    times = import_times("import agent.cli")
+    leaked = [m for m in HEAVY_MODULES if m in times]
+    assert not leaked, f"Heavy modules imported at startup: {leaked}"
+
+    total_ms = times["agent.cli"] / 1000.0
+    assert total_ms <= BUDGET_MS, (
+        f"agent.cli import took {total_ms:.1f}ms (budget {BUDGET_MS:.0f}ms)"
+    )
+    print(f"Startup budget passed ({total_ms:.1f}ms <= {BUDGET_MS:.0f}ms).")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,86 @@
+from __future__ import annotations
+
+import json
+import sys
+import tempfile
+from pathlib import Path
+from typing import List, Optional
+
+import yaml
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+VERDICT = {
+    "decision": "caution",
+    "conf_level": 0.7,
+    "redlines": [],
+    "reasons": ["需要验证付费意愿", "竞品众多"],
+    "next_steps": ["访谈 10 位用户", "需要验证付费意愿"],
+    "language": "zh-CN",
+}
+
+calls: List[List[str]] = []
+
+
+def fake_translate(strings: List[str], target: str, cfg) -> Optional[List[str]]:
+    calls.append(strings)
+    if target == "xx":
+        return None  # malformed provider output
+    return [f"[{target}] {s}" for s in strings]
+
+
+def assert_fan_out() -> None:
+    import agent.translate as tr
+    from agent.context import EvaluationContext
+    from agent.pipeline import Pipeline
+
+    tmp = Path(tempfile.mkdtemp())
+    idea_path = tmp / "idea.yaml"
+    idea_path.write_text(yaml.safe_dump({"intent": "x"}), encoding="utf-8")
+    ctx = EvaluationContext.create(
+        ROOT / "config" / "model.yaml", language="zh-CN", reports_dir=tmp
+    )
+    ctx.cache["translations"] = tr.TranslationCache(tmp / "translations.jsonl")
+    pipeline = Pipeline(ctx=ctx)
+    (tmp / "idea.verdict.json").write_text(json.dumps(VERDICT), encoding="utf-8")
+
+    original = tr.llm_translate_json
+    tr.llm_translate_json = fake_translate  # type: ignore[assignment]
+    try:
+        zh, en = pipeline.report_languages(idea_path, ["zh-CN", "en"])
+        # One call for English, duplicates sent once; Chinese is the source
+        assert calls == [["需要验证付费意愿", "竞品众多", "访谈 10 位用户"]], calls
+        assert zh.verdict_path.name == "idea.verdict.json"
+        localized = json.loads(en.verdict_path.read_text("utf-8"))
+        assert localized["decision"] == "caution" and localized["language"] == "en"
+        assert localized["next_steps"][1] == "[en] 需要验证付费意愿"
+        report = en.path.read_text("utf-8")
+        assert report.startswith("# One-Page Verdict") and "[en] 竞品众多" in report
+        assert zh.path.read_text("utf-8").startswith("# 先证伪报告")
+
+        # Cached on disk: a new process renders English without any call
+        ctx.cache["translations"] = tr.TranslationCache(tmp / "translations.jsonl")
+        pipeline.report_languages(idea_path, ["en"])
+        assert len(calls) == 1
+
+        # A failed translation keeps the originals and is retried next time
+        (xx,) = pipeline.report_languages(idea_path, ["xx"])
+        kept = json.loads(xx.verdict_path.read_text("utf-8"))
+        assert kept["reasons"] == VERDICT["reasons"]
+        # ...and is not labelled as the target language
+        assert kept["language"] == "zh-CN" and kept["translated"] is False
+        assert localized.get("translated", True) is True
+        pipeline.report_languages(idea_path, ["xx"])
+        assert len(calls) == 3
+    finally:
+        tr.llm_translate_json = original  # type: ignore[assignment]
+
+
+def main() -> None:
+    assert_fan_out()
+    print("Translation checks passed.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,153 @@
+from __future__ import annotations
+
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+from typing import Any, List
+
+import yaml
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+CORE = ROOT / "config" / "rules" / "core"
+
+
+def assert_watchers() -> None:
+    from agent.watch import InotifyWatcher, PollingWatcher, collect
+
+    for make in (InotifyWatcher, lambda d: PollingWatcher(d, interval_s=0.05)):
+        tmp = Path(tempfile.mkdtemp())
+        watcher = make([tmp])
+
+        def burst() -> None:
+            for n in range(3):
+                (tmp / "a.yaml").write_text(f"intent: v{n}\n", encoding="utf-8")
+                time.sleep(0.06)
+            (tmp / "notes.txt").write_text("ignored", encoding="utf-8")
+            (tmp / "b.yaml").write_text("intent: b\n", encoding="utf-8")
+
+        thread = threading.Thread(target=burst)
+        thread.start()
+        # Three saves of a.yaml and one of b.yaml arrive as a single batch
+        changed = collect(watcher, debounce_s=0.3, timeout=5)
+        thread.join()
+        assert changed == {tmp / "a.yaml", tmp / "b.yaml"}, (make, changed)
+        assert collect(watcher, debounce_s=0.1, timeout=0.2) == set()
+        watcher.close()
+
+
+def write_rule(path: Path, base: str, **changes: Any) -> None:
+    data = yaml.safe_load((CORE / base).read_text(encoding="utf-8"))
+    data.update(changes)
+    path.write_text(yaml.safe_dump(data, allow_unicode=True), encoding="utf-8")
+
+
+def write_idea(path: Path, intent: str) -> None:
+    idea = {"intent": intent, "user": "u", "scenario": "s", "triggers": "t"}
+    path.write_text(yaml.safe_dump({**idea, "alts": "a"}), encoding="utf-8")
+
+
+def assert_incremental() -> None:
+    import agent.engine as engine
+    from agent.context import EvaluationContext
+    from agent.watch import IncrementalEvaluator
+
+    tmp = Path(tempfile.mkdtemp())
+    ideas, rules = tmp / "ideas", tmp / "rules"
+    ideas.mkdir()
+    rules.mkdir()
+    write_rule(rules / "01.yaml", "01_tech_impossibility.yaml", keywords=["fusion"])
+    write_rule(rules / "02.yaml", "02_unit_economics.yaml", keywords=["pricing"])
+    for name, intent in (("a", "fusion reactor"), ("b", "pricing app"), ("c", "x")):
+        write_idea(ideas / f"{name}.yaml", intent)
+
+    evaluated: List[str] = []
+    failing: List[str] = []
+
+    def fake_verdict(idea, rules, cfg, allowed_redline_ids=None, correction_note=None):
+        evaluated.append(idea["intent"])
+        if idea["intent"] in failing:
+            raise RuntimeError("provider down")
+        # "x" was denied under RL-002 even though it has none of its keywords
+        redlines = ["RL-002"] if idea["intent"] == "x" else []
+        return {"decision": "go", "conf_level": 0.9, "redlines": redlines}
+
+    ctx = EvaluationContext.create(
+        ROOT / "config" / "model.yaml",
+        language="en",
+        rules_dir=rules,
+        ideas_dir=ideas,
+        reports_dir=tmp / "reports",
+    )
+    logs: List[str] = []
+    state = tmp / "state.json"
+
+    def cycle() -> List[str]:
+        evaluated.clear()
+        IncrementalEvaluator(ctx, state_path=state, log=logs.append).run_once()
+        return sorted(evaluated)
+
+    original = engine.llm_verdict_json
+    engine.llm_verdict_json = fake_verdict  # type: ignore[assignment]
+    try:
+        assert cycle() == ["fusion reactor", "pricing app", "x"]
+        assert (tmp / "reports" / "a.md").exists()
+        assert cycle() == []  # restart: nothing changed
+
+        write_idea(ideas / "b.yaml", "pricing app v2")
+        assert cycle() == ["pricing app v2"]
+
+        # Keyword match for RL-001; RL-002 also reaches "x" through its verdict
+        write_rule(
+            rules / "01.yaml",
+            "01_tech_impossibility.yaml",
+            keywords=["fusion"],
+            severity="high",
+        )
+        assert cycle() == ["fusion reactor"]
+        write_rule(
+            rules / "02.yaml",
+            "02_unit_economics.yaml",
+            keywords=["pricing"],
+            severity="high",
+        )
+        assert cycle() == ["pricing app v2", "x"]
+
+        # A rule without keywords may apply to anything
+        write_rule(rules / "03.yaml", "03_data_inaccessible.yaml", keywords=[])
+        assert cycle() == ["fusion reactor", "pricing app v2", "x"]
+
+        # A broken save is reported and retried once fixed
+        (rules / "03.yaml").write_text("id: [unclosed\n", encoding="utf-8")
+        assert cycle() == [] and "skipped" in logs[-1]
+        write_rule(rules / "03.yaml", "03_data_inaccessible.yaml", keywords=["data"])
+        assert cycle() == ["fusion reactor", "pricing app v2", "x"]
+
+        # A failed rule-triggered re-evaluation is retried, not adopted as current
+        failing.append("fusion reactor")
+        write_rule(
+            rules / "01.yaml",
+            "01_tech_impossibility.yaml",
+            keywords=["fusion"],
+            severity="low",
+        )
+        assert cycle() == ["fusion reactor"] and "failed" in logs[-1]
+        assert cycle() == ["fusion reactor"]  # still failing, still pending
+        failing.clear()
+        assert cycle() == ["fusion reactor"]
+        assert cycle() == []
+    finally:
+        engine.llm_verdict_json = original  # type: ignore[assignment]
+
+
+def main() -> None:
+    assert_watchers()
+    assert_incremental()
+    print("Watch checks passed.")
+
+
+if __name__ == "__main__":
+    main()
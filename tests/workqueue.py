@@ -0,0 +1,90 @@
+from __future__ import annotations
+
+import multiprocessing
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import List
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+
+def assert_leases() -> None:
+    from agent.workqueue import WorkQueue
+
+    tmp = Path(tempfile.mkdtemp())
+    q = WorkQueue(tmp / "q.sqlite", lease_s=0.2, max_attempts=3)
+    assert q.enqueue((k, {"intent": k}) for k in ("a", "b", "c")) == 3
+    assert q.enqueue([("a", {"intent": "again"})]) == 0
+
+    (a,) = q.lease("w1")
+    (b,) = q.lease("w2")
+    assert a[0] == "a" and a[1] == {"intent": "a"} and b[0] == "b"
+    assert q.complete("w1", "a") and not q.complete("w1", "b")
+    assert q.fail("w2", "b", "boom") == "pending"
+
+    # w3 crashes holding "c": its lease expires and "c" is handed out again
+    assert [k for k, _ in q.lease("w3", n=1)] == ["b"]
+    assert [k for k, _ in q.lease("w3", n=1)] == ["c"]
+    time.sleep(0.3)
+    assert q.counts()["leased"] == 0
+    assert [k for k, _ in q.lease("w4", n=5)] == ["b", "c"]
+    # The stale owner cannot complete it any more; heartbeats keep w4's leases alive
+    assert not q.complete("w3", "c")
+    with q.keep_alive("w4", ["b", "c"], interval_s=0.05):
+        time.sleep(0.4)
+    assert q.counts()["leased"] == 2
+    assert q.complete("w4", "c")
+
+    # Third attempt for "b" fails too: dead-lettered with its last error
+    assert q.fail("w4", "b", "boom again") == "dead"
+    assert q.dead_letters() == [{"row": "b", "attempts": 3, "error": "boom again"}]
+    assert q.counts() == {"pending": 0, "leased": 0, "done": 2, "dead": 1}
+    assert q.keys() == ["a", "c"]
+    assert q.requeue_dead() == 1 and q.counts()["pending"] == 1
+
+
+def drain(path: str, worker: str, out: "multiprocessing.Queue[str]") -> None:
+    from agent.workqueue import WorkQueue
+
+    q = WorkQueue(path)
+    while True:
+        leased = q.lease(worker, n=3)
+        if not leased:
+            return
+        for key, _ in leased:
+            if q.complete(worker, key):
+                out.put(key)
+
+
+def assert_concurrent_workers() -> None:
+    from agent.workqueue import WorkQueue
+
+    path = str(Path(tempfile.mkdtemp()) / "q.sqlite")
+    keys = [f"idea-{n}" for n in range(300)]
+    WorkQueue(path).enqueue((k, {}) for k in keys)
+    out: "multiprocessing.Queue[str]" = multiprocessing.Queue()
+    procs = [
+        multiprocessing.Process(target=drain, args=(path, f"w{n}", out))
+        for n in range(4)
+    ]
+    for p in procs:
+        p.start()
+    done: List[str] = [out.get(timeout=30) for _ in keys]
+    for p in procs:
+        p.join()
+    # Every item is processed exactly once across workers
+    assert sorted(done) == sorted(keys)
+    assert WorkQueue(path).counts()["done"] == len(keys)
+
+
+def main() -> None:
+    assert_leases()
+    assert_concurrent_workers()
+    print("Work queue checks passed.")
+
+
+if __name__ == "__main__":
+    main()